@@ -1,25 +1,14 @@
 from fastapi import APIRouter, Request, Depends
 from typing import List
-from app.database.database import AsyncDatabase
 from app.schemas.admin import AdminResponse, AdminCreate, AdminUpdate, AdminInDB
-from app.repositories.admin import AdminRepository
 from app.services.admin import AdminService
 
 router: APIRouter = APIRouter()
 
 
-async def get_db(request: Request) -> AsyncDatabase:
+async def get_admin_service(request: Request) -> AdminService:
     """"""
-    return request.app.state.db
-
-
-async def get_admin_repository(db: AsyncDatabase = Depends(get_db)):
-    """"""
-    return AdminRepository(db)
-
-async def get_admin_service(repo: AdminRepository = Depends(get_admin_repository)):
-    """"""
-    return AdminService(repo)
+    return request.app.state.container.admin_service
 
 
 @router.post("/admin", response_model=AdminResponse)
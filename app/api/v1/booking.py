@@ -1,20 +1,16 @@
-from typing import List, Any
-from fastapi import APIRouter, Request, Depends
+from typing import List, Any, Optional
+from fastapi import APIRouter, Request, Depends, Query
 from app.schemas.booking import BookingResponse, BookingCreate, BookingUpdate
-from app.repositories.booking import BookingRepository
 from app.services.booking import BookingService
-from app.database.database import AsyncDatabase
+from app.utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, page_headers
+from app.utils.mapping import model_list_response
+from app.utils.export import ExportFormat, export_response
 
 router: APIRouter = APIRouter()
 
-async def get_db(request: Request) -> AsyncDatabase:
-    return request.app.state.db
-
-async def get_booking_repository(db: AsyncDatabase = Depends(get_db)) -> BookingRepository:
-    return BookingRepository(db)
-
-async def get_booking_service(repo: BookingRepository = Depends(get_booking_repository)) -> BookingService:
-    return BookingService(repo)
+async def get_booking_service(request: Request) -> BookingService:
+    """"""
+    return request.app.state.container.booking_service
 
 
 @router.post("/booking", response_model=BookingResponse)
@@ -47,9 +43,25 @@ async def delete_booking(
 
 
 @router.get("/booking", response_model=List[BookingResponse])
-async def get_all_bookings(service: BookingService = Depends(get_booking_service)):
+async def get_all_bookings(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    include_total: bool = False,
+    service: BookingService = Depends(get_booking_service)
+):
     """"""
-    return await service.get_all_bookings()
+    page = await service.get_all_bookings(limit, after)
+    total = await service.estimate_total_bookings() if include_total else None
+    return model_list_response(BookingResponse, page.items, page_headers(page.next_cursor, total))
+
+@router.get("/booking/export")
+async def export_bookings(
+    format: ExportFormat = ExportFormat.NDJSON,
+    service: BookingService = Depends(get_booking_service)
+):
+    """"""
+    return export_response(service.export_bookings(format), format, "bookings")
+
 
 @router.get("/booking/{booking_id}", response_model=BookingResponse)
 async def get_booking_by(
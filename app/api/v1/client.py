@@ -1,26 +1,20 @@
-from fastapi import APIRouter, Request, Depends
-from typing import List
-from app.database.database import AsyncDatabase
+from fastapi import APIRouter, Request, Depends, Query, UploadFile, File
+from typing import List, Optional
 from app.schemas.client import ClientResponse, ClientCreate, ClientUpdate
-from app.repositories.client import ClientRepository
 from app.services.client import ClientService
+from app.schemas.bulk_import import ImportResult
+from app.services.bulk_import import ImportFormat
 from app.schemas.favorite_technician import FavoriteTechnicianCreate, FavoriteTechnicianResponse
 from app.services.favorite_technician import FavoriteTechnicianService
+from app.utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, page_headers
+from app.utils.mapping import model_list_response
 
 router: APIRouter = APIRouter()
 
 
-async def get_db(request: Request) -> AsyncDatabase:
+async def get_client_service(request: Request) -> ClientService:
     """"""
-    return request.app.state.db
-
-async def get_client_repository(db: AsyncDatabase = Depends(get_db)):
-    """"""
-    return ClientRepository(db)
-
-async def get_client_service(repo: ClientRepository = Depends(get_client_repository)):
-    """"""
-    return ClientService(repo)
+    return request.app.state.container.client_service
 
 
 @router.get("/client/{client_id}", response_model=ClientResponse)
@@ -34,10 +28,15 @@ async def get_client(
 
 @router.get("/client", response_model=List[ClientResponse])
 async def get_all_clients(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    include_total: bool = False,
     service: ClientService = Depends(get_client_service)
     ):
     """"""
-    return await service.get_all_clients()
+    page = await service.get_all_clients(limit, after)
+    total = await service.estimate_total_clients() if include_total else None
+    return model_list_response(ClientResponse, page.items, page_headers(page.next_cursor, total))
 
 
 @router.post("/client", response_model=ClientResponse)
@@ -49,6 +48,16 @@ async def create_client(
     return await service.create_client(client_data)
 
 
+@router.post("/client/import", response_model=ImportResult)
+async def import_clients(
+    file: UploadFile = File(...),
+    format: ImportFormat = ImportFormat.CSV,
+    service: ClientService = Depends(get_client_service)
+):
+    """"""
+    return await service.import_clients(file.file, format)
+
+
 @router.delete("/client{client_id}")
 async def delete_client(
     client_id: str,
@@ -1,23 +1,13 @@
 from fastapi import APIRouter, Request, Depends
 from typing import List
-from app.database.database import AsyncDatabase
 from app.schemas.favorite_technician import FavoriteTechnicianCreate, FavoriteTechnicianResponse
-from app.repositories.favorite_technician import FavoriteTechnicianRepository
 from app.services.favorite_technician import FavoriteTechnicianService
 
 router: APIRouter = APIRouter()
 
-async def get_db(request: Request) -> AsyncDatabase:
+async def get_favorite_technician_service(request: Request) -> FavoriteTechnicianService:
     """"""
-    return request.app.state.db
-
-async def get_favorite_technician_repository(db: AsyncDatabase = Depends(get_db)):
-    """"""
-    return FavoriteTechnicianRepository(db)
-
-async def get_favorite_technician_service(repo: FavoriteTechnicianRepository = Depends(get_favorite_technician_repository)):
-    """"""
-    return FavoriteTechnicianService(repo)
+    return request.app.state.container.favorite_technician_service
 
 
 @router.post("/favorite_technician", response_model=FavoriteTechnicianResponse)
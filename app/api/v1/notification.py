@@ -1,23 +1,13 @@
 from fastapi import APIRouter, Request, Depends
 from typing import List
-from app.database.database import AsyncDatabase
 from app.schemas.notification import NotificationCreate, NotificationResponse
-from app.repositories.notification import NotificationRepository
 from app.services.notification import NotificationService
 
 router: APIRouter = APIRouter()
 
-def get_db(request: Request) -> AsyncDatabase:
+async def get_notification_service(request: Request) -> NotificationService:
     """"""
-    return request.app.state.db
-
-def get_notification_repository(db: AsyncDatabase = Depends(get_db)):
-    """"""
-    return NotificationRepository(db)
-
-def get_notification_service(repo: NotificationRepository = Depends(get_notification_repository)):
-    """"""
-    return NotificationService(repo)
+    return request.app.state.container.notification_service
 
 
 @router.post("/notification", response_model=NotificationResponse)
@@ -1,20 +1,16 @@
-from typing import List, Any
-from fastapi import APIRouter, Request, Depends
+from typing import List, Any, Optional
+from fastapi import APIRouter, Request, Depends, Query
 from app.schemas.payment import PaymentResponse, PaymentCreate, PaymentUpdate
-from app.repositories.payment import PaymentRepository
 from app.services.payment import PaymentService
-from app.database.database import AsyncDatabase
+from app.utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, page_headers
+from app.utils.mapping import model_list_response
+from app.utils.export import ExportFormat, export_response
 
 router: APIRouter = APIRouter()
 
-async def get_db(request: Request) -> AsyncDatabase:
-    return request.app.state.db
-
-async def get_payment_repository(db: AsyncDatabase = Depends(get_db)) -> PaymentRepository:
-    return PaymentRepository(db)
-
-async def get_payment_service(repo: PaymentRepository = Depends(get_payment_repository)) -> PaymentService:
-    return PaymentService(repo)
+async def get_payment_service(request: Request) -> PaymentService:
+    """"""
+    return request.app.state.container.payment_service
 
 
 @router.post("/payment", response_model=PaymentResponse)
@@ -47,9 +43,25 @@ async def delete_payment(
 
 
 @router.get("/payment", response_model=List[PaymentResponse])
-async def get_all_payments(service: PaymentService = Depends(get_payment_service)):
+async def get_all_payments(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    include_total: bool = False,
+    service: PaymentService = Depends(get_payment_service)
+):
     """"""
-    return await service.get_all_payments()
+    page = await service.get_all_payments(limit, after)
+    total = await service.estimate_total_payments() if include_total else None
+    return model_list_response(PaymentResponse, page.items, page_headers(page.next_cursor, total))
+
+@router.get("/payment/export")
+async def export_payments(
+    format: ExportFormat = ExportFormat.NDJSON,
+    service: PaymentService = Depends(get_payment_service)
+):
+    """"""
+    return export_response(service.export_payments(format), format, "payments")
+
 
 @router.get("/payment/{payment_id}", response_model=PaymentResponse)
 async def get_payment_by(
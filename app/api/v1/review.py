@@ -1,20 +1,16 @@
-from typing import List, Any
-from fastapi import APIRouter, Request, Depends
+from typing import List, Any, Optional
+from fastapi import APIRouter, Request, Depends, Query
 from app.schemas.review import ReviewResponse, ReviewCreate, ReviewUpdate
-from app.repositories.review import ReviewRepository
 from app.services.review import ReviewService
-from app.database.database import AsyncDatabase
+from app.utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, page_headers
+from app.utils.mapping import model_list_response
+from app.utils.export import ExportFormat, export_response
 
 router: APIRouter = APIRouter()
 
-async def get_db(request: Request) -> AsyncDatabase:
-    return request.app.state.db
-
-async def get_review_repository(db: AsyncDatabase = Depends(get_db)) -> ReviewRepository:
-    return ReviewRepository(db)
-
-async def get_review_service(repo: ReviewRepository = Depends(get_review_repository)) -> ReviewService:
-    return ReviewService(repo)
+async def get_review_service(request: Request) -> ReviewService:
+    """"""
+    return request.app.state.container.review_service
 
 
 @router.post("/review", response_model=ReviewResponse)
@@ -47,9 +43,25 @@ async def delete_review(
 
 
 @router.get("/review", response_model=List[ReviewResponse])
-async def get_all_reviews(service: ReviewService = Depends(get_review_service)):
+async def get_all_reviews(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    include_total: bool = False,
+    service: ReviewService = Depends(get_review_service)
+):
     """"""
-    return await service.get_all_reviews()
+    page = await service.get_all_reviews(limit, after)
+    total = await service.estimate_total_reviews() if include_total else None
+    return model_list_response(ReviewResponse, page.items, page_headers(page.next_cursor, total))
+
+@router.get("/review/export")
+async def export_reviews(
+    format: ExportFormat = ExportFormat.NDJSON,
+    service: ReviewService = Depends(get_review_service)
+):
+    """"""
+    return export_response(service.export_reviews(format), format, "reviews")
+
 
 @router.get("/review/{review_id}", response_model=ReviewResponse)
 async def get_review_by(
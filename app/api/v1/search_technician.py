@@ -1,11 +1,13 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request
 from app.schemas.search_technician import SearchParameters, BusinessSearchResults
 from app.services.search_technician import SearchService
+from app.utils.exceptions import JobConnectException
 
 router = APIRouter()
 
-async def get_search_service() -> SearchService:
-    return SearchService()
+async def get_search_service(request: Request) -> SearchService:
+    """"""
+    return request.app.state.container.search_service
 
 
 @router.post("/search_nearby_businesses/", response_model=BusinessSearchResults)
@@ -14,7 +16,9 @@ async def search_nearby_businesses(
     service: SearchService = Depends(get_search_service)
     ):
     try:
-        return service.search_nearby(params)
+        return await service.search_nearby(params)
+    except JobConnectException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Search error: {str(e)}")
 
@@ -22,6 +26,8 @@ async def search_nearby_businesses(
 @router.get("/get_current_location/")
 async def get_user_location(service: SearchService = Depends(get_search_service)):
     try:
-        return service.get_current_location()
+        return await service.get_current_location()
+    except JobConnectException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Location error: {str(e)}")
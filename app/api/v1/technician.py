@@ -1,24 +1,117 @@
-from fastapi import APIRouter, Request, Depends
-from typing import List
-from app.database.database import AsyncDatabase
-from app.schemas.technician import TechnicianResponse, TechnicianCreate, TechnicianUpdate
-from app.repositories.technician import TechnicianRepository
+import uuid
+from datetime import datetime, timedelta
+from fastapi import APIRouter, Request, Depends, Query, UploadFile, File
+from typing import List, Optional
+from app.schemas.technician import (
+    TechnicianResponse,
+    TechnicianNearbyResponse,
+    TechnicianDistance,
+    TechnicianCreate,
+    TechnicianSort,
+    TechnicianUpdate
+)
+from app.schemas.availability import TechnicianAvailability
+from app.schemas.bulk_import import ImportResult
+from app.services.availability import MAX_AVAILABILITY_TECHNICIANS, AvailabilityService
+from app.services.bulk_import import ImportFormat
+from app.services.ranking import RankingService
 from app.services.technician import TechnicianService
+from app.utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, page_headers
+from app.utils.mapping import model_list_response
 
 router: APIRouter = APIRouter()
 
 
-async def get_db(request: Request) -> AsyncDatabase:
+async def get_technician_service(request: Request) -> TechnicianService:
     """"""
-    return request.app.state.db
+    return request.app.state.container.technician_service
 
-async def get_technician_repository(db: AsyncDatabase = Depends(get_db)):
+
+async def get_ranking_service(request: Request) -> RankingService:
+    """"""
+    return request.app.state.container.ranking_service
+
+
+async def get_availability_service(request: Request) -> AvailabilityService:
     """"""
-    return TechnicianRepository(db)
+    return request.app.state.container.availability_service
+
+
+@router.get("/technician/nearby", response_model=List[TechnicianNearbyResponse])
+async def search_nearby_technicians(
+    lat: float = Query(..., ge=-90, le=90),
+    lon: float = Query(..., ge=-180, le=180),
+    radius_km: float = Query(10, gt=0, le=200),
+    service_type: Optional[str] = None,
+    only_available: bool = True,
+    only_verified: bool = False,
+    limit: int = Query(20, ge=1, le=100),
+    sort: TechnicianSort = TechnicianSort.DISTANCE,
+    service: TechnicianService = Depends(get_technician_service),
+    ranking: RankingService = Depends(get_ranking_service)
+    ):
+    """sort=relevance ranks by the weighted factors and reports per-stage timings in Server-Timing."""
+    if sort is TechnicianSort.RELEVANCE:
+        results, timer = await ranking.search_nearby_technicians(
+            lat, lon, radius_km, service_type, only_available, only_verified, limit
+        )
+        return model_list_response(TechnicianNearbyResponse, results, {"Server-Timing": timer.server_timing()})
+    return await service.search_nearby_technicians(
+        lat, lon, radius_km, service_type, only_available, only_verified, limit, sort
+    )
 
-async def get_technician_service(repo: TechnicianRepository = Depends(get_technician_repository)):
+
+@router.get("/technician/nearest", response_model=List[TechnicianDistance])
+async def nearest_technicians(
+    lat: float = Query(..., ge=-90, le=90),
+    lon: float = Query(..., ge=-180, le=180),
+    k: int = Query(10, ge=1, le=100),
+    service_type: Optional[str] = None,
+    max_distance_km: Optional[float] = Query(None, gt=0),
+    service: TechnicianService = Depends(get_technician_service)
+    ):
     """"""
-    return TechnicianService(repo)
+    return service.nearest_technicians(lat, lon, k, service_type, max_distance_km)
+
+
+@router.get("/technician/nearest/consistency")
+async def check_technician_index_consistency(
+    lat: float = Query(..., ge=-90, le=90),
+    lon: float = Query(..., ge=-180, le=180),
+    k: int = Query(10, ge=1, le=100),
+    service_type: Optional[str] = None,
+    radius_km: float = Query(50, gt=0, le=500),
+    service: TechnicianService = Depends(get_technician_service)
+    ):
+    """"""
+    return await service.check_index_consistency(lat, lon, k, service_type, radius_km)
+
+
+@router.get("/technician/availability", response_model=List[TechnicianAvailability])
+async def get_technicians_availability(
+    technician_id: List[uuid.UUID] = Query(..., max_length=MAX_AVAILABILITY_TECHNICIANS),
+    start: datetime = Query(..., alias="from"),
+    end: datetime = Query(..., alias="to"),
+    slot: int = Query(60, ge=5, le=1440, description="Slot length in minutes"),
+    service: AvailabilityService = Depends(get_availability_service)
+    ):
+    """Free slots of up to 100 technicians in one call, e.g. for a page of search results."""
+    return await service.get_availability(
+        [str(t) for t in technician_id], start, end, timedelta(minutes=slot)
+    )
+
+
+@router.get("/technician/{technician_id}/availability", response_model=TechnicianAvailability)
+async def get_technician_availability(
+    technician_id: uuid.UUID,
+    start: datetime = Query(..., alias="from"),
+    end: datetime = Query(..., alias="to"),
+    slot: int = Query(60, ge=5, le=1440, description="Slot length in minutes"),
+    service: AvailabilityService = Depends(get_availability_service)
+    ):
+    """"""
+    availability = await service.get_availability([str(technician_id)], start, end, timedelta(minutes=slot))
+    return availability[0]
 
 
 @router.get("/technician/{technician_id}", response_model=TechnicianResponse)
@@ -32,10 +125,15 @@ async def get_technician(
 
 @router.get("/technician", response_model=List[TechnicianResponse])
 async def get_all_technicians(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    include_total: bool = False,
     service: TechnicianService = Depends(get_technician_service)
     ):
     """"""
-    return await service.get_all_technicians()
+    page = await service.get_all_technicians(limit, after)
+    total = await service.estimate_total_technicians() if include_total else None
+    return model_list_response(TechnicianResponse, page.items, page_headers(page.next_cursor, total))
 
 
 @router.post("/technician", response_model=TechnicianResponse)
@@ -47,6 +145,16 @@ async def create_technician(
     return await service.create_technician(technician_data)
 
 
+@router.post("/technician/import", response_model=ImportResult)
+async def import_technicians(
+    file: UploadFile = File(...),
+    format: ImportFormat = ImportFormat.CSV,
+    service: TechnicianService = Depends(get_technician_service)
+    ):
+    """"""
+    return await service.import_technicians(file.file, format)
+
+
 @router.delete("/technician{technician_id}")
 async def delete_technician(
     technician_id: str,
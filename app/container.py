@@ -0,0 +1,79 @@
+import httpx
+
+from app.database.database import AsyncDatabase
+from app.repositories.admin import AdminRepository
+from app.repositories.booking import BookingRepository
+from app.repositories.client import ClientRepository
+from app.repositories.favorite_technician import FavoriteTechnicianRepository
+from app.repositories.notification import NotificationRepository
+from app.repositories.payment import PaymentRepository
+from app.repositories.review import ReviewRepository
+from app.repositories.technician import TechnicianRepository
+from app.config import settings
+from app.services.admin import AdminService
+from app.services.availability import AvailabilityService
+from app.services.booking import BookingService
+from app.services.client import ClientService
+from app.services.favorite_technician import FavoriteTechnicianService
+from app.services.notification import NotificationService
+from app.services.payment import PaymentService
+from app.services.ranking import RankingService, TechnicianRanker, default_factors
+from app.services.review import ReviewService
+from app.services.search_technician import SearchService
+from app.services.technician import TechnicianService
+from app.services.technician_index import TechnicianSpatialIndex
+
+
+class Container:
+    """App-scoped repositories, services and clients, built once in lifespan.
+
+    Repositories and services hold nothing per request, so one instance of each is
+    shared by every request; routes fetch theirs with a single request.app.state lookup.
+    """
+
+    def __init__(
+        self,
+        db: AsyncDatabase,
+        http_client: httpx.AsyncClient,
+        technician_index: TechnicianSpatialIndex
+    ) -> None:
+        self.db = db
+        self.http_client = http_client
+        self.technician_index = technician_index
+
+        self.admin_repository = AdminRepository(db)
+        self.booking_repository = BookingRepository(db)
+        self.client_repository = ClientRepository(db)
+        self.favorite_technician_repository = FavoriteTechnicianRepository(db)
+        self.notification_repository = NotificationRepository(db)
+        self.payment_repository = PaymentRepository(db)
+        self.review_repository = ReviewRepository(db)
+        self.technician_repository = TechnicianRepository(db)
+
+        self.admin_service = AdminService(self.admin_repository)
+        self.booking_service = BookingService(self.booking_repository)
+        self.client_service = ClientService(self.client_repository)
+        self.favorite_technician_service = FavoriteTechnicianService(self.favorite_technician_repository)
+        self.notification_service = NotificationService(self.notification_repository)
+        self.payment_service = PaymentService(self.payment_repository)
+        self.review_service = ReviewService(self.review_repository)
+        self.technician_service = TechnicianService(self.technician_repository, technician_index)
+        self.search_service = SearchService(http_client)
+        self.availability_service = AvailabilityService(
+            self.booking_repository, settings.AVAILABILITY_MAX_WINDOW_DAYS, settings.AVAILABILITY_MAX_SLOTS
+        )
+        self.ranking_service = RankingService(
+            self.technician_repository,
+            self.booking_repository,
+            TechnicianRanker(default_factors(
+                settings.RANKING_WEIGHT_DISTANCE,
+                settings.RANKING_WEIGHT_RATING,
+                settings.RANKING_WEIGHT_EXPERIENCE,
+                settings.RANKING_WEIGHT_VERIFIED,
+                settings.RANKING_WEIGHT_AVAILABLE,
+                settings.RANKING_WEIGHT_BOOKING_LOAD
+            )),
+            settings.RANKING_CANDIDATE_MULTIPLIER,
+            settings.RANKING_MAX_CANDIDATES,
+            settings.RANKING_BOOKING_LOAD_DAYS
+        )
@@ -1,17 +1,135 @@
+import asyncio
+import random
+import re
+import sys
+import time
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import Final
+from typing import (
+    Any, AsyncIterator, Awaitable, Dict, Final, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Set, Tuple
+)
 
 import asyncpg
 import logging
 
+from app.database.geography import register_geography_codec
+from app.database.migrator import Migrator, load_migrations
+from app.utils.exceptions import ServiceOverloadedException
+from app.utils.metrics import DB_POOL_ACQUIRE_SECONDS, DB_QUERY_SECONDS, DB_ROWS_RETURNED, DB_SLOW_QUERIES
+
 LOGGER = logging.getLogger(__name__)
 
 BASE_PATH: Final[Path] = Path(__file__).parent
-DATABASE_SCRIPT: Final[Path] = BASE_PATH / "jobconnect.sql"
 DUMMY_DATA_SCRIPT: Final[Path] = BASE_PATH / "dummy_data.sql"
+REPOSITORY_PACKAGE: Final[str] = "app.repositories"
+
+# Workloads, each with its own primary pool (bulkhead) so one cannot starve another
+INTERACTIVE: Final[str] = "interactive"
+BACKGROUND: Final[str] = "background"
+ANALYTICS: Final[str] = "analytics"
+
+READ_STATEMENT = re.compile(r"^\s*(?:SELECT|WITH|VALUES|SHOW)\b", re.IGNORECASE)
+WRITE_KEYWORD = re.compile(
+    r"\b(?:INSERT|UPDATE|DELETE|MERGE|NEXTVAL|SETVAL|FOR\s+(?:NO\s+KEY\s+)?UPDATE|FOR\s+(?:KEY\s+)?SHARE)\b",
+    re.IGNORECASE
+)
+
+# 0 when reads may use a replica; otherwise the monotonic time until which this
+# request's reads stay on the primary because it wrote.
+_primary_pinned_until: ContextVar[float] = ContextVar("primary_pinned_until", default=0.0)
+_workload: ContextVar[str] = ContextVar("workload", default=INTERACTIVE)
+
+REPLICA_LAG_QUERY: Final[str] = """
+SELECT CASE
+    WHEN NOT pg_is_in_recovery() THEN 0
+    WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+    ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+END::float8
+"""
+
+
+@lru_cache(maxsize=512)
+def normalize(query: str) -> str:
+    """SQL with whitespace collapsed and numeric literals (not $n placeholders) masked."""
+    text = re.sub(r"\s+", " ", query).strip()
+    return re.sub(r"(?<![$\w])\d+\b", "?", text)
+
+
+def fingerprint(query: str) -> str:
+    """Metric label for ad-hoc SQL: the normalized text, truncated."""
+    return normalize(query)[:80]
+
+
+@lru_cache(maxsize=512)
+def is_read_only(query: str) -> bool:
+    """Whether query may run on a replica: a plain read with no data-modifying part or row locks."""
+    return READ_STATEMENT.match(query) is not None and WRITE_KEYWORD.search(query) is None
+
+
+def _repository_caller() -> str:
+    """The innermost repository method on the current call stack, if any.
+
+    Awaiting coroutines stay on the stack while a query resumes, so walking frames
+    reaches the repository method that issued it.
+    """
+    frame = sys._getframe(1)
+    while frame is not None:
+        module: str = frame.f_globals.get("__name__", "")
+        if module.startswith(REPOSITORY_PACKAGE):
+            return f"{module}.{frame.f_code.co_qualname}"
+        frame = frame.f_back
+    return "<unknown>"
+
+
+class StatementStats:
+    """Execution counters for one named statement"""
+    __slots__ = ("executions", "cache_misses")
+
+    def __init__(self) -> None:
+        self.executions: int = 0
+        self.cache_misses: int = 0
+
+
+class PoolConfig(NamedTuple):
+    """Size and acquire timeout of one workload's pool."""
+    min_size: int = 1
+    max_size: int = 10
+    acquire_timeout: Optional[float] = None
+
+
+DEFAULT_POOLS: Final[Dict[str, PoolConfig]] = {INTERACTIVE: PoolConfig()}
+
+
+class Replica:
+    """A read replica's pool plus the state reads are routed by."""
+    __slots__ = ("name", "dsn", "pool", "in_flight", "lag_seconds", "healthy")
+
+    def __init__(self, name: str, dsn: str) -> None:
+        self.name: str = name
+        self.dsn: str = dsn
+        self.pool = None
+        self.in_flight: int = 0
+        self.lag_seconds: Optional[float] = None
+        self.healthy: bool = False
 
 
 class AsyncDatabase:
+    """Connection pools for the primary and any read replicas.
+
+    The primary has one pool per configured workload; queries use the pool of the
+    workload set with workload() (interactive by default), falling back to the
+    interactive pool. Each pool gives up after its acquire timeout with a 503 instead
+    of queueing forever. Replicas have a single pool each, sized like the interactive one.
+
+    Writes, and any statement is_read_only() rejects, go to the primary. Reads go to the
+    healthy replica with the fewest queries in flight (ties rotate), or to the primary
+    when there is none. After a write, reads in the same request context stay on the
+    primary for read_your_writes_seconds so the request sees its own changes. A replica
+    whose replay lag exceeds max_replica_lag_seconds, or whose lag check fails, is
+    ejected until a later check finds it caught up.
+    """
 
     def __init__(
         self,
@@ -19,76 +137,543 @@ class AsyncDatabase:
         dbname: str,
         username: str,
         password: str,
-        port: int = 5432
+        port: int = 5432,
+        statement_cache_size: int = 100,
+        slow_query_ms: float = 200.0,
+        explain_sample_rate: float = 0.0,
+        replica_dsns: Sequence[str] = (),
+        read_your_writes_seconds: float = 2.0,
+        max_replica_lag_seconds: float = 5.0,
+        replica_check_seconds: float = 5.0,
+        pools: Optional[Dict[str, PoolConfig]] = None,
+        max_queries: int = 50000,
+        max_lifetime_seconds: float = 0.0,
+        idle_timeout_seconds: float = 300.0
     ) -> None:
         self._host: str = host
         self._dbname: str = dbname
         self._username: str = username
         self._password: str = password
         self._port: int = port
-        self._connection_pool = None
+        self._statement_cache_size: int = statement_cache_size
+        self._pool_configs: Dict[str, PoolConfig] = dict(pools or DEFAULT_POOLS)
+        if INTERACTIVE not in self._pool_configs:
+            raise ValueError(f"A '{INTERACTIVE}' pool must be configured")
+        self._pools: Dict[str, asyncpg.Pool] = {}
+        self._max_queries: int = max_queries
+        self._max_lifetime_seconds: float = max_lifetime_seconds
+        self._idle_timeout_seconds: float = idle_timeout_seconds
+        # (pool name, backend pid) -> monotonic time the connection was opened
+        self._connection_born: Dict[Tuple[str, int], float] = {}
+        # Connections opened before PostGIS existed; the codec is registered on their next acquire
+        self._missing_codec: Set[Tuple[str, int]] = set()
+        self._statements: Dict[str, str] = {}
+        self._statement_stats: Dict[str, StatementStats] = {}
+        self._slow_query_seconds: float = slow_query_ms / 1000
+        self._explain_sample_rate: float = explain_sample_rate
+        self._explains: Set[asyncio.Task] = set()
+        self._replicas: List[Replica] = [
+            Replica(f"replica-{i}", dsn) for i, dsn in enumerate(replica_dsns, start=1)
+        ]
+        self._next_replica: int = 0
+        self._read_your_writes_seconds: float = read_your_writes_seconds
+        self._max_replica_lag_seconds: float = max_replica_lag_seconds
+        self._replica_check_seconds: float = replica_check_seconds
+        self._replica_monitor: Optional[asyncio.Task] = None
     
     async def connect(self) -> None:
         """"""
-        if not self._connection_pool:
-            self._connection_pool = await asyncpg.create_pool(
-                host=self._host,
-                database=self._dbname,
-                user=self._username,
-                password=self._password,
-                port=self._port,
-                min_size=1,
-                max_size=10
+        if len(self._statements) > self._statement_cache_size:
+            LOGGER.warning(
+                f"STATEMENT CACHE SIZE {self._statement_cache_size} IS SMALLER THAN THE "
+                f"{len(self._statements)} REGISTERED STATEMENTS - SOME WILL BE RE-PREPARED"
             )
+        if not self._pools:
+            for workload, config in self._pool_configs.items():
+                self._pools[workload] = await self._create_pool(
+                    workload,
+                    config,
+                    host=self._host,
+                    database=self._dbname,
+                    user=self._username,
+                    password=self._password,
+                    port=self._port
+                )
             LOGGER.info("CONNECTED TO THE DATABASE SUCCESSFULLY")
+            await self._connect_replicas()
+
+    async def _create_pool(self, name: str, config: PoolConfig, **connect_kwargs) -> asyncpg.Pool:
+        """"""
+        return await asyncpg.create_pool(
+            min_size=config.min_size,
+            max_size=config.max_size,
+            max_queries=self._max_queries,
+            max_inactive_connection_lifetime=self._idle_timeout_seconds,
+            statement_cache_size=self._statement_cache_size,
+            init=partial(self._init_connection, name),
+            setup=partial(self._setup_connection, name),
+            **connect_kwargs
+        )
+
+    async def warm_up(self) -> None:
+        """Open every pool's min_size connections now, so the first burst does not pay for them.
+
+        Connections are checked out all at once, which makes the pool connect (and
+        prepare statements on) any that are missing or expired, then handed back.
+        """
+        pools = [(self._pools[w], c.min_size) for w, c in self._pool_configs.items()]
+        pools += [(r.pool, self._pool_configs[INTERACTIVE].min_size) for r in self._replicas if r.pool]
+        for pool, size in pools:
+            connections = await asyncio.gather(*(pool.acquire() for _ in range(size)))
+            await asyncio.gather(*(pool.release(conn) for conn in connections))
+        LOGGER.info(f"WARMED UP {len(pools)} DATABASE POOLS")
+
+    @contextmanager
+    def workload(self, name: str) -> Iterator[None]:
+        """Run the enclosed queries (and tasks started inside) on the named workload's pool."""
+        token = _workload.set(name)
+        try:
+            yield
+        finally:
+            _workload.reset(token)
+
+    async def _connect_replicas(self) -> None:
+        """Open a pool per replica, check their lag once, then keep checking in the background.
+
+        A replica that cannot be reached at startup is left out until the next restart;
+        reads fall back to the primary.
+        """
+        for replica in self._replicas:
+            try:
+                replica.pool = await self._create_pool(
+                    replica.name, self._pool_configs[INTERACTIVE], dsn=replica.dsn
+                )
+                LOGGER.info(f"CONNECTED TO READ REPLICA {replica.name}")
+            except (OSError, asyncpg.PostgresError) as e:
+                LOGGER.error(f"COULD NOT CONNECT TO READ REPLICA {replica.name}: {repr(e)}")
+        if any(replica.pool for replica in self._replicas):
+            await self._check_replicas()
+            self._replica_monitor = asyncio.create_task(self._monitor_replicas())
+
+    async def _monitor_replicas(self) -> None:
+        """"""
+        while True:
+            await asyncio.sleep(self._replica_check_seconds)
+            await self._check_replicas()
+
+    async def _check_replicas(self) -> None:
+        """"""
+        await asyncio.gather(*(self._check_replica(r) for r in self._replicas if r.pool))
+
+    async def _check_replica(self, replica: Replica) -> None:
+        """Measure a replica's replay lag and eject or readmit it."""
+        try:
+            lag: float = await asyncio.wait_for(
+                replica.pool.fetchval(REPLICA_LAG_QUERY), timeout=self._replica_check_seconds
+            )
+        except (OSError, asyncio.TimeoutError, asyncpg.PostgresError) as e:
+            if replica.healthy:
+                LOGGER.warning(f"EJECTING READ REPLICA {replica.name}: LAG CHECK FAILED: {repr(e)}")
+            replica.lag_seconds, replica.healthy = None, False
+            return
+        healthy: bool = lag <= self._max_replica_lag_seconds
+        if healthy != replica.healthy:
+            LOGGER.warning(
+                f"{'READMITTING' if healthy else 'EJECTING'} READ REPLICA {replica.name}: LAG {lag:.1f}s"
+            )
+        replica.lag_seconds, replica.healthy = lag, healthy
+
+    def _pick_replica(self) -> Optional[Replica]:
+        """Least-busy healthy replica for a read, or None to use the primary."""
+        if not self._replicas or time.monotonic() < _primary_pinned_until.get():
+            return None
+        healthy: List[Replica] = [r for r in self._replicas if r.healthy]
+        if not healthy:
+            return None
+        self._next_replica = (self._next_replica + 1) % len(healthy)
+        rotated = healthy[self._next_replica:] + healthy[:self._next_replica]
+        return min(rotated, key=lambda r: r.in_flight)
+
+    def register_statement(self, name: str, query: str) -> None:
+        """Declare a named statement; it is prepared on every new pool connection."""
+        existing: Optional[str] = self._statements.get(name)
+        if existing is not None and existing != query:
+            raise ValueError(f"Statement '{name}' is already registered with different SQL")
+        self._statements[name] = query
+        self._statement_stats.setdefault(name, StatementStats())
+
+    def register_statements(self, statements: Dict[str, str]) -> None:
+        """"""
+        for name, query in statements.items():
+            self.register_statement(name, query)
+
+    async def _init_connection(self, pool_name: str, conn: asyncpg.Connection) -> None:
+        """Pool init hook: note when the connection was opened, register codecs, prepare statements.
+
+        Codecs go first: registering one clears the connection's statement cache.
+        """
+        key = (pool_name, conn.get_server_pid())
+        born = self._connection_born[key] = time.monotonic()
+
+        def forget(_) -> None:
+            # Also runs when asyncpg closes the connection itself (max_queries, idle timeout).
+            # A later connection may have been handed the same backend pid by then.
+            if self._connection_born.get(key) == born:
+                del self._connection_born[key]
+                self._missing_codec.discard(key)
+
+        conn.add_termination_listener(forget)
+        try:
+            await register_geography_codec(conn)
+        except ValueError:
+            # PostGIS arrives with the first migration (or, on a replica, once it has
+            # replayed it); _setup_connection retries before the connection is handed out
+            LOGGER.debug("GEOGRAPHY TYPE NOT INSTALLED YET - CODEC NOT REGISTERED")
+            self._missing_codec.add(key)
+        await self._prepare_statements(conn)
+
+    async def _setup_connection(self, pool_name: str, conn: asyncpg.Connection) -> None:
+        """Pool setup hook, run on every acquire: register the geography codec if init could not.
+
+        Without it asyncpg would return location as text to a caller expecting a GeoPoint.
+        """
+        if not self._missing_codec:
+            return
+        key = (pool_name, conn.get_server_pid())
+        if key not in self._missing_codec:
+            return
+        try:
+            await register_geography_codec(conn)
+        except ValueError:
+            return
+        self._missing_codec.discard(key)
+        await self._prepare_statements(conn)
+
+    async def _prepare_statements(self, conn: asyncpg.Connection) -> None:
+        """Prepare every registered statement on a new connection.
+
+        The statements go into asyncpg's own per-connection statement cache, the same
+        cache conn.fetch() consults, so later executions skip the Parse round trip.
+        asyncpg has no public call that fills the cache without executing, hence the
+        private _get_statement (asyncpg is pinned in requirements.txt).
+
+        Statements that cannot be prepared yet (e.g. their table does not exist before
+        initdb has run) are skipped and prepared on first use instead.
+        """
+        for name, query in self._statements.items():
+            try:
+                await conn._get_statement(query, None)
+            except asyncpg.PostgresError as e:
+                LOGGER.debug(f"COULD NOT PREPARE STATEMENT '{name}': {e}")
+
+    def _named_query(self, conn, name: str) -> str:
+        """Resolve a statement name to its SQL and record the execution."""
+        query = self._statements[name]
+        stats = self._statement_stats[name]
+        stats.executions += 1
+        # The key asyncpg's _get_statement caches under: (query, record class, ignore_custom_codec)
+        key = (query, conn._protocol.get_record_class(), False)
+        if conn._stmt_cache.get(key, promote=False) is None:
+            stats.cache_misses += 1
+        return query
+
+    @asynccontextmanager
+    async def _acquire(
+        self,
+        read_only: bool = False,
+        workload: Optional[str] = None
+    ) -> AsyncIterator[asyncpg.Connection]:
+        """Check out a connection for a read or a write, recording how long the pool made us wait.
+
+        Connections older than max_lifetime_seconds are closed once the caller is done
+        with them; the pool opens a replacement on a later acquire.
+        """
+        workload = workload or _workload.get()
+        if workload not in self._pools:
+            workload = INTERACTIVE
+        timeout: Optional[float] = self._pool_configs[workload].acquire_timeout
+        replica: Optional[Replica] = self._pick_replica() if read_only else None
+        if replica is None:
+            if not read_only and self._read_your_writes_seconds > 0:
+                _primary_pinned_until.set(time.monotonic() + self._read_your_writes_seconds)
+            pool, pool_name = self._pools[workload], workload
+        else:
+            pool, pool_name = replica.pool, replica.name
+            replica.in_flight += 1
+        try:
+            start = time.perf_counter()
+            try:
+                conn = await pool.acquire(timeout=timeout)
+            except asyncio.TimeoutError:
+                LOGGER.warning(f"TIMED OUT AFTER {timeout}s WAITING FOR A '{pool_name}' DATABASE CONNECTION")
+                raise ServiceOverloadedException(detail="Database is busy, try again shortly")
+            finally:
+                DB_POOL_ACQUIRE_SECONDS.observe(time.perf_counter() - start, (pool_name,))
+            try:
+                yield conn
+                await self._retire_if_expired(pool_name, conn)
+            finally:
+                await pool.release(conn)
+        finally:
+            if replica is not None:
+                replica.in_flight -= 1
+
+    async def _retire_if_expired(self, pool_name: str, conn: asyncpg.Connection) -> None:
+        """"""
+        if not self._max_lifetime_seconds or conn.is_in_transaction():
+            return
+        key = (pool_name, conn.get_server_pid())
+        born: Optional[float] = self._connection_born.get(key)
+        if born is not None and time.monotonic() - born > self._max_lifetime_seconds:
+            await conn.close()
+
+    async def _timed(
+        self,
+        label: str,
+        operation: Awaitable[Any],
+        query: str,
+        args: Sequence[Any],
+        explain: bool = True
+    ) -> Any:
+        """Await a query, recording its execution time under label and logging it if slow."""
+        start = time.perf_counter()
+        try:
+            return await operation
+        finally:
+            elapsed: float = time.perf_counter() - start
+            DB_QUERY_SECONDS.observe(elapsed, (label,))
+            if elapsed >= self._slow_query_seconds:
+                self._log_slow_query(label, query, args, elapsed, explain)
+
+    def _log_slow_query(
+        self,
+        label: str,
+        query: str,
+        args: Sequence[Any],
+        elapsed: float,
+        explain: bool
+    ) -> None:
+        """Log a slow query's shape (never its parameter values) and maybe sample its plan."""
+        DB_SLOW_QUERIES.inc((label,))
+        parameter_types: str = ", ".join(type(arg).__name__ for arg in args)
+        LOGGER.warning(
+            f"SLOW QUERY {elapsed * 1000:.1f}ms FROM {_repository_caller()} "
+            f"[{label}] ({parameter_types}): {normalize(query)}"
+        )
+        if explain and self._explain_sample_rate and random.random() < self._explain_sample_rate:
+            task = asyncio.create_task(self._explain(label, query, args))
+            self._explains.add(task)
+            task.add_done_callback(self._explains.discard)
+
+    async def _explain(self, label: str, query: str, args: Sequence[Any]) -> None:
+        """Capture EXPLAIN (ANALYZE, BUFFERS) for a slow query.
+
+        ANALYZE runs the statement again, so it runs in a transaction that is always
+        rolled back; writes leave nothing behind. Failures are logged, never raised.
+        """
+        try:
+            async with self._acquire(read_only=is_read_only(query)) as conn:
+                transaction = conn.transaction()
+                await transaction.start()
+                try:
+                    plan = await conn.fetch(f"EXPLAIN (ANALYZE, BUFFERS) {query}", *args)
+                finally:
+                    await transaction.rollback()
+            LOGGER.warning(f"SLOW QUERY PLAN [{label}]:\n" + "\n".join(row[0] for row in plan))
+        except Exception as e:
+            LOGGER.debug(f"COULD NOT EXPLAIN SLOW QUERY [{label}]: {repr(e)}")
+
+    def pool_stats(self) -> Dict[str, Dict[str, int]]:
+        """Size and idle connections of every open pool, by pool name."""
+        pools = list(self._pools.items()) + [(r.name, r.pool) for r in self._replicas]
+        return {
+            name: {"size": pool.get_size(), "idle": pool.get_idle_size(), "max": pool.get_max_size()}
+            for name, pool in pools if pool
+        }
+
+    def replica_stats(self) -> Dict[str, dict]:
+        """"""
+        return {
+            r.name: {"healthy": r.healthy, "lag_seconds": r.lag_seconds, "in_flight": r.in_flight}
+            for r in self._replicas
+        }
+
+    def statement_stats(self) -> Dict[str, dict]:
+        """"""
+        return {
+            name: {"executions": s.executions, "cache_misses": s.cache_misses}
+            for name, s in self._statement_stats.items()
+        }
+
+    async def fetch_named(self, name: str, *args):
+        """"""
+        async with self._acquire(read_only=is_read_only(self._statements[name])) as conn:
+            query = self._named_query(conn, name)
+            records = await self._timed(name, conn.fetch(query, *args), query, args)
+        DB_ROWS_RETURNED.inc((name,), len(records))
+        return records
+
+    async def fetchrow_named(self, name: str, *args):
+        """"""
+        async with self._acquire(read_only=is_read_only(self._statements[name])) as conn:
+            query = self._named_query(conn, name)
+            record = await self._timed(name, conn.fetchrow(query, *args), query, args)
+        DB_ROWS_RETURNED.inc((name,), record is not None)
+        return record
+
+    async def fetchval_named(self, name: str, *args):
+        """"""
+        async with self._acquire(read_only=is_read_only(self._statements[name])) as conn:
+            query = self._named_query(conn, name)
+            value = await self._timed(name, conn.fetchval(query, *args), query, args)
+        DB_ROWS_RETURNED.inc((name,), value is not None)
+        return value
+
+    async def execute_named(self, name: str, *args) -> str:
+        """Run a named statement for its side effect and return the command status."""
+        async with self._acquire() as conn:
+            query = self._named_query(conn, name)
+            return await self._timed(name, conn.execute(query, *args), query, args)
+
+    async def stream_named(
+        self,
+        name: str,
+        *args,
+        chunk_size: int = 1000
+    ) -> AsyncIterator[List[asyncpg.Record]]:
+        """Yield a named query's rows in chunks of chunk_size from a server-side cursor.
+
+        A chunk is only fetched once the consumer asks for it, so a slow consumer
+        pauses the cursor instead of buffering rows. The connection stays checked out
+        in a read-only repeatable-read transaction until the iterator is exhausted
+        or closed. Cursors hold their connection for as long as the consumer takes, so
+        they use the analytics pool.
+        """
+        async with self._acquire(read_only=is_read_only(self._statements[name]), workload=ANALYTICS) as conn:
+            async with conn.transaction(isolation="repeatable_read", readonly=True):
+                query = self._named_query(conn, name)
+                cursor = await self._timed(name, conn.cursor(query, *args), query, args, explain=False)
+                while True:
+                    rows = await self._timed(name, cursor.fetch(chunk_size), query, args, explain=False)
+                    DB_ROWS_RETURNED.inc((name,), len(rows))
+                    if rows:
+                        yield rows
+                    if len(rows) < chunk_size:
+                        break
+
+    async def copy_and_fetch(
+        self,
+        staging_ddl: str,
+        staging_table: str,
+        columns: Sequence[str],
+        records: Iterable[tuple],
+        query: str
+    ) -> List[asyncpg.Record]:
+        """COPY records into a transaction-scoped staging table, then run one set-based query over it.
+
+        staging_ddl must create staging_table ON COMMIT DROP; the whole load is one transaction,
+        run on the background pool.
+        """
+        label: str = f"copy:{staging_table}"
+        async with self._acquire(workload=BACKGROUND) as conn:
+            async with conn.transaction():
+                await conn.execute(staging_ddl)
+                await self._timed(
+                    label,
+                    conn.copy_records_to_table(staging_table, records=records, columns=columns),
+                    f"COPY {staging_table}",
+                    (),
+                    explain=False
+                )
+                merged = await self._timed(fingerprint(query), conn.fetch(query), query, (), explain=False)
+        DB_ROWS_RETURNED.inc((fingerprint(query),), len(merged))
+        return merged
 
     async def disconnect(self) -> None:
         """"""
-        if self._connection_pool:
-            await self._connection_pool.close()
+        if self._replica_monitor is not None:
+            self._replica_monitor.cancel()
+        for replica in self._replicas:
+            if replica.pool:
+                await replica.pool.close()
+        if self._pools:
+            for pool in self._pools.values():
+                await pool.close()
             LOGGER.info("DISCONNECTED FROM THE DATABASE SUCCESSFULLY")
     
-    async def execute(self, query: str, *args):
+    async def execute(self, query: str, *args) -> str:
         """"""
-        async with self._connection_pool.acquire() as conn:
+        async with self._acquire() as conn:
             async with conn.transaction():
-                await conn.execute(query, *args)
+                return await self._timed(fingerprint(query), conn.execute(query, *args), query, args)
     
     async def fetch(self, query: str, *args):
         """"""
-        async with self._connection_pool.acquire() as conn:
-            return await conn.fetch(query, *args)
+        label: str = fingerprint(query)
+        async with self._acquire(read_only=is_read_only(query)) as conn:
+            records = await self._timed(label, conn.fetch(query, *args), query, args)
+        DB_ROWS_RETURNED.inc((label,), len(records))
+        return records
     
     async def fetchrow(self, query: str, *args):
         """"""
-        async with self._connection_pool.acquire() as conn:
-            return await conn.fetchrow(query, *args)
+        label: str = fingerprint(query)
+        async with self._acquire(read_only=is_read_only(query)) as conn:
+            record = await self._timed(label, conn.fetchrow(query, *args), query, args)
+        DB_ROWS_RETURNED.inc((label,), record is not None)
+        return record
     
-    async def initdb(self) -> None:
+    async def fetchval(self, query: str, *args):
         """"""
-        try:
-            sql: str = DATABASE_SCRIPT.read_text()
-            async with self._connection_pool.acquire() as conn:
-                async with conn.transaction():
-                    await conn.execute(sql)
-            
-            LOGGER.info("CREATED DATABASE SCHEMA SUCCESSFULLY")
-        except asyncpg.exceptions.DuplicateTableError:
-            LOGGER.info("DATABASE ALREADY INITIALIZED - SKIPPING TABLE CREATION.")
-        except Exception as e:
-            LOGGER.error(f"ERROR CREATING DATABASE: {repr(e)}")
+        label: str = fingerprint(query)
+        async with self._acquire(read_only=is_read_only(query)) as conn:
+            value = await self._timed(label, conn.fetchval(query, *args), query, args)
+        DB_ROWS_RETURNED.inc((label,), value is not None)
+        return value
+    
+    async def estimate_row_count(self, table: str) -> Optional[int]:
+        """Planner estimate of a table's row count; None if the table was never analyzed."""
+        estimate = await self.fetchval(
+            "SELECT reltuples::bigint FROM pg_class WHERE oid = $1::text::regclass",
+            table
+        )
+        return estimate if estimate is not None and estimate >= 0 else None
+
+    async def initdb(self) -> int:
+        """Apply pending schema migrations; returns how many ran.
+
+        Failures raise MigrationError so a worker never serves traffic on a half-built schema.
+        """
+        async with self._acquire() as conn:
+            applied: int = await Migrator(load_migrations()).run(conn)
+        if not applied:
+            LOGGER.info("DATABASE SCHEMA IS UP TO DATE")
+            return 0
+
+        # Connections opened before the migration could not prepare every statement
+        # against the new schema; replace them so the next acquire prepares the full set.
+        for pool in self._pools.values():
+            await pool.expire_connections()
+        for replica in self._replicas:
+            if replica.pool is not None:
+                await replica.pool.expire_connections()
+        LOGGER.info(f"APPLIED {applied} DATABASE MIGRATIONS SUCCESSFULLY")
+        return applied
 
     async def drop_tables(self) -> None:
         """"""
         query = """
         DROP TABLE IF EXISTS admin CASCADE;
         DROP TABLE IF EXISTS client CASCADE;
+        DROP TABLE IF EXISTS technician_stats CASCADE;
         DROP TABLE IF EXISTS technician CASCADE;
         DROP TABLE IF EXISTS booking CASCADE;
         DROP TABLE IF EXISTS rating CASCADE;
+        DROP TABLE IF EXISTS review CASCADE;
         DROP TABLE IF EXISTS payment CASCADE;
         DROP TABLE IF EXISTS notification CASCADE;
         DROP TABLE IF EXISTS favorite_technician CASCADE;
+        DROP TABLE IF EXISTS schema_migrations CASCADE;
         """
         try:
             await self.execute(query)
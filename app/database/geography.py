@@ -0,0 +1,65 @@
+import struct
+from typing import Any, Callable, Dict, Final, NamedTuple
+
+from asyncpg import Record
+
+WGS84: Final[int] = 4326
+
+# EWKB: byte order, geometry type (with flag bits), optional SRID, then coordinates
+_EWKB_SRID_FLAG: Final[int] = 0x20000000
+_EWKB_Z_FLAG: Final[int] = 0x80000000
+_EWKB_M_FLAG: Final[int] = 0x40000000
+_WKB_POINT: Final[int] = 1
+_LITTLE_ENDIAN_POINT = struct.Struct("<BIIdd")
+_HEADER = {0: struct.Struct(">I"), 1: struct.Struct("<I")}
+_COORDINATES = {0: struct.Struct(">dd"), 1: struct.Struct("<dd")}
+_ENCODED_HEADER: Final[tuple] = (1, _WKB_POINT | _EWKB_SRID_FLAG, WGS84)
+
+
+class GeoPoint(NamedTuple):
+    """A WGS84 point, in PostGIS (x, y) order."""
+    lon: float
+    lat: float
+
+
+def encode_point(point: Any) -> bytes:
+    """GeoPoint (or any (lon, lat) pair) -> EWKB with SRID 4326, as geography_recv expects."""
+    lon, lat = point
+    return _LITTLE_ENDIAN_POINT.pack(*_ENCODED_HEADER, lon, lat)
+
+
+def decode_point(data: bytes) -> GeoPoint:
+    """EWKB from geography_send -> GeoPoint; only 2D points are supported."""
+    if len(data) == 25 and data[0] == 1:
+        _, kind, _, lon, lat = _LITTLE_ENDIAN_POINT.unpack(data)
+        if kind == _WKB_POINT | _EWKB_SRID_FLAG:
+            return GeoPoint(lon, lat)
+
+    byte_order = data[0]
+    (kind,) = _HEADER[byte_order].unpack_from(data, 1)
+    if kind & (_EWKB_Z_FLAG | _EWKB_M_FLAG) or kind & 0xFFFF != _WKB_POINT:
+        raise ValueError(f"Only 2D geography points can be decoded, got EWKB type {kind:#x}")
+    offset = 9 if kind & _EWKB_SRID_FLAG else 5
+    lon, lat = _COORDINATES[byte_order].unpack_from(data, offset)
+    return GeoPoint(lon, lat)
+
+
+async def register_geography_codec(conn, schema: str = "public") -> None:
+    """Exchange geography values with conn as GeoPoint, in binary.
+
+    Raises ValueError if PostGIS is not installed in schema yet.
+    """
+    await conn.set_type_codec(
+        "geography",
+        schema=schema,
+        encoder=encode_point,
+        decoder=decode_point,
+        format="binary"
+    )
+
+
+# record_mapper fields read off a projected `location` column
+LOCATION_FIELDS: Final[Dict[str, Callable[[Record], float]]] = {
+    "latitude": lambda record: record["location"].lat,
+    "longitude": lambda record: record["location"].lon,
+}
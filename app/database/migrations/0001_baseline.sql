@@ -72,9 +72,13 @@ CREATE TABLE IF NOT EXISTS payment (
     amount FLOAT NOT NULL,
     payment_method VARCHAR(50) CHECK (payment_method IN ('card', 'banking')),
     payment_status VARCHAR(50) DEFAULT 'pending' CHECK (payment_status IN ('pending', 'completed', 'cancelled')),
-    transaction_date TIMESTAMP
+    transaction_date TIMESTAMP,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
 );
 
+-- Payments created before keyset pagination had no created_at column
+ALTER TABLE payment ADD COLUMN IF NOT EXISTS created_at TIMESTAMPTZ NOT NULL DEFAULT NOW();
+
 CREATE TABLE IF NOT EXISTS notification (
     notification_id uuid PRIMARY KEY DEFAULT uuid_generate_v4(),
     message TEXT NOT NULL,
@@ -94,41 +98,3 @@ CREATE TABLE IF NOT EXISTS favorite_technician (
     created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
     UNIQUE (client_id, technician_id)
 );
-
--- Client indexes
-CREATE INDEX IF NOT EXISTS idx_client_email ON client(email);
-CREATE INDEX IF NOT EXISTS idx_client_phone ON client(phone_number);
-CREATE INDEX IF NOT EXISTS idx_client_location ON client USING GIST(location);
-
--- Technician indexes
-CREATE INDEX IF NOT EXISTS idx_technician_email ON technician(email);
-CREATE INDEX IF NOT EXISTS idx_technician_phone ON technician(phone_number);
-CREATE INDEX IF NOT EXISTS idx_technician_location ON technician USING GIST(location);
-CREATE INDEX IF NOT EXISTS idx_technician_service_types ON technician USING GIN(service_types);
-CREATE INDEX IF NOT EXISTS idx_technician_verified ON technician(is_verified);
-CREATE INDEX IF NOT EXISTS idx_technician_available ON technician(is_available);
-
--- Booking indexes
-CREATE INDEX IF NOT EXISTS idx_booking_client_id ON booking(client_id);
-CREATE INDEX IF NOT EXISTS idx_booking_technician_id ON booking(technician_id);
-CREATE INDEX IF NOT EXISTS idx_booking_status ON booking(status);
-CREATE INDEX IF NOT EXISTS idx_booking_date_range ON booking(start_date, end_date);
-
--- Review indexes
-CREATE INDEX IF NOT EXISTS idx_review_technician_id ON review(technician_id);
-CREATE INDEX IF NOT EXISTS idx_review_booking_id ON review(booking_id);
-CREATE INDEX IF NOT EXISTS idx_review_rating ON review(rating);
-
--- Payment indexes
-CREATE INDEX IF NOT EXISTS idx_payment_booking_id ON payment(booking_id);
-CREATE INDEX IF NOT EXISTS idx_payment_client_id ON payment(client_id);
-CREATE INDEX IF NOT EXISTS idx_payment_technician_id ON payment(technician_id);
-CREATE INDEX IF NOT EXISTS idx_payment_status ON payment(payment_status);
-
--- Notification indexes
-CREATE INDEX IF NOT EXISTS idx_notification_client ON notification(client_id) WHERE client_id IS NOT NULL;
-CREATE INDEX IF NOT EXISTS idx_notification_technician ON notification(technician_id) WHERE technician_id IS NOT NULL;
-CREATE INDEX IF NOT EXISTS idx_notification_read_status ON notification(is_read);
-
--- Favorite technician indexes
-CREATE INDEX IF NOT EXISTS idx_favorite_technician_client ON favorite_technician(client_id);
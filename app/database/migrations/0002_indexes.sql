@@ -0,0 +1,47 @@
+-- migrate: no-transaction
+-- Built CONCURRENTLY so existing tables stay writable; each statement runs on its own.
+-- Databases created by the old jobconnect.sql already have these and skip them.
+
+-- Client indexes
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_client_email ON client(email);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_client_phone ON client(phone_number);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_client_location ON client USING GIST(location);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_client_created_at ON client(created_at, client_id);
+
+-- Technician indexes
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_technician_email ON technician(email);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_technician_phone ON technician(phone_number);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_technician_location ON technician USING GIST(location);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_technician_service_types ON technician USING GIN(service_types);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_technician_verified ON technician(is_verified);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_technician_available ON technician(is_available);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_technician_created_at ON technician(created_at, technician_id);
+
+-- Booking indexes
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_booking_client_id ON booking(client_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_booking_technician_id ON booking(technician_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_booking_status ON booking(status);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_booking_date_range ON booking(start_date, end_date);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_booking_created_at ON booking(created_at, booking_id);
+
+-- Review indexes
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_review_technician_id ON review(technician_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_review_booking_id ON review(booking_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_review_rating ON review(rating);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_review_created_at ON review(created_at, review_id);
+
+-- Payment indexes
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_payment_booking_id ON payment(booking_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_payment_client_id ON payment(client_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_payment_technician_id ON payment(technician_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_payment_status ON payment(payment_status);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_payment_created_at ON payment(created_at, payment_id);
+
+-- Notification indexes
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_notification_client ON notification(client_id) WHERE client_id IS NOT NULL;
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_notification_technician ON notification(technician_id) WHERE technician_id IS NOT NULL;
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_notification_read_status ON notification(is_read);
+
+-- Favorite technician indexes
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_favorite_technician_client ON favorite_technician(client_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_favorite_technician_created_at ON favorite_technician(created_at, id);
@@ -0,0 +1,21 @@
+-- A technician's bookings may not overlap unless cancelled. The exclusion constraint's
+-- GiST index on (technician_id, period) also serves the technician_is_free lookup.
+-- Existing overlapping bookings make this migration fail; list them with
+--   SELECT a.booking_id, b.booking_id FROM booking a JOIN booking b
+--   ON a.technician_id = b.technician_id AND a.booking_id < b.booking_id AND a.period && b.period
+--   WHERE a.status <> 'cancelled' AND b.status <> 'cancelled';
+CREATE EXTENSION IF NOT EXISTS btree_gist;
+
+-- start_date/end_date are UTC wall-clock TIMESTAMPs; bookings without both, or with
+-- end_date not after start_date, get no period and take no part in the check.
+ALTER TABLE booking ADD COLUMN IF NOT EXISTS period TSTZRANGE GENERATED ALWAYS AS (
+    CASE WHEN start_date < end_date
+        THEN tstzrange(start_date AT TIME ZONE 'UTC', end_date AT TIME ZONE 'UTC', '[)')
+    END
+) STORED;
+
+-- New and updated bookings must end after they start; existing rows are not rechecked.
+ALTER TABLE booking ADD CONSTRAINT booking_period_valid CHECK (end_date > start_date) NOT VALID;
+
+ALTER TABLE booking ADD CONSTRAINT booking_no_overlap
+    EXCLUDE USING GIST (technician_id WITH =, period WITH &&) WHERE (status <> 'cancelled');
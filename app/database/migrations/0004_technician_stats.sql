@@ -0,0 +1,95 @@
+-- Per-technician rating aggregates, kept current by a trigger on review so that reading
+-- a technician's rating never has to scan their reviews. Technicians without reviews
+-- have no row; readers fall back to technician_rating_score(0, 0).
+
+-- Bayesian average: the mean rating after adding 5 imaginary reviews of 3.5 stars, so a
+-- single 5-star review does not outrank fifty 4.8-star ones. Changing the prior means
+-- replacing this function and running python -m app.utils.rebuild_technician_stats.
+CREATE OR REPLACE FUNCTION technician_rating_score(review_count INTEGER, rating_sum NUMERIC)
+RETURNS NUMERIC LANGUAGE sql IMMUTABLE PARALLEL SAFE AS $$
+    SELECT round((rating_sum + 5 * 3.5) / (review_count + 5), 4)
+$$;
+
+CREATE TABLE IF NOT EXISTS technician_stats (
+    technician_id uuid PRIMARY KEY REFERENCES technician(technician_id) ON DELETE CASCADE,
+    review_count INTEGER NOT NULL DEFAULT 0,
+    rating_sum NUMERIC(12, 2) NOT NULL DEFAULT 0,
+    -- Reviews per star, 1 to 5, with ratings rounded to the nearest star
+    rating_histogram INTEGER[] NOT NULL DEFAULT '{0,0,0,0,0}',
+    rating_score NUMERIC GENERATED ALWAYS AS (technician_rating_score(review_count, rating_sum)) STORED,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_technician_stats_rating_score ON technician_stats (rating_score DESC);
+
+-- Adds (sign = 1) or removes (sign = -1) one review. Removal never creates a row: when a
+-- technician is deleted their stats row may already be gone by the time the cascaded
+-- review deletes get here.
+CREATE OR REPLACE FUNCTION technician_stats_apply(p_technician_id uuid, p_rating NUMERIC, p_sign INTEGER)
+RETURNS void LANGUAGE plpgsql AS $$
+DECLARE
+    star INTEGER := round(p_rating)::INTEGER;
+BEGIN
+    IF p_technician_id IS NULL THEN
+        RETURN;
+    END IF;
+    IF p_sign > 0 THEN
+        INSERT INTO technician_stats (technician_id) VALUES (p_technician_id) ON CONFLICT DO NOTHING;
+    END IF;
+    UPDATE technician_stats SET
+        review_count = review_count + p_sign,
+        rating_sum = rating_sum + p_sign * p_rating,
+        rating_histogram[star] = rating_histogram[star] + p_sign,
+        updated_at = NOW()
+    WHERE technician_id = p_technician_id;
+END
+$$;
+
+CREATE OR REPLACE FUNCTION review_maintain_technician_stats()
+RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM technician_stats_apply(OLD.technician_id, OLD.rating, -1);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM technician_stats_apply(NEW.technician_id, NEW.rating, 1);
+    END IF;
+    RETURN NULL;
+END
+$$;
+
+CREATE TRIGGER review_technician_stats
+    AFTER INSERT OR DELETE OR UPDATE OF technician_id, rating ON review
+    FOR EACH ROW EXECUTE FUNCTION review_maintain_technician_stats();
+
+-- Recomputes every row from review; returns the number of technicians with reviews.
+-- The SHARE lock holds off review writes for the duration, so none is lost between
+-- reading review and replacing technician_stats.
+CREATE OR REPLACE FUNCTION rebuild_technician_stats()
+RETURNS INTEGER LANGUAGE plpgsql AS $$
+DECLARE
+    rebuilt INTEGER;
+BEGIN
+    LOCK TABLE review IN SHARE MODE;
+    DELETE FROM technician_stats;
+    INSERT INTO technician_stats (technician_id, review_count, rating_sum, rating_histogram)
+    SELECT
+        technician_id,
+        count(*),
+        sum(rating),
+        ARRAY[
+            count(*) FILTER (WHERE round(rating) = 1),
+            count(*) FILTER (WHERE round(rating) = 2),
+            count(*) FILTER (WHERE round(rating) = 3),
+            count(*) FILTER (WHERE round(rating) = 4),
+            count(*) FILTER (WHERE round(rating) = 5)
+        ]::INTEGER[]
+    FROM review
+    WHERE technician_id IS NOT NULL
+    GROUP BY technician_id;
+    GET DIAGNOSTICS rebuilt = ROW_COUNT;
+    RETURN rebuilt;
+END
+$$;
+
+SELECT rebuild_technician_stats();
@@ -0,0 +1,166 @@
+import hashlib
+import logging
+import re
+import time
+from pathlib import Path
+from typing import Dict, Final, List, NamedTuple
+
+import asyncpg
+
+LOGGER = logging.getLogger(__name__)
+
+MIGRATIONS_PATH: Final[Path] = Path(__file__).parent / "migrations"
+NO_TRANSACTION_MARKER: Final[str] = "-- migrate: no-transaction"
+# Any constant works as long as no other code takes the same advisory lock
+MIGRATION_LOCK_KEY: Final[int] = 0x6A6F62636F6E6E
+
+MIGRATION_FILE = re.compile(r"^(\d+)_(\w+)\.sql$")
+STATEMENT_END = re.compile(r";\s*$", re.MULTILINE)
+CONCURRENT_INDEX = re.compile(
+    r"CREATE\s+(?:UNIQUE\s+)?INDEX\s+CONCURRENTLY\s+IF\s+NOT\s+EXISTS\s+(\w+)", re.IGNORECASE
+)
+
+CREATE_MIGRATIONS_TABLE: Final[str] = """
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    version INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    checksum TEXT NOT NULL,
+    duration_ms INTEGER NOT NULL,
+    applied_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+)
+"""
+APPLIED_MIGRATIONS: Final[str] = "SELECT version, checksum FROM schema_migrations"
+RECORD_MIGRATION: Final[str] = """
+INSERT INTO schema_migrations (version, name, checksum, duration_ms) VALUES ($1, $2, $3, $4)
+"""
+
+
+class MigrationError(RuntimeError):
+    """Raised when the migrations on disk and the applied ones disagree, or one fails"""
+
+
+class Migration(NamedTuple):
+    """One ordered schema step loaded from app/database/migrations."""
+    version: int
+    name: str
+    sql: str
+    checksum: str
+    transactional: bool
+
+    def statements(self) -> List[str]:
+        """The script split into statements, for steps that must run one statement at a time."""
+        parts = (part.strip() for part in STATEMENT_END.split(self.sql))
+        return [
+            part for part in parts
+            if any(line.strip() and not line.strip().startswith("--") for line in part.splitlines())
+        ]
+
+
+def load_migrations(path: Path = MIGRATIONS_PATH) -> List[Migration]:
+    """Every NNNN_name.sql file under path, in version order."""
+    migrations: List[Migration] = []
+    for file in path.glob("*.sql"):
+        match = MIGRATION_FILE.match(file.name)
+        if match is None:
+            raise MigrationError(f"Migration file '{file.name}' is not named NNNN_name.sql")
+        sql: str = file.read_text()
+        migrations.append(Migration(
+            version=int(match.group(1)),
+            name=match.group(2),
+            sql=sql,
+            checksum=hashlib.sha256(sql.encode()).hexdigest(),
+            transactional=not sql.lstrip().startswith(NO_TRANSACTION_MARKER)
+        ))
+    migrations.sort(key=lambda m: m.version)
+    versions = [m.version for m in migrations]
+    if len(set(versions)) != len(versions):
+        raise MigrationError(f"Duplicate migration versions in {path}")
+    return migrations
+
+
+class Migrator:
+    """Applies pending migrations and records them in schema_migrations.
+
+    The common case - nothing to do - costs one query. Otherwise the runner takes a
+    session advisory lock, so when several workers boot together one migrates and the
+    rest wait and then find nothing left. Steps run in order, each in its own
+    transaction unless its file starts with the no-transaction marker (needed for
+    CREATE INDEX CONCURRENTLY), in which case its statements run one by one.
+    A changed checksum on an applied step, or any failed step, raises MigrationError.
+    """
+
+    def __init__(self, migrations: List[Migration]) -> None:
+        self.migrations: List[Migration] = migrations
+
+    async def _applied(self, conn: asyncpg.Connection) -> Dict[int, str]:
+        """"""
+        try:
+            records = await conn.fetch(APPLIED_MIGRATIONS)
+        except asyncpg.UndefinedTableError:
+            return {}
+        return {record["version"]: record["checksum"] for record in records}
+
+    def _pending(self, applied: Dict[int, str]) -> List[Migration]:
+        """"""
+        for migration in self.migrations:
+            checksum = applied.get(migration.version)
+            if checksum is not None and checksum != migration.checksum:
+                raise MigrationError(
+                    f"Migration {migration.version}_{migration.name} was changed after it was applied"
+                )
+        return [m for m in self.migrations if m.version not in applied]
+
+    async def run(self, conn: asyncpg.Connection) -> int:
+        """Apply every pending migration on conn; returns how many were applied."""
+        if not self._pending(await self._applied(conn)):
+            return 0
+
+        await conn.execute("SELECT pg_advisory_lock($1)", MIGRATION_LOCK_KEY)
+        try:
+            await conn.execute(CREATE_MIGRATIONS_TABLE)
+            # Another worker may have migrated while this one waited for the lock
+            pending = self._pending(await self._applied(conn))
+            for migration in pending:
+                await self._apply(conn, migration)
+            return len(pending)
+        finally:
+            await conn.execute("SELECT pg_advisory_unlock($1)", MIGRATION_LOCK_KEY)
+
+    async def _apply(self, conn: asyncpg.Connection, migration: Migration) -> None:
+        """"""
+        label: str = f"{migration.version}_{migration.name}"
+        LOGGER.info(f"APPLYING MIGRATION {label}")
+        start = time.perf_counter()
+        try:
+            if migration.transactional:
+                async with conn.transaction():
+                    await conn.execute(migration.sql)
+                    await self._record(conn, migration, start)
+                return
+            for statement in migration.statements():
+                await self._drop_invalid_index(conn, statement)
+                await conn.execute(statement)
+            await self._record(conn, migration, start)
+        except asyncpg.PostgresError as e:
+            raise MigrationError(f"Migration {label} failed: {e}") from e
+
+    async def _record(self, conn: asyncpg.Connection, migration: Migration, start: float) -> None:
+        """"""
+        duration_ms = int((time.perf_counter() - start) * 1000)
+        await conn.execute(RECORD_MIGRATION, migration.version, migration.name, migration.checksum, duration_ms)
+        LOGGER.info(f"APPLIED MIGRATION {migration.version}_{migration.name} IN {duration_ms}ms")
+
+    async def _drop_invalid_index(self, conn: asyncpg.Connection, statement: str) -> None:
+        """Drop the INVALID index a failed CREATE INDEX CONCURRENTLY leaves behind.
+
+        IF NOT EXISTS would otherwise treat the broken index as done on the retry.
+        """
+        match = CONCURRENT_INDEX.search(statement)
+        if match is None:
+            return
+        invalid = await conn.fetchval(
+            "SELECT NOT indisvalid FROM pg_index WHERE indexrelid = to_regclass($1)", match.group(1)
+        )
+        if invalid:
+            LOGGER.warning(f"DROPPING INVALID INDEX {match.group(1)} LEFT BY AN EARLIER FAILED BUILD")
+            await conn.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {match.group(1)}")
@@ -1,12 +1,26 @@
 from fastapi import FastAPI, HTTPException, status, Depends
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from contextlib import asynccontextmanager
 
-from app.database.database import AsyncDatabase
+from app.database.database import ANALYTICS, BACKGROUND, INTERACTIVE, AsyncDatabase, PoolConfig
+from app.repositories.booking import BookingRepository
+from app.repositories.client import ClientRepository
+from app.repositories.favorite_technician import FavoriteTechnicianRepository
+from app.repositories.notification import NotificationRepository
+from app.repositories.payment import PaymentRepository
+from app.repositories.review import ReviewRepository
+from app.repositories.technician import TechnicianRepository
+from app.container import Container
+from app.services.search_technician import build_upstream_client
+from app.services.technician_index import TechnicianSpatialIndex
+from app.utils.security import password_hasher
+from app.utils.metrics import REGISTRY, MetricsMiddleware
 from app.config import settings
 from app.api.v1 import router
 
+import asyncio
 import logging
 
 logging.basicConfig(
@@ -16,6 +30,28 @@ logging.basicConfig(
 
 LOGGER = logging.getLogger(__name__)
 
+REPOSITORIES: tuple = (
+    # AdminRepository,
+    BookingRepository,
+    ClientRepository,
+    FavoriteTechnicianRepository,
+    NotificationRepository,
+    PaymentRepository,
+    ReviewRepository,
+    TechnicianRepository,
+)
+
+
+async def refresh_technician_index(index: TechnicianSpatialIndex, repo: TechnicianRepository) -> None:
+    """Periodically rebuild the index so writes made by other workers show up."""
+    while True:
+        await asyncio.sleep(settings.TECHNICIAN_INDEX_REFRESH_SECONDS)
+        try:
+            with repo.db.workload(BACKGROUND):
+                await index.refresh(repo)
+        except Exception as e:
+            LOGGER.error(f"TECHNICIAN INDEX REFRESH FAILED: {repr(e)}")
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -26,16 +62,69 @@ async def lifespan(app: FastAPI):
         dbname=settings.DB_NAME,
         username=settings.DB_USER,
         password=settings.DB_PASSWORD,
-        port=settings.DB_PORT
+        port=settings.DB_PORT,
+        statement_cache_size=settings.DB_STATEMENT_CACHE_SIZE,
+        slow_query_ms=settings.DB_SLOW_QUERY_MS,
+        explain_sample_rate=settings.DB_EXPLAIN_SAMPLE_RATE,
+        replica_dsns=settings.replica_dsns,
+        read_your_writes_seconds=settings.DB_READ_YOUR_WRITES_SECONDS,
+        max_replica_lag_seconds=settings.DB_REPLICA_MAX_LAG_SECONDS,
+        replica_check_seconds=settings.DB_REPLICA_CHECK_SECONDS,
+        pools={
+            INTERACTIVE: PoolConfig(
+                settings.DB_POOL_MIN_SIZE, settings.DB_POOL_MAX_SIZE, settings.DB_POOL_ACQUIRE_TIMEOUT_SECONDS
+            ),
+            BACKGROUND: PoolConfig(
+                1, settings.DB_BACKGROUND_POOL_MAX_SIZE, settings.DB_BACKGROUND_POOL_ACQUIRE_TIMEOUT_SECONDS
+            ),
+            ANALYTICS: PoolConfig(
+                1, settings.DB_ANALYTICS_POOL_MAX_SIZE, settings.DB_ANALYTICS_POOL_ACQUIRE_TIMEOUT_SECONDS
+            ),
+        },
+        max_queries=settings.DB_POOL_MAX_QUERIES,
+        max_lifetime_seconds=settings.DB_POOL_MAX_LIFETIME_SECONDS,
+        idle_timeout_seconds=settings.DB_POOL_IDLE_TIMEOUT_SECONDS
     )
+    for repository in REPOSITORIES:
+        app.state.db.register_statements(repository.STATEMENTS)
     await app.state.db.connect()
+    REGISTRY.gauge_callback(
+        "db_pool_connections",
+        "Connections in each database pool by state.",
+        lambda: {
+            (pool, state): n
+            for pool, stats in app.state.db.pool_stats().items()
+            for state, n in stats.items()
+        },
+        ("pool", "state")
+    )
     # await app.state.db.drop_tables()
     await app.state.db.initdb()
+    # initdb replaces every pooled connection when it migrates; reopen them before taking traffic
+    await app.state.db.warm_up()
     # await app.state.db.populate_with_dummy_data()
 
+    app.state.http_client = build_upstream_client()
+
+    technician_index = await TechnicianSpatialIndex.load(
+        TechnicianRepository(app.state.db), cell_size_deg=settings.TECHNICIAN_INDEX_CELL_DEGREES
+    )
+    LOGGER.info(f"TECHNICIAN INDEX LOADED WITH {len(technician_index)} TECHNICIANS")
+    app.state.container = Container(app.state.db, app.state.http_client, technician_index)
+
+    index_refresher = None
+    if settings.TECHNICIAN_INDEX_REFRESH_SECONDS > 0:
+        index_refresher = asyncio.create_task(
+            refresh_technician_index(technician_index, app.state.container.technician_repository)
+        )
+
     yield
 
     LOGGER.info("SHUTTING DOWN...")
+    if index_refresher is not None:
+        index_refresher.cancel()
+    await app.state.http_client.aclose()
+    password_hasher.shutdown()
     await app.state.db.disconnect()
     LOGGER.info("DATABASE CLOSED SUCCESSFULLY")
 
@@ -59,6 +148,8 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.add_middleware(MetricsMiddleware)
+
 app.mount("/static", StaticFiles(directory="static"), name="static")
 app.include_router(router, prefix="/api/v1")
 
@@ -73,6 +164,12 @@ async def root() -> dict:
     }
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics() -> PlainTextResponse:
+    """Prometheus scrape endpoint."""
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+
 @app.get("/health")
 async def health_check(db: AsyncDatabase = Depends(lambda: app.state.db)):
     """Database health check endpoint."""
@@ -82,6 +179,8 @@ async def health_check(db: AsyncDatabase = Depends(lambda: app.state.db)):
         return {
             "STATUS": "healthy", 
             "DATABASE": "connected",
+            "DATABASE_REPLICAS": db.replica_stats(),
+            "PASSWORD_HASHER": password_hasher.stats(),
             "DEBUG": settings.DEBUG
         }
     except Exception as e:
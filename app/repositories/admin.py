@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime, timezone
-from typing import Optional, List
-from asyncpg import Record
+from typing import Dict, Final, Optional, List
+from asyncpg import Record, UniqueViolationError
 
 from app.database.database import AsyncDatabase
 from app.schemas.admin import AdminCreate, AdminInDB, AdminRole, AdminUpdate
@@ -12,9 +12,46 @@ from app.utils.exceptions import (
     DuplicateEntryException,
 )
 
+ADMIN_COLUMNS: Final[str] = "admin_id, name, surname, email, phone_number, password_hash, role, created_at"
+
+STATEMENTS: Final[Dict[str, str]] = {
+    "admin_get_all": f"SELECT {ADMIN_COLUMNS} FROM admin",
+    "admin_get_by_id": f"SELECT {ADMIN_COLUMNS} FROM admin WHERE admin_id = $1",
+    "admin_get_by_email": f"SELECT {ADMIN_COLUMNS} FROM admin WHERE email = $1",
+    "admin_create": f"""
+        INSERT INTO admin (
+            name, surname, email, phone_number,
+            password_hash, role
+        )
+        VALUES ($1, $2, $3, $4, $5, $6)
+        ON CONFLICT DO NOTHING
+        RETURNING {ADMIN_COLUMNS}
+    """,
+    # NULL parameters leave the column unchanged.
+    "admin_update": f"""
+        UPDATE admin SET
+            name = COALESCE($2, name),
+            surname = COALESCE($3, surname),
+            email = COALESCE($4, email),
+            phone_number = COALESCE($5, phone_number),
+            role = COALESCE($6, role),
+            password_hash = COALESCE($7, password_hash)
+        WHERE admin_id = $1
+        RETURNING {ADMIN_COLUMNS}
+    """,
+    "admin_delete": "DELETE FROM admin WHERE admin_id = $1",
+    # Only replaces the hash that was verified, so a concurrent password change wins.
+    "admin_replace_password_hash": """
+        UPDATE admin SET password_hash = $3
+        WHERE admin_id = $1 AND password_hash = $2
+    """,
+}
+
 
 class AdminRepository:
 
+    STATEMENTS: Final[Dict[str, str]] = STATEMENTS
+
     def __init__(self, db: AsyncDatabase) -> None:
         self.db = db
     
@@ -35,49 +72,34 @@ class AdminRepository:
     
     async def get_all(self) -> List[AdminInDB]:
         """"""
-        records = await self.db.fetch("SELECT * FROM admin")
+        records = await self.db.fetch_named("admin_get_all")
         return [AdminRepository.record_to_admin(r) for r in records]
     
     async def get_by_id(self, admin_id: str) -> Optional[AdminInDB]:
         """"""
-        record = await self.db.fetchrow(
-            "SELECT * FROM admin WHERE admin_id = $1",
-            uuid.UUID(admin_id)
-        )
+        record = await self.db.fetchrow_named("admin_get_by_id", uuid.UUID(admin_id))
         return AdminRepository.record_to_admin(record) if record else None
     
     async def get_by_email(self, email: str) -> Optional[AdminInDB]:
         """"""
-        record = await self.db.fetchrow(
-            "SELECT * FROM admin WHERE email = $1", 
-            email
-        )
+        record = await self.db.fetchrow_named("admin_get_by_email", email)
         return AdminRepository.record_to_admin(record) if record is not None else None
     
     async def create(self, admin_data: AdminCreate) -> AdminInDB:
         """"""
-        if await self.get_by_email(admin_data.email):
-            raise DuplicateEntryException()
-        
-        hashed_password: str = SecurityUtils.hash_password(admin_data.password)
-        query: str = """
-        INSERT INTO admin (
-            name, surname, email, phone_number,
-            password_hash, role
-        )
-        VALUES ($1, $2, $3, $4, $5, $6)
-        """
-        await self.db.execute(
-            query,
+        hashed_password: str = await SecurityUtils.hash_password_async(admin_data.password)
+        record = await self.db.fetchrow_named(
+            "admin_create",
             admin_data.name,
             admin_data.surname,
             admin_data.email,
             admin_data.phone_number,
             hashed_password,
-            admin_data.role or AdminRole.SUPPORT_ADMIN.value,
+            (admin_data.role or AdminRole.SUPPORT_ADMIN).value,
         )
-        new_admin = await self.get_by_email(admin_data.email)
-        return new_admin
+        if record is None:
+            raise DuplicateEntryException()
+        return AdminRepository.record_to_admin(record)
 
     async def update(self, admin_id: str, update_data: AdminUpdate) -> AdminInDB:
         """"""
@@ -90,38 +112,33 @@ class AdminRepository:
             ):
             raise PermissionError("Only super admin can modify admin roles")
         
-        updates: list = []
-        params: list = []
-        param_count: int = 1
-
-        fields = {
-            "name": update_data.name,
-            "surname": update_data.surname,
-            "email": update_data.email,
-            "phone_number": update_data.phone_number,
-            "role": update_data.role,
-        }
-
+        password_hash: Optional[str] = None
         if update_data.password is not None:
-            fields["password_hash"] = SecurityUtils.hash_password(update_data.password)
-        
-        for field, value in fields.items():
-            if value is not None:
-                updates.append(f"{field} = ${param_count}")
-                params.append(value)
-                param_count += 1
-        
-        if not updates:
-            return await self.get_by_id(admin_id)
-        
-        query: str = f"""
-        UPDATE admin SET {', '.join(updates)}
-        WHERE admin_id = ${param_count}
-        """
-        params.append(uuid.UUID(admin_id))
+            password_hash = await SecurityUtils.hash_password_async(update_data.password)
+
+        try:
+            record = await self.db.fetchrow_named(
+                "admin_update",
+                uuid.UUID(admin_id),
+                update_data.name,
+                update_data.surname,
+                update_data.email,
+                update_data.phone_number,
+                update_data.role.value if update_data.role is not None else None,
+                password_hash
+            )
+        except UniqueViolationError:
+            raise DuplicateEntryException()
+        if record is None:
+            raise NotFoundException("Admin not found")
+        return AdminRepository.record_to_admin(record)
 
-        await self.db.execute(query, *params)
-        return await self.get_by_id(admin_id)
+    async def replace_password_hash(self, admin_id: str, old_hash: str, new_hash: str) -> bool:
+        """"""
+        result = await self.db.execute_named(
+            "admin_replace_password_hash", uuid.UUID(admin_id), old_hash, new_hash
+        )
+        return result != "UPDATE 0"
 
     async def update_last_login(self, admin_id: str) -> None:
         await self.db.execute(
@@ -132,7 +149,4 @@ class AdminRepository:
 
     async def delete(self, admin_id: str) -> None:
         """"""
-        await self.db.execute(
-            "DELETE FROM admin WHERE admin_id = $1",
-            uuid.UUID(admin_id)
-        )
+        await self.db.execute_named("admin_delete", uuid.UUID(admin_id))
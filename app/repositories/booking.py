@@ -1,13 +1,113 @@
 import uuid
-from datetime import datetime
-from typing import Optional, List, Any
-from asyncpg import Record
+from contextlib import aclosing
+from datetime import datetime, timezone
+from typing import AsyncIterator, Callable, Dict, Final, Optional, List, Any, Tuple
+from asyncpg import CheckViolationError, ExclusionViolationError, Record
 from app.schemas.booking import BookingCreate, BookingInDB, BookingUpdate, BookingStatus
 from app.database.database import AsyncDatabase
+from app.utils.exceptions import BookingConflictException, InvalidBookingPeriodException, NotFoundException
+from app.utils.mapping import row_type
+from app.utils.pagination import T, Page, keyset_statements, fetch_page, build_page
+
+BOOKING_COLUMNS: Final[str] = """
+    booking_id,
+    client_id,
+    technician_id,
+    service_type,
+    description,
+    price,
+    status,
+    start_date,
+    end_date,
+    created_at
+"""
+
+# Same range as the generated booking.period column, built from two TIMESTAMP parameters.
+BOOKING_PERIOD: Final[str] = "tstzrange({start}::timestamp AT TIME ZONE 'UTC', {end}::timestamp AT TIME ZONE 'UTC', '[)')"
+
+# Compact tuple form of BOOKING_COLUMNS for bulk internal processing.
+BookingRow = row_type("BookingRow", BOOKING_COLUMNS)
+
+STATEMENTS: Final[Dict[str, str]] = {
+    **keyset_statements("booking", "booking", BOOKING_COLUMNS, "booking_id"),
+    "booking_export": f"SELECT {BOOKING_COLUMNS} FROM booking ORDER BY created_at, booking_id",
+    "booking_get_by_id": f"SELECT {BOOKING_COLUMNS} FROM booking WHERE booking_id = $1",
+    "booking_get_by_client_id": f"SELECT {BOOKING_COLUMNS} FROM booking WHERE client_id = $1",
+    "booking_get_by_technician_id": f"SELECT {BOOKING_COLUMNS} FROM booking WHERE technician_id = $1",
+    "booking_get_by_service_type": f"SELECT {BOOKING_COLUMNS} FROM booking WHERE service_type = $1",
+    "booking_get_by_status": f"SELECT {BOOKING_COLUMNS} FROM booking WHERE status = $1",
+    "booking_create": f"""
+        INSERT INTO booking
+            (client_id, technician_id, service_type, description,
+            price, status, start_date, end_date)
+        VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
+        RETURNING {BOOKING_COLUMNS}
+    """,
+    # NULL parameters leave the column unchanged.
+    "booking_update": f"""
+        UPDATE booking SET
+            description = COALESCE($2, description),
+            price = COALESCE($3, price),
+            status = COALESCE($4, status),
+            start_date = COALESCE($5, start_date),
+            end_date = COALESCE($6, end_date)
+        WHERE booking_id = $1
+        RETURNING {BOOKING_COLUMNS}
+    """,
+    "booking_delete": "DELETE FROM booking WHERE booking_id = $1",
+    # Answered from the booking_no_overlap GiST index; the status filter matches its predicate.
+    "booking_technician_is_free": f"""
+        SELECT NOT EXISTS (
+            SELECT 1 FROM booking
+            WHERE technician_id = $1
+                AND period && {BOOKING_PERIOD.format(start="$2", end="$3")}
+                AND status <> 'cancelled'
+        )
+    """,
+    # One index probe per technician through the same GiST index.
+    "booking_busy_periods": f"""
+        SELECT t.technician_id, lower(b.period) AS start_at, upper(b.period) AS end_at
+        FROM unnest($1::uuid[]) AS t(technician_id)
+        CROSS JOIN LATERAL (
+            SELECT period FROM booking
+            WHERE booking.technician_id = t.technician_id
+                AND period && {BOOKING_PERIOD.format(start="$2", end="$3")}
+                AND status <> 'cancelled'
+        ) AS b
+        ORDER BY t.technician_id, lower(b.period)
+    """,
+    "booking_load_counts": f"""
+        SELECT t.technician_id, (
+            SELECT count(*) FROM booking
+            WHERE booking.technician_id = t.technician_id
+                AND period && {BOOKING_PERIOD.format(start="$2", end="$3")}
+                AND status <> 'cancelled'
+        ) AS bookings
+        FROM unnest($1::uuid[]) AS t(technician_id)
+    """,
+}
+
+
+def _utc_timestamp(moment: datetime) -> datetime:
+    """Naive UTC datetime for the booking table's TIMESTAMP parameters."""
+    if moment.tzinfo is None:
+        return moment
+    return moment.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _raise_for_period_violation(error: Exception) -> None:
+    """Map the booking table's period constraints to API errors."""
+    if isinstance(error, ExclusionViolationError):
+        raise BookingConflictException() from error
+    if isinstance(error, CheckViolationError) and error.constraint_name == "booking_period_valid":
+        raise InvalidBookingPeriodException() from error
+    raise error
 
 
 class BookingRepository:
 
+    STATEMENTS: Final[Dict[str, str]] = STATEMENTS
+
     def __init__(self, db: AsyncDatabase) -> None:
         self.db = db
 
@@ -27,89 +127,137 @@ class BookingRepository:
             created_at=record["created_at"]
         )
     
-    async def get_all_bookings(self) -> List[BookingInDB]:
-        """"""
-        records = await self.db.fetch("SELECT * FROM booking")
-        return [BookingRepository.record_to_booking(r) for r in records]
+    def stream_all(self, chunk_size: int) -> AsyncIterator[List[Record]]:
+        """Every booking row, oldest first, in chunks read from a server-side cursor."""
+        return self.db.stream_named("booking_export", chunk_size=chunk_size)
+
+    async def get_all_rows(self) -> List[BookingRow]:
+        """Every booking as a BookingRow tuple, oldest first."""
+        records = await self.db.fetch_named("booking_export")
+        return [BookingRow.from_record(r) for r in records]
+
+    async def stream_rows(self, chunk_size: int) -> AsyncIterator[List[BookingRow]]:
+        """stream_all, with each chunk as BookingRow tuples."""
+        async with aclosing(self.stream_all(chunk_size)) as chunks:
+            async for records in chunks:
+                yield [BookingRow.from_record(r) for r in records]
+
+    async def get_all_bookings(
+        self,
+        limit: int,
+        after: Optional[str] = None,
+        mapper: Optional[Callable[[Record], T]] = None
+    ) -> Page[T]:
+        """One page, newest first; rows become BookingInDB unless another mapper is given."""
+        records = await fetch_page(self.db, "booking", limit, after)
+        return build_page(records, limit, mapper or BookingRepository.record_to_booking, "booking_id")
     
+    async def count_estimate(self) -> Optional[int]:
+        """"""
+        return await self.db.estimate_row_count("booking")
+
     async def get_booking_by_id(self, booking_id: str) -> Optional[BookingInDB]:
         """"""
-        records = await self.db.fetchrow(
-            f"SELECT * FROM booking WHERE booking_id = $1",
-            uuid.UUID(booking_id)
-            )
-        return [BookingRepository.record_to_booking(r) for r in records]
+        record = await self.db.fetchrow_named("booking_get_by_id", uuid.UUID(booking_id))
+        return BookingRepository.record_to_booking(record) if record is not None else None
     
     async def get_bookings_by_client_id(self, client_id: str) -> List[BookingInDB]:
         """"""
-        return await self._get_by("client_id", uuid.UUID(client_id))
+        return await self._get_by("booking_get_by_client_id", uuid.UUID(client_id))
     
     async def get_bookings_by_technician_id(self, technician_id: str) -> List[BookingInDB]:
         """"""
-        return await self._get_by("technician_id", uuid.UUID(technician_id))
+        return await self._get_by("booking_get_by_technician_id", uuid.UUID(technician_id))
     
     async def get_bookings_by_service_type(self, service_type: str) -> List[BookingInDB]:
         """"""
-        return await self._get_by("service_type", service_type)
+        return await self._get_by("booking_get_by_service_type", service_type)
     
     async def get_bookings_by_status(self, status: BookingStatus) -> List[BookingInDB]:
         """"""
-        return await self._get_by("status", status.value)
+        return await self._get_by("booking_get_by_status", BookingStatus(status).value)
     
-    async def _get_by(self, column_name: str, value: Any) -> List[BookingInDB]:
+    async def _get_by(self, statement: str, value: Any) -> List[BookingInDB]:
         """"""
-        records = await self.db.fetch(
-            f"SELECT * FROM booking WHERE {column_name} = $1",
-            value
-            )
+        records = await self.db.fetch_named(statement, value)
         return [BookingRepository.record_to_booking(r) for r in records]
     
+    async def technician_is_free(self, technician_id: str, start: datetime, end: datetime) -> bool:
+        """Whether the technician has no active booking overlapping [start, end)."""
+        return await self.db.fetchval_named(
+            "booking_technician_is_free", uuid.UUID(technician_id), _utc_timestamp(start), _utc_timestamp(end)
+        )
+
+    async def get_busy_periods(
+        self,
+        technician_ids: List[str],
+        start: datetime,
+        end: datetime
+    ) -> Dict[str, List[Tuple[datetime, datetime]]]:
+        """Active bookings overlapping [start, end) per technician, as UTC (start, end) pairs sorted by start."""
+        records = await self.db.fetch_named(
+            "booking_busy_periods",
+            [uuid.UUID(t) for t in technician_ids],
+            _utc_timestamp(start),
+            _utc_timestamp(end)
+        )
+        busy: Dict[str, List[Tuple[datetime, datetime]]] = {}
+        for r in records:
+            busy.setdefault(str(r["technician_id"]), []).append((r["start_at"], r["end_at"]))
+        return busy
+
+    async def count_active_bookings(
+        self,
+        technician_ids: List[str],
+        start: datetime,
+        end: datetime
+    ) -> Dict[str, int]:
+        """Number of active bookings overlapping [start, end) per technician, zero included."""
+        records = await self.db.fetch_named(
+            "booking_load_counts",
+            [uuid.UUID(t) for t in technician_ids],
+            _utc_timestamp(start),
+            _utc_timestamp(end)
+        )
+        return {str(r["technician_id"]): r["bookings"] for r in records}
+
     async def update_booking(self, booking_id: str, update_data: BookingUpdate) -> BookingInDB:
         """"""
-        fields: dict = {
-            "description": update_data.description,
-            "price": update_data.price,
-            "status": update_data.status,
-            "start_date": update_data.start_date,
-            "end_date": update_data.end_date
-        }
-
-        fields = {k: v for k, v in fields.items() if v is not None}
-        updates: list = [f"{k} = {i}" for i, k in enumerate(fields.keys(), start=2)]
-        values = [uuid.UUID(booking_id), *tuple(fields.values())]
-
-        await self.db.execute(
-            f"""
-            UPDATE booking SET {', '.join(updates)}
-            WHERE booking_id = $1
-            """,
-            *values
-        )
-        return await self.get_booking_by_id(booking_id)
+        try:
+            record = await self.db.fetchrow_named(
+                "booking_update",
+                uuid.UUID(booking_id),
+                update_data.description,
+                update_data.price,
+                update_data.status.value if update_data.status is not None else None,
+                update_data.start_date,
+                update_data.end_date
+            )
+        except (ExclusionViolationError, CheckViolationError) as e:
+            _raise_for_period_violation(e)
+        if record is None:
+            raise NotFoundException("Booking not found")
+        return BookingRepository.record_to_booking(record)
     
     async def delete_booking(self, booking_id: str) -> bool:
         """"""
-        result = await self.db.execute("DELETE FROM booking WHERE booking_id = $1", booking_id)
-        return result == "DELETE 0"
+        result = await self.db.execute_named("booking_delete", uuid.UUID(booking_id))
+        return result != "DELETE 0"
     
     async def create(self, booking_data: BookingCreate) -> BookingInDB:
-        """"""
-        query: str = """
-        INSERT INTO booking
-            (client_id, technician_id, service_type, description,
-            price, status, start_date, end_date)
-        VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
-        RETURNING booking_id
-        """
-        booking_id = await self.db.fetchrow(
-            query,
-            booking_data.client_id,
-            booking_data.technician_id,
-            booking_data.service_type,
-            booking_data.description,
-            booking_data.price,
-            booking_data.status,
-            booking_data.start_date,
-            booking_data.end_date
-        )
-        return await self.get_booking_by_id(str(booking_id))
+        """Insert a booking; overlapping an active booking of the technician raises BookingConflictException."""
+        try:
+            record = await self.db.fetchrow_named(
+                "booking_create",
+                uuid.UUID(booking_data.client_id),
+                uuid.UUID(booking_data.technician_id),
+                booking_data.service_type,
+                booking_data.description,
+                booking_data.price,
+                booking_data.status.value,
+                booking_data.start_date,
+                booking_data.end_date
+            )
+        except (ExclusionViolationError, CheckViolationError) as e:
+            _raise_for_period_violation(e)
+        return BookingRepository.record_to_booking(record)
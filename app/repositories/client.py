@@ -1,14 +1,99 @@
 import uuid
-from typing import Optional, List
-from asyncpg import Record
+from typing import Callable, Dict, Final, Optional, List, Set, Tuple
+from asyncpg import Record, UniqueViolationError
 from datetime import datetime, timezone
 from app.database.database import AsyncDatabase
+from app.database.geography import GeoPoint
 from app.schemas.client import ClientCreate, ClientInDB, ClientUpdate
 from app.utils.security import SecurityUtils
 from app.utils.exceptions import DuplicateEntryException, NotFoundException
+from app.utils.pagination import T, Page, keyset_statements, fetch_page, build_page
+
+CLIENT_COLUMNS: Final[str] = """
+    client_id,
+    name,
+    surname,
+    email,
+    phone_number,
+    password_hash,
+    location_name,
+    location,
+    created_at
+"""
+
+STATEMENTS: Final[Dict[str, str]] = {
+    **keyset_statements("client", "client", CLIENT_COLUMNS, "client_id"),
+    "client_get_by_id": f"SELECT {CLIENT_COLUMNS} FROM client WHERE client_id = $1",
+    "client_get_by_email": f"SELECT {CLIENT_COLUMNS} FROM client WHERE email = $1",
+    "client_create": f"""
+        INSERT INTO client (
+            name, surname, email, phone_number,
+            password_hash, location_name, location
+        )
+        VALUES ($1, $2, $3, $4, $5, $6, $7)
+        ON CONFLICT DO NOTHING
+        RETURNING {CLIENT_COLUMNS}
+    """,
+    # NULL parameters leave the column unchanged; see technician_update.
+    "client_update": f"""
+        UPDATE client SET
+            name = COALESCE($2, name),
+            surname = COALESCE($3, surname),
+            email = COALESCE($4, email),
+            phone_number = COALESCE($5, phone_number),
+            password_hash = COALESCE($6, password_hash),
+            location_name = COALESCE($7, location_name),
+            location = CASE
+                WHEN $8::float8 IS NULL AND $9::float8 IS NULL THEN location
+                ELSE ST_SetSRID(ST_MakePoint(
+                    COALESCE($9::float8, ST_X(location::geometry)),
+                    COALESCE($8::float8, ST_Y(location::geometry))
+                ), 4326)::geography
+            END
+        WHERE client_id = $1
+        RETURNING {CLIENT_COLUMNS}
+    """,
+    "client_delete": "DELETE FROM client WHERE client_id = $1",
+    "client_existing_contacts": """
+        SELECT email, phone_number FROM client
+        WHERE email = ANY($1::text[]) OR phone_number = ANY($2::text[])
+    """,
+}
+
+CLIENT_IMPORT_COLUMNS: Final[Tuple[str, ...]] = (
+    "name", "surname", "email", "phone_number", "password_hash", "location_name",
+    "location"
+)
+
+CLIENT_IMPORT_STAGING: Final[str] = """
+    CREATE TEMP TABLE client_import (
+        name TEXT,
+        surname TEXT,
+        email TEXT,
+        phone_number TEXT,
+        password_hash TEXT,
+        location_name TEXT,
+        location GEOGRAPHY(POINT, 4326)
+    ) ON COMMIT DROP
+"""
+
+CLIENT_IMPORT_MERGE: Final[str] = f"""
+    INSERT INTO client (
+        name, surname, email, phone_number,
+        password_hash, location_name, location
+    )
+    SELECT
+        name, surname, email, phone_number,
+        password_hash, location_name, location
+    FROM client_import
+    ON CONFLICT DO NOTHING
+    RETURNING {CLIENT_COLUMNS}
+"""
 
 class ClientRepository:
 
+    STATEMENTS: Final[Dict[str, str]] = STATEMENTS
+
     def __init__(self, db: AsyncDatabase) -> None:
         self.db = db
     
@@ -20,154 +105,108 @@ class ClientRepository:
             email=record["email"],
             phone_number=record["phone_number"],
             location_name=record["location_name"],
-            latitude=record["longitude"],
-            longitude=record["longitude"],
+            latitude=record["location"].lat,
+            longitude=record["location"].lon,
             client_id=str(record["client_id"]),
             password_hash=record["password_hash"],
             created_at=record["created_at"]
         )
 
-    async def get_all(self) -> List[ClientInDB]:
+    async def get_all(
+        self,
+        limit: int,
+        after: Optional[str] = None,
+        mapper: Optional[Callable[[Record], T]] = None
+    ) -> Page[T]:
+        """One page, newest first; rows become ClientInDB unless another mapper is given."""
+        records = await fetch_page(self.db, "client", limit, after)
+        return build_page(records, limit, mapper or self._record_to_client, "client_id")
+
+    async def count_estimate(self) -> Optional[int]:
         """"""
-        records = await self.db.fetch(
-            """
-            SELECT 
-                client_id,
-                name,
-                surname,
-                email,
-                phone_number,
-                password_hash,
-                location_name,
-                ST_X(location::geometry) AS longitude,
-                ST_Y(location::geometry) AS latitude,
-                created_at
-            FROM client 
-            """
-        )
-        return [self._record_to_client(r) for r in records]
+        return await self.db.estimate_row_count("client")
 
     async def get_by_id(self, client_id: str) -> Optional[ClientInDB]:
         """"""
-        record = await self.db.fetchrow(
-            """
-            SELECT 
-                client_id,
-                name,
-                surname,
-                email,
-                phone_number,
-                password_hash,
-                location_name,
-                ST_X(location::geometry) AS longitude,
-                ST_Y(location::geometry) AS latitude,
-                created_at
-            FROM client 
-            WHERE client_id = $1
-            """,
-            uuid.UUID(client_id)
-            )
+        record = await self.db.fetchrow_named("client_get_by_id", uuid.UUID(client_id))
         return self._record_to_client(record) if record else None
     
     async def get_by_email(self, email: str) -> Optional[ClientInDB]:
         """"""
-        record = await self.db.fetchrow(
-            """
-            SELECT 
-                client_id,
-                name,
-                surname,
-                email,
-                phone_number,
-                password_hash,
-                location_name,
-                ST_X(location::geometry) AS longitude,
-                ST_Y(location::geometry) AS latitude,
-                created_at
-            FROM client 
-            WHERE email = $1
-            """,
-            email
-            )
+        record = await self.db.fetchrow_named("client_get_by_email", email)
         return self._record_to_client(record) if record is not None else None
     
     async def create(self, client_data: ClientCreate) -> ClientInDB:
         """"""
-        if await self.get_by_email(client_data.email):
-            raise DuplicateEntryException()
-        
-        hashed_password: str = SecurityUtils.hash_password(client_data.password)
-        point: str = f"POINT({client_data.longitude} {client_data.latitude})"
-        query: str = """
-        INSERT INTO client (
-            name, surname, email, phone_number,
-            password_hash, location_name, location
-        )
-        VALUES ($1, $2, $3, $4, $5, $6, ST_GeomFromText($7))
-        """
-        await self.db.execute(
-            query,
+        hashed_password: str = await SecurityUtils.hash_password_async(client_data.password)
+        record = await self.db.fetchrow_named(
+            "client_create",
             client_data.name,
             client_data.surname,
             client_data.email,
             client_data.phone_number,
             hashed_password,
             client_data.location_name,
-            point,
+            GeoPoint(client_data.longitude, client_data.latitude),
         )
-        return await self.get_by_email(client_data.email)
+        if record is None:
+            raise DuplicateEntryException()
+        return self._record_to_client(record)
     
+    async def existing_contacts(
+        self,
+        emails: List[str],
+        phone_numbers: List[str]
+    ) -> Tuple[Set[str], Set[str]]:
+        """Which of the given emails and phone numbers are already registered."""
+        records = await self.db.fetch_named("client_existing_contacts", emails, phone_numbers)
+        return {r["email"] for r in records}, {r["phone_number"] for r in records}
+
+    async def bulk_create(self, rows: List[Tuple[ClientCreate, str]]) -> List[ClientInDB]:
+        """Insert (client, password hash) pairs with one COPY and merge; conflicting rows are skipped."""
+        records = await self.db.copy_and_fetch(
+            CLIENT_IMPORT_STAGING,
+            "client_import",
+            CLIENT_IMPORT_COLUMNS,
+            (
+                (
+                    c.name, c.surname, c.email, c.phone_number, password_hash,
+                    c.location_name, GeoPoint(c.longitude, c.latitude)
+                )
+                for c, password_hash in rows
+            ),
+            CLIENT_IMPORT_MERGE
+        )
+        return [self._record_to_client(r) for r in records]
+
     async def update(
         self,
         client_id: str,
         update_data: ClientUpdate, 
     ) -> ClientInDB:
         """"""
-        updates: list = []
-        params: list = []
-        param_count: int = 1
-
-        fields = {
-            "name": update_data.name,
-            "surname": update_data.surname,
-            "email": update_data.email,
-            "phone_number": update_data.phone_number,
-            "location_name": update_data.location_name,
-        }
-
+        password_hash: Optional[str] = None
         if update_data.password is not None:
-            fields["password_hash"] = SecurityUtils.hash_password(update_data.password)
-        
-        if update_data.latitude is not None or update_data.longitude is not None:
-            if None in (update_data.latitude, update_data.longitude):
-                current = await self.get_by_id(client_id)
-                if not current:
-                    raise NotFoundException("Client not found")
-                lat = update_data.latitude if update_data.latitude is not None else current.latitude
-                lon = update_data.longitude if update_data.longitude is not None else current.longitude
-            else:
-                lat = update_data.latitude
-                lon = update_data.longitude
-        
-        updates.append(f"location = ST_GeogFromText('POINT({lon} {lat})')")
-
-        for field, value in fields.items():
-            if value is not None:
-                updates.append(f"{field} = ${param_count}")
-                params.append(value)
-                param_count += 1
-        
-        if not updates:
-            return await self.get_by_id(client_id)
-        
-        query: str = f"""
-        UPDATE client SET {', '.join(updates)}
-        WHERE client_id = ${param_count}
-        """
-        params.append(uuid.UUID(client_id))
+            password_hash = await SecurityUtils.hash_password_async(update_data.password)
 
-        await self.db.execute(query, *params)
-        return await self.get_by_id(client_id)
+        try:
+            record = await self.db.fetchrow_named(
+                "client_update",
+                uuid.UUID(client_id),
+                update_data.name,
+                update_data.surname,
+                update_data.email,
+                update_data.phone_number,
+                password_hash,
+                update_data.location_name,
+                update_data.latitude,
+                update_data.longitude
+            )
+        except UniqueViolationError:
+            raise DuplicateEntryException()
+        if record is None:
+            raise NotFoundException("Client not found")
+        return self._record_to_client(record)
     
     async def update_last_login(self, client_id: str) -> None:
         await self.db.execute(
@@ -178,10 +217,7 @@ class ClientRepository:
 
     async def delete(self, client_id: str) -> None:
         """"""
-        await self.db.execute(
-            "DELETE FROM client WHERE client_id = $1",
-            uuid.UUID(client_id)
-            )
+        await self.db.execute_named("client_delete", uuid.UUID(client_id))
         
     async def add_favorite_technicians(self, client_id: str, technician_id: str) -> bool:
         """"""
@@ -1,5 +1,5 @@
 import uuid
-from typing import Optional, List
+from typing import Dict, Final, Optional, List
 from asyncpg import Record
 from app.database.database import AsyncDatabase
 from app.schemas.favorite_technician import (
@@ -8,10 +8,31 @@ from app.schemas.favorite_technician import (
     FavoriteTechnicianResponse
 )
 from app.utils.exceptions import NotFoundException, DuplicateEntryException
+from app.utils.pagination import Page, keyset_statements, fetch_page, build_page
+
+FAVORITE_TECHNICIAN_COLUMNS: Final[str] = "id, client_id, technician_id, created_at"
+
+STATEMENTS: Final[Dict[str, str]] = {
+    **keyset_statements("favorite_technician", "favorite_technician", FAVORITE_TECHNICIAN_COLUMNS, "id"),
+    "favorite_technician_get_by_client_id": f"""
+        SELECT {FAVORITE_TECHNICIAN_COLUMNS} FROM favorite_technician WHERE client_id = $1
+    """,
+    "favorite_technician_create": f"""
+        INSERT INTO favorite_technician (client_id, technician_id)
+        VALUES ($1, $2)
+        ON CONFLICT (client_id, technician_id) DO NOTHING
+        RETURNING {FAVORITE_TECHNICIAN_COLUMNS}
+    """,
+    "favorite_technician_delete": """
+        DELETE FROM favorite_technician WHERE client_id = $1 AND technician_id = $2
+    """,
+}
 
 
 class FavoriteTechnicianRepository:
 
+    STATEMENTS: Final[Dict[str, str]] = STATEMENTS
+
     def __init__(self, db: AsyncDatabase) -> None:
         self.db = db
 
@@ -25,36 +46,38 @@ class FavoriteTechnicianRepository:
             created_at=record["created_at"]
         )
     
-    async def get_all_favorite_technicians(self) -> List[FavoriteTechnicianInDB]:
+    async def get_all_favorite_technicians(
+        self,
+        limit: int,
+        after: Optional[str] = None
+    ) -> Page[FavoriteTechnicianInDB]:
         """"""
-        records = await self.db.fetch("SELECT * FROM favorite_technician")
-        return [FavoriteTechnicianRepository.record_to_favorite_technician(ft) for ft in records]
+        records = await fetch_page(self.db, "favorite_technician", limit, after)
+        return build_page(records, limit, FavoriteTechnicianRepository.record_to_favorite_technician, "id")
     
+    async def count_estimate(self) -> Optional[int]:
+        """"""
+        return await self.db.estimate_row_count("favorite_technician")
+
     async def get_favorite_technicians_by_client_id(self, client_id: str) -> List[FavoriteTechnicianInDB]:
         """"""
-        records = await self.db.fetch(
-            "SELECT * FROM favorite_technician WHERE client_id = $1",
-            uuid.UUID(client_id)
-            )
+        records = await self.db.fetch_named("favorite_technician_get_by_client_id", uuid.UUID(client_id))
         return [FavoriteTechnicianRepository.record_to_favorite_technician(ft) for ft in records]
     
     async def delete(self, client_id: str, technician_id: str) -> None:
         """"""
-        await self.db.execute(
-            "DELETE FROM favorite_technician WHERE client_id = $1 AND technician_id = $2",
+        await self.db.execute_named(
+            "favorite_technician_delete",
             uuid.UUID(client_id), uuid.UUID(technician_id)
             )
     
     async def create(self, ft_data: FavoriteTechnicianCreate) -> FavoriteTechnicianInDB:
-        try:
-            await self.db.execute(
-                """
-                INSERT INTO favorite_technician (client_id, technician_id),
-                VALUES ($1, $2)
-                """,
-                ft_data.client_id,
-                ft_data.technician_id
-                )
-            return self.get_favorite_technicians_by_client_id(ft_data.client_id)
-        except DuplicateEntryException:
+        """"""
+        record = await self.db.fetchrow_named(
+            "favorite_technician_create",
+            uuid.UUID(ft_data.client_id),
+            uuid.UUID(ft_data.technician_id)
+            )
+        if record is None:
             raise DuplicateEntryException("Favorite technician already exists.")
+        return FavoriteTechnicianRepository.record_to_favorite_technician(record)
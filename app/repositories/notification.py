@@ -1,12 +1,32 @@
 import uuid
-from typing import List, Literal
+from typing import Dict, Final, List, Literal
 from asyncpg import Record
 from app.database.database import AsyncDatabase
 from app.schemas.notification import NotificationInDB, NotificationCreate
 
+NOTIFICATION_COLUMNS: Final[str] = "notification_id, client_id, technician_id, message, is_read, created_at"
+
+STATEMENTS: Final[Dict[str, str]] = {
+    "notification_create": f"""
+        INSERT INTO notification (client_id, technician_id, message)
+        VALUES ($1, $2, $3)
+        RETURNING {NOTIFICATION_COLUMNS}
+    """,
+    "notification_get_by_client_id": f"SELECT {NOTIFICATION_COLUMNS} FROM notification WHERE client_id = $1",
+    "notification_get_by_technician_id": f"SELECT {NOTIFICATION_COLUMNS} FROM notification WHERE technician_id = $1",
+    "notification_mark_read": """
+        UPDATE notification SET is_read = TRUE
+        WHERE notification_id = $1
+        RETURNING notification_id
+    """,
+    "notification_delete": "DELETE FROM notification WHERE notification_id = $1",
+}
+
 
 class NotificationRepository:
 
+    STATEMENTS: Final[Dict[str, str]] = STATEMENTS
+
     def __init__(self, db: AsyncDatabase) -> None:
         self.db = db
     
@@ -24,15 +44,10 @@ class NotificationRepository:
     
     async def create(self, notification_data: NotificationCreate) -> NotificationInDB:
         """"""
-        query: str = """
-        INSERT INTO notification (client_id, technician_id, message)
-        VALUES ($1, $2, $3)
-        RETURNING notification_id, client_id, technician_id, message, is_read, created_at
-        """
-        record: Record = await self.db.fetchrow(
-            query,
-            notification_data.client_id,
-            notification_data.technician_id,
+        record: Record = await self.db.fetchrow_named(
+            "notification_create",
+            uuid.UUID(notification_data.client_id) if notification_data.client_id else None,
+            uuid.UUID(notification_data.technician_id) if notification_data.technician_id else None,
             notification_data.message
             )
         return NotificationRepository.record_to_notification(record) if record else None
@@ -43,22 +58,14 @@ class NotificationRepository:
         name: Literal["client", "technician"]
         ) -> List[NotificationInDB]:
         """"""
-        records = await self.db.fetch(f"SELECT * FROM notification WHERE {name.lower()} = $1", uuid.UUID(user_id))
+        records = await self.db.fetch_named(f"notification_get_by_{name.lower()}_id", uuid.UUID(user_id))
         return [NotificationRepository.record_to_notification(r) for r in records]
     
     async def update_read_status(self, notification_id: str) -> bool:
         """"""
-        query: str = """
-        UPDATE notifiation SET is_read = TRUE
-        WHERE notification_id = $1
-        RETURNING notification_id
-        """
-        nid = await self.db.fetchrow(query, uuid.UUID(notification_id))
+        nid = await self.db.fetchrow_named("notification_mark_read", uuid.UUID(notification_id))
         return True if nid else False
     
     async def delete(self, notification_id: str) -> None:
         """"""
-        query: str = """
-        DELETE FROM notification WHERE notification_id = $1
-        """
-        await self.db.execute(query, uuid.UUID(notification_id))
+        await self.db.execute_named("notification_delete", uuid.UUID(notification_id))
@@ -1,12 +1,62 @@
 import uuid
-from typing import Any, Optional, List
+from contextlib import aclosing
+from typing import AsyncIterator, Callable, Any, Dict, Final, Optional, List
 from app.schemas.payment import PaymentCreate, PaymentInDB, PaymentUpdate, PaymentStatus, PaymentMethod
 from app.database.database import AsyncDatabase
+from app.utils.exceptions import NotFoundException
+from app.utils.mapping import row_type
+from app.utils.pagination import T, Page, keyset_statements, fetch_page, build_page
 from asyncpg import Record
 
+PAYMENT_COLUMNS: Final[str] = """
+    payment_id,
+    booking_id,
+    client_id,
+    technician_id,
+    amount,
+    payment_method,
+    payment_status,
+    transaction_date,
+    created_at
+"""
+
+# Compact tuple form of PAYMENT_COLUMNS for bulk internal processing.
+PaymentRow = row_type("PaymentRow", PAYMENT_COLUMNS)
+
+STATEMENTS: Final[Dict[str, str]] = {
+    **keyset_statements("payment", "payment", PAYMENT_COLUMNS, "payment_id"),
+    "payment_export": f"SELECT {PAYMENT_COLUMNS} FROM payment ORDER BY created_at, payment_id",
+    "payment_get_by_id": f"SELECT {PAYMENT_COLUMNS} FROM payment WHERE payment_id = $1",
+    "payment_get_by_technician_id": f"SELECT {PAYMENT_COLUMNS} FROM payment WHERE technician_id = $1",
+    "payment_get_by_client_id": f"SELECT {PAYMENT_COLUMNS} FROM payment WHERE client_id = $1",
+    "payment_get_by_booking_id": f"SELECT {PAYMENT_COLUMNS} FROM payment WHERE booking_id = $1",
+    "payment_get_by_payment_status": f"SELECT {PAYMENT_COLUMNS} FROM payment WHERE payment_status = $1",
+    "payment_get_by_payment_method": f"SELECT {PAYMENT_COLUMNS} FROM payment WHERE payment_method = $1",
+    "payment_create": f"""
+        INSERT INTO payment (
+            booking_id, technician_id, client_id, amount, payment_method,
+            payment_status
+        )
+        VALUES ($1, $2, $3, $4, $5, $6)
+        RETURNING {PAYMENT_COLUMNS}
+    """,
+    # NULL parameters leave the column unchanged.
+    "payment_update": f"""
+        UPDATE payment SET
+            amount = COALESCE($2, amount),
+            payment_method = COALESCE($3, payment_method),
+            payment_status = COALESCE($4, payment_status)
+        WHERE payment_id = $1
+        RETURNING {PAYMENT_COLUMNS}
+    """,
+    "payment_delete": "DELETE FROM payment WHERE payment_id = $1",
+}
+
 
 class PaymentRepository:
 
+    STATEMENTS: Final[Dict[str, str]] = STATEMENTS
+
     def __init__(self, db: AsyncDatabase) -> None:
         self.db = db
 
@@ -24,86 +74,92 @@ class PaymentRepository:
             transaction_date=record["transaction_date"]
         )
     
-    async def get_all_payments(self) -> List[PaymentInDB]:
-        """"""
-        records = await self.db.fetch("SELECT * FROM payment")
-        return [PaymentRepository.record_to_payment(p) for p in records]
+    def stream_all(self, chunk_size: int) -> AsyncIterator[List[Record]]:
+        """Every payment row, oldest first, in chunks read from a server-side cursor."""
+        return self.db.stream_named("payment_export", chunk_size=chunk_size)
+
+    async def get_all_rows(self) -> List[PaymentRow]:
+        """Every payment as a PaymentRow tuple, oldest first."""
+        records = await self.db.fetch_named("payment_export")
+        return [PaymentRow.from_record(r) for r in records]
+
+    async def stream_rows(self, chunk_size: int) -> AsyncIterator[List[PaymentRow]]:
+        """stream_all, with each chunk as PaymentRow tuples."""
+        async with aclosing(self.stream_all(chunk_size)) as chunks:
+            async for records in chunks:
+                yield [PaymentRow.from_record(r) for r in records]
+
+    async def get_all_payments(
+        self,
+        limit: int,
+        after: Optional[str] = None,
+        mapper: Optional[Callable[[Record], T]] = None
+    ) -> Page[T]:
+        """One page, newest first; rows become PaymentInDB unless another mapper is given."""
+        records = await fetch_page(self.db, "payment", limit, after)
+        return build_page(records, limit, mapper or PaymentRepository.record_to_payment, "payment_id")
     
+    async def count_estimate(self) -> Optional[int]:
+        """"""
+        return await self.db.estimate_row_count("payment")
+
     async def get_payment_by_id(self, payment_id: str) -> Optional[PaymentInDB]:
         """"""
-        record = await self.db.fetchrow(
-            "SELECT * FROM payment WHERE payment_id = $1", uuid.UUID(payment_id)
-            )
+        record = await self.db.fetchrow_named("payment_get_by_id", uuid.UUID(payment_id))
         return PaymentRepository.record_to_payment(record) if record is not None else None
     
     async def get_all_payments_by_technician_id(self, technician_id: str) -> List[PaymentInDB]:
         """"""
-        return await self._get_all_by("technician_id", uuid.UUID(technician_id))
+        return await self._get_all_by("payment_get_by_technician_id", uuid.UUID(technician_id))
     
     async def get_all_payments_by_client_id(self, client_id: str) -> List[PaymentInDB]:
         """"""
-        return await self._get_all_by("client_id", uuid.UUID(client_id))
+        return await self._get_all_by("payment_get_by_client_id", uuid.UUID(client_id))
     
     async def get_all_payments_by_booking_id(self, booking_id: str) -> List[PaymentInDB]:
         """"""
-        return await self._get_all_by("booking_id", uuid.UUID(booking_id))
+        return await self._get_all_by("payment_get_by_booking_id", uuid.UUID(booking_id))
     
     async def get_all_payments_by_payment_status(self, status: PaymentStatus) -> List[PaymentInDB]:
         """"""
-        return await self._get_all_by("payment_status", status)
+        return await self._get_all_by("payment_get_by_payment_status", PaymentStatus(status).value)
     
     async def get_all_payments_by_payment_method(self, method: PaymentMethod) -> List[PaymentInDB]:
         """"""
-        return await self._get_all_by("payment_method", method)
+        return await self._get_all_by("payment_get_by_payment_method", PaymentMethod(method).value)
     
-    async def _get_all_by(self, column_name: str, value: Any) -> List[PaymentInDB]:
+    async def _get_all_by(self, statement: str, value: Any) -> List[PaymentInDB]:
         """"""
-        records = await self.db.fetch(f"SELECT * FROM payment WHERE {column_name} = $1", value)
+        records = await self.db.fetch_named(statement, value)
         return [PaymentRepository.record_to_payment(p) for p in records]
     
     async def create(self, payment_data: PaymentCreate) -> PaymentInDB:
         """"""
-        id = await self.db.fetchrow(
-            """
-            INSERT INTO payment (
-                booking_id, technician_id, client_id, amount, payment_method,
-                payment_status
-            )
-            VALUES ($1, $2, $3, $4, $5, $6)
-            RETURNING payment_id
-            """,
-            payment_data.booking_id,
-            payment_data.technician_id,
-            payment_data.client_id,
+        record = await self.db.fetchrow_named(
+            "payment_create",
+            uuid.UUID(payment_data.booking_id),
+            uuid.UUID(payment_data.technician_id),
+            uuid.UUID(payment_data.client_id),
             payment_data.amount,
-            payment_data.payment_method,
-            payment_data.payment_status,
+            payment_data.payment_method.value,
+            payment_data.payment_status.value,
         )
-        return await self.get_payment_by_id(id)
+        return PaymentRepository.record_to_payment(record)
     
     async def update(self, payment_id: str, update_data: PaymentUpdate) -> PaymentInDB:
         """"""
-        fields: dict = {
-            "amount": update_data.amount,
-            "payment_method": update_data.payment_method,
-            "payment_status": update_data.payment_status
-        }
-
-        fields = {k: v for k, v in fields.items() if v is not None}
-
-        if len(fields) == 0: return await self.get_payment_by_id(payment_id)
-
-        updates: list = [f"{k} = ${i}" for i, k in enumerate(fields.keys(), start=2)]
-        values: list = [uuid.UUID(payment_id), *tuple(fields.values())]
-
-        query: str = f"""
-        UPDATE payment SET {', '.join(updates)}
-        WHERE payment_id = $1
-        """
-
-        await self.db.execute(query, *values)
-        return self.get_payment_by_id(payment_id)
+        record = await self.db.fetchrow_named(
+            "payment_update",
+            uuid.UUID(payment_id),
+            update_data.amount,
+            update_data.payment_method.value if update_data.payment_method is not None else None,
+            update_data.payment_status.value if update_data.payment_status is not None else None
+        )
+        if record is None:
+            raise NotFoundException("Payment not found")
+        return PaymentRepository.record_to_payment(record)
     
     async def delete(self, payment_id: str) -> bool:
         """"""
-        await self.db.execute("DELETE FROM payment WHERE payment_id = $1", uuid.UUID(payment_id))
+        result = await self.db.execute_named("payment_delete", uuid.UUID(payment_id))
+        return result != "DELETE 0"
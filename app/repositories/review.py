@@ -1,12 +1,53 @@
 import uuid
-from typing import List, Optional, Any
+from typing import AsyncIterator, Callable, Dict, Final, List, Optional, Any
 from app.database.database import AsyncDatabase
 from app.schemas.review import ReviewCreate, ReviewInDB, ReviewResponse, ReviewUpdate
+from app.utils.exceptions import DuplicateEntryException, NotFoundException
+from app.utils.pagination import T, Page, keyset_statements, fetch_page, build_page
 from asyncpg import Record
 
+REVIEW_COLUMNS: Final[str] = """
+    review_id,
+    booking_id,
+    client_id,
+    technician_id,
+    rating,
+    comment,
+    created_at
+"""
+
+STATEMENTS: Final[Dict[str, str]] = {
+    **keyset_statements("review", "review", REVIEW_COLUMNS, "review_id"),
+    "review_export": f"SELECT {REVIEW_COLUMNS} FROM review ORDER BY created_at, review_id",
+    "review_get_by_id": f"SELECT {REVIEW_COLUMNS} FROM review WHERE review_id = $1",
+    "review_get_by_client_id": f"SELECT {REVIEW_COLUMNS} FROM review WHERE client_id = $1",
+    "review_get_by_technician_id": f"SELECT {REVIEW_COLUMNS} FROM review WHERE technician_id = $1",
+    "review_get_by_booking_id": f"SELECT {REVIEW_COLUMNS} FROM review WHERE booking_id = $1",
+    "review_create": f"""
+        INSERT INTO review (
+            booking_id, client_id, technician_id,
+            rating, comment
+        )
+        VALUES ($1, $2, $3, $4, $5)
+        ON CONFLICT (booking_id, client_id) DO NOTHING
+        RETURNING {REVIEW_COLUMNS}
+    """,
+    # NULL parameters leave the column unchanged.
+    "review_update": f"""
+        UPDATE review SET
+            rating = COALESCE($2, rating),
+            comment = COALESCE($3, comment)
+        WHERE review_id = $1
+        RETURNING {REVIEW_COLUMNS}
+    """,
+    "review_delete": "DELETE FROM review WHERE review_id = $1",
+}
+
 
 class ReviewRepository:
 
+    STATEMENTS: Final[Dict[str, str]] = STATEMENTS
+
     def __init__(self, db: AsyncDatabase) -> None:
         self.db = db
 
@@ -23,85 +64,73 @@ class ReviewRepository:
             created_at=record["created_at"]
         )
 
-    async def get_all_reviews(self) -> List[ReviewInDB]:
+    def stream_all(self, chunk_size: int) -> AsyncIterator[List[Record]]:
+        """Every review row, oldest first, in chunks read from a server-side cursor."""
+        return self.db.stream_named("review_export", chunk_size=chunk_size)
+
+    async def get_all_reviews(
+        self,
+        limit: int,
+        after: Optional[str] = None,
+        mapper: Optional[Callable[[Record], T]] = None
+    ) -> Page[T]:
+        """One page, newest first; rows become ReviewInDB unless another mapper is given."""
+        records = await fetch_page(self.db, "review", limit, after)
+        return build_page(records, limit, mapper or ReviewRepository.record_to_review, "review_id")
+
+    async def count_estimate(self) -> Optional[int]:
         """"""
-        records = await self.db.fetch("SELECT * FROM review")
-        return [ReviewRepository.record_to_review(r) for r in records]
+        return await self.db.estimate_row_count("review")
 
     async def get_review_by_id(self, review_id: str) -> Optional[ReviewInDB]:
         """"""
-        record = await self.db.fetchrow(
-            "SELECT * FROM review WHERE review_id = $1",
-            uuid.UUID(review_id)
-            )
+        record = await self.db.fetchrow_named("review_get_by_id", uuid.UUID(review_id))
         return ReviewRepository.record_to_review(record) if record is not None else None
     
     async def get_all_reviews_by_client_id(self, client_id: str) -> List[ReviewInDB]:
         """"""
-        return await self._get_by("client_id", uuid.UUID(client_id))
+        return await self._get_by("review_get_by_client_id", uuid.UUID(client_id))
     
     async def get_all_reviews_by_technician_id(self, technician_id: str) -> List[ReviewInDB]:
         """"""
-        return await self._get_by("technician_id", uuid.UUID(technician_id))
+        return await self._get_by("review_get_by_technician_id", uuid.UUID(technician_id))
     
     async def get_all_reviews_by_booking_id(self, booking_id: str) -> List[ReviewInDB]:
         """"""
-        return await self._get_by("booking_id", uuid.UUID(booking_id))
+        return await self._get_by("review_get_by_booking_id", uuid.UUID(booking_id))
     
-    async def _get_by(self, column_name: str, value: Any) -> List[ReviewInDB]:
+    async def _get_by(self, statement: str, value: Any) -> List[ReviewInDB]:
         """"""
-        records = await self.db.fetch(
-            f"SELECT * FROM review WHERE {column_name} = $1",
-            value
-            )
+        records = await self.db.fetch_named(statement, value)
         return [ReviewRepository.record_to_review(r) for r in records]
     
     async def create_review(self, review_data: ReviewCreate) -> ReviewInDB:
         """"""
-        id = await self.db.fetchrow(
-            """
-            INSERT INTO review (
-                booking_id, client_id, technician_id,
-                rating, comment
-            )
-            VALUES ($1, $2, $3, $4, $5)
-            RETIRNING review_id
-            """,
-            review_data.booking_id,
-            review_data.client_id,
-            review_data.technician_id,
+        record = await self.db.fetchrow_named(
+            "review_create",
+            uuid.UUID(review_data.booking_id),
+            uuid.UUID(review_data.client_id),
+            uuid.UUID(review_data.technician_id),
             review_data.rating,
             review_data.comment,
         )
-        return await self.get_review_by_id(id)
+        if record is None:
+            raise DuplicateEntryException("This booking has already been reviewed by the client.")
+        return ReviewRepository.record_to_review(record)
     
     async def delete_review(self, review_id: str) -> bool:
         """"""
-        result = await self.db.execute(
-            "DELETE FROM review WHERE review_id = $1",
-            uuid.UUID(review_id)
-            )
-        return result == "DELETE 0"
+        result = await self.db.execute_named("review_delete", uuid.UUID(review_id))
+        return result != "DELETE 0"
     
     async def update_review(self, review_id: str, update_data: ReviewUpdate) -> ReviewInDB:
         """"""
-        fields: dict = {
-            "rating": update_data.rating,
-            "comment": update_data.comment
-        }
-
-        fields = {k: v for k, v in fields.items() if v is not None}
-
-        if len(fields) == 0: return self.get_review_by_id(review_id)
-
-        updates: list = [f"{k} = ${i}" for i, k in enumerate(fields.keys(), start=2)]
-        values: list = [uuid.UUID(review_id), *tuple(fields.values())]
-
-        query: str = f"""
-        UPDATE review SET {', '.join(updates)}
-        WHERE review_id = $1
-        """
-
-        await self.db.execute(query, *values)
-
-        return await self.get_review_by_id(review_id)
+        record = await self.db.fetchrow_named(
+            "review_update",
+            uuid.UUID(review_id),
+            update_data.rating,
+            update_data.comment
+        )
+        if record is None:
+            raise NotFoundException("Review not found")
+        return ReviewRepository.record_to_review(record)
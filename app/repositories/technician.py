@@ -1,202 +1,360 @@
 import uuid
-from typing import Optional, List
-from asyncpg import Record
+from typing import Callable, Dict, Final, Optional, List, Set, Tuple
+from asyncpg import Record, UniqueViolationError
 from datetime import datetime, timezone
 from app.database.database import AsyncDatabase
-from app.schemas.technician import TechnicianCreate, TechnicianInDB, TechnicianUpdate
+from app.database.geography import GeoPoint
+from app.schemas.technician import TechnicianCreate, TechnicianInDB, TechnicianSort, TechnicianUpdate
 from app.utils.security import SecurityUtils
 from app.utils.exceptions import DuplicateEntryException, NotFoundException
+from app.utils.mapping import row_type
+from app.utils.pagination import T, Page, keyset_statements, fetch_page, build_page
+
+TECHNICIAN_COLUMNS: Final[str] = """
+    technician_id,
+    name,
+    surname,
+    email,
+    phone_number,
+    password_hash,
+    location_name,
+    location,
+    service_types,
+    is_verified,
+    experience_years,
+    is_available,
+    created_at
+"""
+
+# Rating aggregates maintained by the review trigger in migration 0004; technicians
+# without reviews have no technician_stats row and get the prior's score.
+TECHNICIAN_STATS_COLUMNS: Final[str] = """
+    COALESCE(technician_stats.review_count, 0) AS review_count,
+    (technician_stats.rating_sum / NULLIF(technician_stats.review_count, 0))::float8 AS average_rating,
+    COALESCE(technician_stats.rating_histogram, ARRAY[0, 0, 0, 0, 0]) AS rating_histogram,
+    COALESCE(technician_stats.rating_score, technician_rating_score(0, 0))::float8 AS rating_score
+"""
+
+TECHNICIAN_WITH_STATS: Final[str] = "technician LEFT JOIN technician_stats USING (technician_id)"
+
+# Just what the in-memory spatial index needs.
+TECHNICIAN_LOCATION_COLUMNS: Final[str] = """
+    technician_id,
+    location,
+    service_types,
+    is_available
+"""
+
+TechnicianLocationRow = row_type("TechnicianLocationRow", TECHNICIAN_LOCATION_COLUMNS, technician_id=str)
+
+# $1 = lat, $2 = lon, $3 = radius in metres, $4 = only available, $5 = only verified,
+# $6 = limit, $7 = service type. The service filter lives in its own statement rather
+# than "$7 IS NULL OR ..." so the planner can always use the GIN index on service_types.
+_NEARBY_QUERY: Final[str] = f"""
+SELECT {TECHNICIAN_COLUMNS}, {TECHNICIAN_STATS_COLUMNS},
+    ST_Distance(location, ST_SetSRID(ST_MakePoint($2, $1), 4326)::geography) / 1000.0 AS distance_km
+FROM {TECHNICIAN_WITH_STATS}
+WHERE ST_DWithin(location, ST_SetSRID(ST_MakePoint($2, $1), 4326)::geography, $3)
+    AND (NOT $4::boolean OR is_available)
+    AND (NOT $5::boolean OR is_verified)
+    {{service_filter}}
+ORDER BY {{order_by}}
+LIMIT $6
+"""
+
+_NEARBY_ORDER: Final[Dict[TechnicianSort, str]] = {
+    TechnicianSort.DISTANCE: "location <-> ST_SetSRID(ST_MakePoint($2, $1), 4326)::geography",
+    TechnicianSort.RATING: "rating_score DESC, distance_km",
+}
+
+_NEARBY_SERVICE_FILTER: Final[str] = "AND service_types @> ARRAY[$7::text]"
+
+
+def _nearby_statement(sort: TechnicianSort, by_service: bool) -> str:
+    """"""
+    suffix: str = "" if sort is TechnicianSort.DISTANCE else f"_by_{sort.value}"
+    return f"technician_search_nearby{'_by_service' if by_service else ''}{suffix}"
+
+
+STATEMENTS: Final[Dict[str, str]] = {
+    "technician_get_all": f"SELECT {TECHNICIAN_COLUMNS}, {TECHNICIAN_STATS_COLUMNS} FROM {TECHNICIAN_WITH_STATS}",
+    "technician_get_all_locations": f"SELECT {TECHNICIAN_LOCATION_COLUMNS} FROM technician",
+    **keyset_statements(
+        "technician", TECHNICIAN_WITH_STATS, f"{TECHNICIAN_COLUMNS}, {TECHNICIAN_STATS_COLUMNS}", "technician_id"
+    ),
+    "technician_get_by_id": f"""
+        SELECT {TECHNICIAN_COLUMNS}, {TECHNICIAN_STATS_COLUMNS} FROM {TECHNICIAN_WITH_STATS}
+        WHERE technician_id = $1
+    """,
+    "technician_get_by_email": f"""
+        SELECT {TECHNICIAN_COLUMNS}, {TECHNICIAN_STATS_COLUMNS} FROM {TECHNICIAN_WITH_STATS}
+        WHERE email = $1
+    """,
+    **{
+        _nearby_statement(sort, by_service): _NEARBY_QUERY.format(
+            service_filter=_NEARBY_SERVICE_FILTER if by_service else "",
+            order_by=order_by
+        )
+        for sort, order_by in _NEARBY_ORDER.items()
+        for by_service in (False, True)
+    },
+    "technician_create": f"""
+        INSERT INTO technician (
+            name, surname, email, phone_number,
+            password_hash, location_name, location,
+            service_types, is_verified, experience_years, is_available
+        )
+        VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11)
+        ON CONFLICT DO NOTHING
+        RETURNING {TECHNICIAN_COLUMNS}
+    """,
+    # NULL parameters leave the column unchanged. A location update may carry only one
+    # of latitude/longitude; the other is kept from the stored point.
+    "technician_update": f"""
+        WITH updated AS (
+            UPDATE technician SET
+                name = COALESCE($2, name),
+                surname = COALESCE($3, surname),
+                email = COALESCE($4, email),
+                phone_number = COALESCE($5, phone_number),
+                password_hash = COALESCE($6, password_hash),
+                location_name = COALESCE($7, location_name),
+                location = CASE
+                    WHEN $8::float8 IS NULL AND $9::float8 IS NULL THEN location
+                    ELSE ST_SetSRID(ST_MakePoint(
+                        COALESCE($9::float8, ST_X(location::geometry)),
+                        COALESCE($8::float8, ST_Y(location::geometry))
+                    ), 4326)::geography
+                END,
+                service_types = COALESCE($10, service_types),
+                is_verified = COALESCE($11, is_verified),
+                is_available = COALESCE($12, is_available),
+                experience_years = COALESCE($13, experience_years)
+            WHERE technician_id = $1
+            RETURNING *
+        )
+        SELECT {TECHNICIAN_COLUMNS}, {TECHNICIAN_STATS_COLUMNS}
+        FROM updated LEFT JOIN technician_stats USING (technician_id)
+    """,
+    "technician_delete": "DELETE FROM technician WHERE technician_id = $1",
+    "technician_existing_contacts": """
+        SELECT email, phone_number FROM technician
+        WHERE email = ANY($1::text[]) OR phone_number = ANY($2::text[])
+    """,
+    "technician_rebuild_stats": "SELECT rebuild_technician_stats()",
+    "technician_stats_totals": """
+        SELECT count(*) AS technicians, COALESCE(sum(review_count), 0) AS reviews FROM technician_stats
+    """,
+}
+
+TECHNICIAN_IMPORT_COLUMNS: Final[Tuple[str, ...]] = (
+    "name", "surname", "email", "phone_number", "password_hash", "location_name",
+    "location", "service_types", "is_verified", "is_available", "experience_years"
+)
+
+TECHNICIAN_IMPORT_STAGING: Final[str] = """
+    CREATE TEMP TABLE technician_import (
+        name TEXT,
+        surname TEXT,
+        email TEXT,
+        phone_number TEXT,
+        password_hash TEXT,
+        location_name TEXT,
+        location GEOGRAPHY(POINT, 4326),
+        service_types TEXT[],
+        is_verified BOOLEAN,
+        is_available BOOLEAN,
+        experience_years NUMERIC
+    ) ON COMMIT DROP
+"""
+
+TECHNICIAN_IMPORT_MERGE: Final[str] = f"""
+    INSERT INTO technician (
+        name, surname, email, phone_number,
+        password_hash, location_name, location,
+        service_types, is_verified, experience_years, is_available
+    )
+    SELECT
+        name, surname, email, phone_number,
+        password_hash, location_name, location,
+        service_types, is_verified, experience_years, is_available
+    FROM technician_import
+    ON CONFLICT DO NOTHING
+    RETURNING {TECHNICIAN_COLUMNS}
+"""
 
 
 class TechnicianRepository:
 
+    STATEMENTS: Final[Dict[str, str]] = STATEMENTS
+
     def __init__(self, db: AsyncDatabase) -> None:
         self.db = db
     
     @staticmethod
     def record_to_technician(record: Record) -> TechnicianInDB:
-        """"""
+        """Rows from statements without TECHNICIAN_STATS_COLUMNS, such as inserts, get empty stats."""
         return TechnicianInDB(
             name=record["name"],
             surname=record["surname"],
             email=record["email"],
             phone_number=record["phone_number"],
             location_name=record["location_name"],
-            latitude=record["longitude"],
-            longitude=record["longitude"],
+            latitude=record["location"].lat,
+            longitude=record["location"].lon,
             service_types=record["service_types"],
             is_verified=record["is_verified"],
             technician_id=str(record["technician_id"]),
             password_hash=record["password_hash"],
             created_at=record["created_at"],
             is_available=record["is_available"],
-            experience_years=record["experience_years"]
+            experience_years=record["experience_years"],
+            review_count=record.get("review_count", 0),
+            average_rating=record.get("average_rating"),
+            rating_histogram=record.get("rating_histogram") or [0] * 5,
+            rating_score=record.get("rating_score")
         )
     
     async def get_all(self) -> List[TechnicianInDB]:
         """"""
-        records = await self.db.fetch(
-            """
-            SELECT 
-                technician_id,
-                name,
-                surname,
-                email,
-                phone_number,
-                password_hash,
-                location_name,
-                ST_X(location::geometry) AS longitude,
-                ST_Y(location::geometry) AS latitude,
-                service_types,
-                is_verified,
-                experience_years,
-                is_available,
-                created_at
-            FROM technician 
-            """
-        )
+        records = await self.db.fetch_named("technician_get_all")
         return [TechnicianRepository.record_to_technician(r) for r in records]
 
+    async def get_location_rows(self) -> List[TechnicianLocationRow]:
+        """Id, coordinates, service types and availability of every technician."""
+        records = await self.db.fetch_named("technician_get_all_locations")
+        return [TechnicianLocationRow.from_record(r) for r in records]
+
+    async def get_page(
+        self,
+        limit: int,
+        after: Optional[str] = None,
+        mapper: Optional[Callable[[Record], T]] = None
+    ) -> Page[T]:
+        """One page, newest first; rows become TechnicianInDB unless another mapper is given."""
+        records = await fetch_page(self.db, "technician", limit, after)
+        return build_page(records, limit, mapper or TechnicianRepository.record_to_technician, "technician_id")
+
+    async def count_estimate(self) -> Optional[int]:
+        """"""
+        return await self.db.estimate_row_count("technician")
+
     async def get_by_id(self, technician_id: str) -> Optional[TechnicianInDB]:
         """"""
-        record = await self.db.fetchrow(
-            """
-            SELECT 
-                technician_id,
-                name,
-                surname,
-                email,
-                phone_number,
-                password_hash,
-                location_name,
-                ST_X(location::geometry) AS longitude,
-                ST_Y(location::geometry) AS latitude,
-                service_types,
-                is_verified,
-                experience_years,
-                is_available,
-                created_at
-            FROM technician 
-            WHERE technician_id = $1
-            """,
-            uuid.UUID(technician_id)
-        )
+        record = await self.db.fetchrow_named("technician_get_by_id", uuid.UUID(technician_id))
         return TechnicianRepository.record_to_technician(record) if record is not None else None
     
     async def get_by_email(self, email: str) -> Optional[TechnicianInDB]:
         """"""
-        record = await self.db.fetchrow(
-            """
-            SELECT 
-                technician_id,
-                name,
-                surname,
-                email,
-                phone_number,
-                password_hash,
-                location_name,
-                ST_X(location::geometry) AS longitude,
-                ST_Y(location::geometry) AS latitude,
-                service_types,
-                is_verified,
-                experience_years,
-                is_available,
-                created_at
-            FROM technician 
-            WHERE email = $1
-            """,
-            email
-        )
+        record = await self.db.fetchrow_named("technician_get_by_email", email)
         return TechnicianRepository.record_to_technician(record) if record is not None else None
 
+    async def search_nearby(
+        self,
+        lat: float,
+        lon: float,
+        radius_km: float,
+        service_type: Optional[str] = None,
+        only_available: bool = True,
+        only_verified: bool = False,
+        limit: int = 20,
+        sort: TechnicianSort = TechnicianSort.DISTANCE
+    ) -> List[Tuple[TechnicianInDB, float]]:
+        """Technicians within radius_km of (lat, lon), nearest or best rated first, with their distance in km."""
+        params: list = [lat, lon, radius_km * 1000, only_available, only_verified, limit]
+        if service_type:
+            params.append(service_type)
+
+        records = await self.db.fetch_named(_nearby_statement(sort, bool(service_type)), *params)
+        return [
+            (TechnicianRepository.record_to_technician(r), float(r["distance_km"]))
+            for r in records
+        ]
+
     async def create(self, technician_data: TechnicianCreate) -> TechnicianInDB:
         """"""
-        if await self.get_by_email(technician_data.email):
-            raise DuplicateEntryException()
-        
-        hashed_password: str = SecurityUtils.hash_password(technician_data.password)
-        point: str = f"POINT({technician_data.longitude} {technician_data.latitude})"
-        query: str = """
-        INSERT INTO technician (
-            name, surname, email, phone_number,
-            password_hash, location_name, location,
-            service_types, is_verified, experience_years, is_available
-        )
-        VALUES ($1, $2, $3, $4, $5, $6, ST_GeomFromText($7), $8, $9, $10, $11)
-        """
-        await self.db.execute(
-            query,
+        hashed_password: str = await SecurityUtils.hash_password_async(technician_data.password)
+        record = await self.db.fetchrow_named(
+            "technician_create",
             technician_data.name,
             technician_data.surname,
             technician_data.email,
             technician_data.phone_number,
             hashed_password,
             technician_data.location_name,
-            point,
+            GeoPoint(technician_data.longitude, technician_data.latitude),
             technician_data.service_types,
             technician_data.is_verified,
             technician_data.experience_years,
             technician_data.is_available
         )
-        return await self.get_by_email(technician_data.email)
+        if record is None:
+            raise DuplicateEntryException()
+        return TechnicianRepository.record_to_technician(record)
     
+    async def existing_contacts(
+        self,
+        emails: List[str],
+        phone_numbers: List[str]
+    ) -> Tuple[Set[str], Set[str]]:
+        """Which of the given emails and phone numbers are already registered."""
+        records = await self.db.fetch_named("technician_existing_contacts", emails, phone_numbers)
+        return {r["email"] for r in records}, {r["phone_number"] for r in records}
+
+    async def bulk_create(self, rows: List[Tuple[TechnicianCreate, str]]) -> List[TechnicianInDB]:
+        """Insert (technician, password hash) pairs with one COPY and merge; conflicting rows are skipped."""
+        records = await self.db.copy_and_fetch(
+            TECHNICIAN_IMPORT_STAGING,
+            "technician_import",
+            TECHNICIAN_IMPORT_COLUMNS,
+            (
+                (
+                    t.name, t.surname, t.email, t.phone_number, password_hash, t.location_name,
+                    GeoPoint(t.longitude, t.latitude), t.service_types, t.is_verified, t.is_available,
+                    t.experience_years
+                )
+                for t, password_hash in rows
+            ),
+            TECHNICIAN_IMPORT_MERGE
+        )
+        return [TechnicianRepository.record_to_technician(r) for r in records]
+
     async def delete(self, technician_id: str) -> bool:
         """"""
-        await self.db.execute(
-            "DELETE FROM technician WHERE technician_id = $1",
-            uuid.UUID(technician_id)
-            )
+        result = await self.db.execute_named("technician_delete", uuid.UUID(technician_id))
+        return result != "DELETE 0"
     
     async def update(self, technician_id: str, update_data: TechnicianUpdate) -> TechnicianInDB:
         """"""
-        updates = []
-        params = []
-        param_count = 1
-
-        fields = {
-            "name": update_data.name,
-            "surname": update_data.surname,
-            "email": update_data.email,
-            "phone_number": update_data.phone_number,
-            "location_name": update_data.location_name,
-            "service_types": update_data.service_types,
-            "is_verified": update_data.is_verified,
-        }
-
-        # Handle password update
+        password_hash: Optional[str] = None
         if update_data.password:
-            fields["password_hash"] = SecurityUtils.hash_password(update_data.password)
-
-        # Handle location update
-        if update_data.latitude is not None or update_data.longitude is not None:
-            if None in (update_data.latitude, update_data.longitude):
-                current = await self.get_by_id(technician_id)
-                if not current:
-                    raise NotFoundException("Technician not found")
-                lat = update_data.latitude if update_data.latitude is not None else current.latitude
-                lon = update_data.longitude if update_data.longitude is not None else current.longitude
-            else:
-                lat = update_data.latitude
-                lon = update_data.longitude
-            
-            updates.append(f"location = ST_GeogFromText('POINT({lon} {lat})')")
-
-        # Add regular fields to updates
-        for field, value in fields.items():
-            if value is not None:
-                updates.append(f"{field} = ${param_count}")
-                params.append(value)
-                param_count += 1
-
-        if not updates:
-            return await self.get_by_id(technician_id)
-
-        query: str = f"""
-        UPDATE technician SET {', '.join(updates)}
-        WHERE technician_id = ${param_count}
-        """
-        params.append(uuid.UUID(technician_id))
-
-        await self.db.execute(query, *params)
-        return await self.get_by_id(technician_id)
-    
\ No newline at end of file
+            password_hash = await SecurityUtils.hash_password_async(update_data.password)
+
+        try:
+            record = await self.db.fetchrow_named(
+                "technician_update",
+                uuid.UUID(technician_id),
+                update_data.name,
+                update_data.surname,
+                update_data.email,
+                update_data.phone_number,
+                password_hash,
+                update_data.location_name,
+                update_data.latitude,
+                update_data.longitude,
+                update_data.service_types,
+                update_data.is_verified,
+                update_data.is_available,
+                update_data.experience_years
+            )
+        except UniqueViolationError:
+            raise DuplicateEntryException()
+        if record is None:
+            raise NotFoundException("Technician not found")
+        return TechnicianRepository.record_to_technician(record)
+
+    async def rebuild_stats(self) -> Tuple[int, int]:
+        """Recompute technician_stats from review; returns (technicians, reviews) counted."""
+        await self.db.execute_named("technician_rebuild_stats")
+        totals = await self.db.fetchrow_named("technician_stats_totals")
+        return totals["technicians"], totals["reviews"]
@@ -0,0 +1,15 @@
+from datetime import datetime
+from typing import List
+from pydantic import BaseModel
+
+
+class TimeSlot(BaseModel):
+    """A free [start, end) interval, in UTC"""
+    start: datetime
+    end: datetime
+
+
+class TechnicianAvailability(BaseModel):
+    """Free slots of one technician within the requested window"""
+    technician_id: str
+    slots: List[TimeSlot]
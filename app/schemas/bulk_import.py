@@ -0,0 +1,17 @@
+from typing import List
+from pydantic import BaseModel
+
+
+class ImportRowError(BaseModel):
+    """A row that was not imported, with the reasons"""
+    line: int
+    errors: List[str]
+
+
+class ImportResult(BaseModel):
+    """Outcome of a bulk import"""
+    received: int = 0
+    inserted: int = 0
+    failed: int = 0
+    errors: List[ImportRowError] = []
+    errors_truncated: bool = False
@@ -1,4 +1,5 @@
 from datetime import datetime
+from enum import Enum
 from typing import List, Optional
 from pydantic import BaseModel, Field, EmailStr, field_validator, ConfigDict
 from pydantic_extra_types.coordinate import Latitude, Longitude
@@ -52,7 +53,22 @@ class TechnicianCreate(TechnicianBase):
         }
     )
 
-class TechnicianInDB(TechnicianBase):
+class TechnicianSort(str, Enum):
+    """Orderings for proximity search"""
+    DISTANCE = "distance"
+    RATING = "rating"
+    RELEVANCE = "relevance"
+
+class TechnicianRatingStats(BaseModel):
+    """Review aggregates from technician_stats"""
+    review_count: int = 0
+    average_rating: Optional[float] = None
+    # Reviews per star, index 0 = 1 star
+    rating_histogram: List[int] = Field(default_factory=lambda: [0] * 5)
+    # Bayesian average, comparable between technicians with few and many reviews
+    rating_score: Optional[float] = None
+
+class TechnicianInDB(TechnicianRatingStats, TechnicianBase):
     """Database representation (includes sensitive fields)"""
     technician_id: str
     password_hash: str
@@ -60,13 +76,26 @@ class TechnicianInDB(TechnicianBase):
 
     model_config = ConfigDict(from_attributes=True)
 
-class TechnicianResponse(TechnicianBase):
+class TechnicianResponse(TechnicianRatingStats, TechnicianBase):
     """What's returned to the client (excludes sensitive data)"""
     technician_id: str
     created_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
 
+class TechnicianNearbyResponse(TechnicianResponse):
+    """A technician returned by a proximity search"""
+    distance_km: float
+    # Weighted ranking score in [0, 1]; only set when sorted by relevance
+    relevance: Optional[float] = None
+
+
+class TechnicianDistance(BaseModel):
+    """A technician id and its distance from a query point"""
+    technician_id: str
+    distance_km: float
+
+
 class TechnicianUpdate(BaseModel):
     """Schema for partial updates"""
     name: Optional[str] = Field(None, max_length=50)
@@ -54,8 +54,13 @@ class AdminService:
         admin = await self.repo.get_by_email(email)
         if not admin:
             raise InvalidCredentialsException()
-        if not SecurityUtils.verify_password(password, admin.password_hash):
+        valid, new_hash = await SecurityUtils.verify_and_update_async(password, admin.password_hash)
+        if not valid:
             raise InvalidCredentialsException()
+        if new_hash is not None:
+            SecurityUtils.write_back_rehash(
+                self.repo.replace_password_hash(admin.admin_id, admin.password_hash, new_hash)
+            )
         return AdminService.admin_in_db_to_response(admin)
     
     async def update_admin(
@@ -0,0 +1,86 @@
+import itertools
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Tuple
+
+from app.repositories.booking import BookingRepository
+from app.schemas.availability import TechnicianAvailability, TimeSlot
+from app.utils.exceptions import InvalidTimeWindowException
+
+MAX_AVAILABILITY_TECHNICIANS: int = 100
+
+Interval = Tuple[datetime, datetime]
+
+
+def free_slots(busy: Iterable[Interval], window_start: datetime, window_end: datetime, slot: timedelta) -> List[Interval]:
+    """Slot-long free intervals of [window_start, window_end), on a grid anchored at window_start.
+
+    busy must be sorted by start; it may overlap, touch or spill over the window. One
+    sweep: a cursor starts at the window start, each busy interval emits the grid slots
+    that fit in the gap before it and then pushes the cursor past its own end.
+    """
+    slots: List[Interval] = []
+    cursor: datetime = window_start
+    for busy_start, busy_end in itertools.chain(busy, [(window_end, window_end)]):
+        gap_end = min(busy_start, window_end)
+        if gap_end > cursor:
+            # First grid point at or after the cursor
+            start = window_start - ((window_start - cursor) // slot) * slot
+            while start + slot <= gap_end:
+                slots.append((start, start + slot))
+                start += slot
+        cursor = max(cursor, busy_end)
+        if cursor >= window_end:
+            break
+    return slots
+
+
+def _as_utc(moment: datetime) -> datetime:
+    """Aware UTC datetime; naive input is taken to be UTC already, like the booking columns."""
+    if moment.tzinfo is None:
+        return moment.replace(tzinfo=timezone.utc)
+    return moment.astimezone(timezone.utc)
+
+
+class AvailabilityService:
+
+    def __init__(self, repo: BookingRepository, max_window_days: int = 31, max_slots: int = 20000) -> None:
+        self.repo = repo
+        self.max_window = timedelta(days=max_window_days)
+        self.max_slots = max_slots
+
+    async def get_availability(
+        self,
+        technician_ids: List[str],
+        window_start: datetime,
+        window_end: datetime,
+        slot: timedelta
+    ) -> List[TechnicianAvailability]:
+        """Free slots per technician, from one range-indexed query for all of them."""
+        window_start, window_end = _as_utc(window_start), _as_utc(window_end)
+        if window_end <= window_start:
+            raise InvalidTimeWindowException("'to' must be after 'from'")
+        if window_end - window_start > self.max_window:
+            raise InvalidTimeWindowException(f"The window may span at most {self.max_window.days} days")
+
+        technician_ids = list(dict.fromkeys(technician_ids))
+        # Bounds the response size before anything is queried; an empty calendar would
+        # come back with this many slots
+        requested_slots = len(technician_ids) * ((window_end - window_start) // slot)
+        if requested_slots > self.max_slots:
+            raise InvalidTimeWindowException(
+                f"{requested_slots} slots requested ({len(technician_ids)} technicians), at most "
+                f"{self.max_slots} allowed; shorten the window, lengthen the slots or ask for fewer technicians"
+            )
+        busy: Dict[str, List[Interval]] = await self.repo.get_busy_periods(
+            technician_ids, window_start, window_end
+        )
+        return [
+            TechnicianAvailability.model_construct(
+                technician_id=technician_id,
+                slots=[
+                    TimeSlot.model_construct(start=start, end=end)
+                    for start, end in free_slots(busy.get(technician_id, ()), window_start, window_end, slot)
+                ]
+            )
+            for technician_id in technician_ids
+        ]
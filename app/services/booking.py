@@ -1,7 +1,21 @@
-from typing import List, Optional, Any
+from datetime import datetime
+from typing import AsyncIterator, List, Optional, Any
 from app.schemas.booking import BookingCreate, BookingInDB, BookingUpdate, BookingResponse, BookingStatus
 from app.repositories.booking import BookingRepository
 from app.utils.exceptions import NotFoundException
+from app.utils.pagination import Page
+from app.utils.mapping import record_mapper
+from app.utils.export import DEFAULT_EXPORT_CHUNK_SIZE, ExportFormat, encode_export
+
+
+# Rows from our own projection become responses without re-validation.
+BOOKING_RESPONSE_MAPPER = record_mapper(
+    BookingResponse,
+    client_id=str,
+    technician_id=str,
+    price=float,
+    status=BookingStatus
+)
 
 
 class BookingService:
@@ -14,7 +28,7 @@ class BookingService:
         """"""
         return BookingResponse(
             client_id=booking.client_id,
-            technician_id=booking.client_id,
+            technician_id=booking.technician_id,
             service_type=booking.service_type,
             description=booking.description,
             price=booking.price,
@@ -23,9 +37,21 @@ class BookingService:
             end_date=booking.end_date
         ) 
     
-    async def get_all_bookings(self) -> List[BookingResponse]:
+    def export_bookings(
+        self,
+        fmt: ExportFormat,
+        chunk_size: int = DEFAULT_EXPORT_CHUNK_SIZE
+    ) -> AsyncIterator[bytes]:
+        """"""
+        return encode_export(self.repo.stream_all(chunk_size), fmt)
+
+    async def get_all_bookings(self, limit: int, after: Optional[str] = None) -> Page[BookingResponse]:
         """"""
-        return await self.repo.get_all_bookings()
+        return await self.repo.get_all_bookings(limit, after, BOOKING_RESPONSE_MAPPER)
+
+    async def estimate_total_bookings(self) -> Optional[int]:
+        """"""
+        return await self.repo.count_estimate()
     
     async def get_booking_by_id(self, booking_id: str) -> Optional[BookingResponse]:
         """"""
@@ -56,8 +82,12 @@ class BookingService:
     
     async def delete_booking(self, booking_id: str) -> bool:
         """"""
-        return await self.repo.delete(booking_id)
+        return await self.repo.delete_booking(booking_id)
     
+    async def technician_is_free(self, technician_id: str, start: datetime, end: datetime) -> bool:
+        """"""
+        return await self.repo.technician_is_free(technician_id, start, end)
+
     async def create_booking(self, booking_data: BookingCreate) -> BookingResponse:
         """"""
         return await self.repo.create(booking_data)
@@ -0,0 +1,179 @@
+import csv
+import io
+import json
+import re
+from enum import Enum
+from itertools import islice
+from typing import IO, Any, Callable, Dict, Iterator, List, Optional, Sequence, Set, Tuple, Type, Union
+
+from pydantic import BaseModel, ValidationError
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.schemas.bulk_import import ImportResult, ImportRowError
+from app.utils.exceptions import InvalidUploadException
+from app.utils.security import SecurityUtils
+
+# Same pattern as the email CHECK constraints in the baseline migration; EmailStr alone accepts
+# addresses the database would reject, and one rejected row would abort the whole merge.
+EMAIL_CONSTRAINT = re.compile(r"^[A-Za-z0-9._%-]+@[A-Za-z0-9.-]+[.][A-Za-z]+$", re.IGNORECASE)
+
+LIST_SEPARATOR: str = ";"
+
+RawRow = Tuple[int, Union[Dict[str, Any], str]]
+
+
+class ImportFormat(str, Enum):
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+
+def _read_rows(stream: IO[bytes], fmt: ImportFormat) -> Iterator[RawRow]:
+    """Yield (line number, row) pairs, or (line number, error) for rows that cannot be parsed."""
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    if fmt is ImportFormat.CSV:
+        reader = csv.DictReader(text)
+        for row in reader:
+            # Blank cells fall back to schema defaults; surplus cells land under None.
+            yield reader.line_num, {k: v for k, v in row.items() if k is not None and v not in (None, "")}
+        return
+
+    for line_number, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield line_number, f"invalid JSON: {e.msg}"
+            continue
+        yield line_number, row if isinstance(row, dict) else "expected a JSON object"
+
+
+def _next_batch(rows: Iterator[RawRow], size: int) -> List[RawRow]:
+    """"""
+    try:
+        return list(islice(rows, size))
+    except (UnicodeDecodeError, csv.Error) as e:
+        raise InvalidUploadException(f"Uploaded file could not be read: {e}")
+
+
+def _validation_messages(error: ValidationError) -> List[str]:
+    """"""
+    return [
+        f"{'.'.join(str(part) for part in e['loc']) or 'row'}: {e['msg']}"
+        for e in error.errors()
+    ]
+
+
+class BulkImporter:
+    """Parse, validate, hash and insert uploaded rows one batch at a time.
+
+    Only one batch of rows is held in memory. Invalid, duplicate or conflicting rows are
+    reported in the result and never abort the rest of their batch.
+    """
+
+    def __init__(
+        self,
+        schema: Type[BaseModel],
+        repo,
+        batch_size: int = settings.IMPORT_BATCH_SIZE,
+        list_fields: Sequence[str] = (),
+        on_created: Optional[Callable[[list], None]] = None,
+        max_reported_errors: int = settings.IMPORT_MAX_REPORTED_ERRORS
+    ) -> None:
+        self.schema = schema
+        self.repo = repo
+        self.batch_size = batch_size
+        self.list_fields = tuple(list_fields)
+        self.on_created = on_created
+        self.max_reported_errors = max_reported_errors
+
+    async def run(self, stream: IO[bytes], fmt: ImportFormat) -> ImportResult:
+        """"""
+        result = ImportResult()
+        seen_emails: Set[str] = set()
+        seen_phone_numbers: Set[str] = set()
+        rows = _read_rows(stream, fmt)
+        while True:
+            batch = await run_in_threadpool(_next_batch, rows, self.batch_size)
+            if not batch:
+                break
+            result.received += len(batch)
+            await self._import_batch(batch, result, seen_emails, seen_phone_numbers)
+        return result
+
+    def _reject(self, result: ImportResult, line: int, errors: List[str]) -> None:
+        """"""
+        result.failed += 1
+        if len(result.errors) < self.max_reported_errors:
+            result.errors.append(ImportRowError(line=line, errors=errors))
+        else:
+            result.errors_truncated = True
+
+    def _validate(self, row: Dict[str, Any]) -> BaseModel:
+        """"""
+        for field in self.list_fields:
+            value = row.get(field)
+            if isinstance(value, str):
+                row[field] = [v.strip() for v in value.split(LIST_SEPARATOR) if v.strip()]
+        return self.schema.model_validate(row)
+
+    async def _import_batch(
+        self,
+        batch: List[RawRow],
+        result: ImportResult,
+        seen_emails: Set[str],
+        seen_phone_numbers: Set[str]
+    ) -> None:
+        """"""
+        valid: List[Tuple[int, Any]] = []
+        for line, row in batch:
+            if isinstance(row, str):
+                self._reject(result, line, [row])
+                continue
+            try:
+                model = self._validate(row)
+            except ValidationError as e:
+                self._reject(result, line, _validation_messages(e))
+                continue
+            if not EMAIL_CONSTRAINT.match(model.email):
+                self._reject(result, line, ["email: not accepted by the database email constraint"])
+            elif model.email in seen_emails:
+                self._reject(result, line, ["email: duplicated earlier in the upload"])
+            elif model.phone_number in seen_phone_numbers:
+                self._reject(result, line, ["phone_number: duplicated earlier in the upload"])
+            else:
+                seen_emails.add(model.email)
+                seen_phone_numbers.add(model.phone_number)
+                valid.append((line, model))
+
+        if not valid:
+            return
+
+        # Drop already-registered rows before paying for their password hashes.
+        taken_emails, taken_phone_numbers = await self.repo.existing_contacts(
+            [m.email for _, m in valid], [m.phone_number for _, m in valid]
+        )
+        pending: List[Tuple[int, Any]] = []
+        for line, model in valid:
+            if model.email in taken_emails:
+                self._reject(result, line, ["email: already registered"])
+            elif model.phone_number in taken_phone_numbers:
+                self._reject(result, line, ["phone_number: already registered"])
+            else:
+                pending.append((line, model))
+
+        if not pending:
+            return
+
+        hashes: List[str] = await SecurityUtils.hash_passwords([model.password for _, model in pending])
+        created = await self.repo.bulk_create([(model, h) for (_, model), h in zip(pending, hashes)])
+
+        # Anything missing from the merge output lost a race with a concurrent insert.
+        created_emails: Set[str] = {c.email for c in created}
+        for line, model in pending:
+            if model.email not in created_emails:
+                self._reject(result, line, ["email or phone_number: already registered"])
+        result.inserted += len(created)
+        if self.on_created is not None and created:
+            self.on_created(created)
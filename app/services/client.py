@@ -1,6 +1,11 @@
-from typing import List
+from typing import IO, List, Optional
 from app.schemas.client import ClientInDB, ClientResponse, ClientUpdate, ClientCreate
 from app.repositories.client import ClientRepository
+from app.schemas.bulk_import import ImportResult
+from app.services.bulk_import import BulkImporter, ImportFormat
+from app.utils.pagination import Page
+from app.database.geography import LOCATION_FIELDS
+from app.utils.mapping import record_mapper
 from app.utils.security import SecurityUtils
 from app.services.favorite_technician import FavoriteTechnicianService
 from app.schemas.favorite_technician import FavoriteTechnicianCreate, FavoriteTechnicianResponse
@@ -10,6 +15,10 @@ from app.utils.exceptions import (
 )
 
 
+# Rows from our own projection become responses without re-validation.
+CLIENT_RESPONSE_MAPPER = record_mapper(ClientResponse, LOCATION_FIELDS, client_id=str)
+
+
 class ClientService:
 
     def __init__(self, repo: ClientRepository) -> None:
@@ -35,9 +44,17 @@ class ClientService:
         client = await self.repo.create(client_data)
         return ClientService.client_in_db_to_response(client)
     
-    async def get_all_clients(self) -> List[ClientResponse]:
-        clients = await self.repo.get_all()
-        return [ClientService.client_in_db_to_response(c) for c in clients]
+    async def import_clients(self, stream: IO[bytes], fmt: ImportFormat) -> ImportResult:
+        """"""
+        return await BulkImporter(ClientCreate, self.repo).run(stream, fmt)
+
+    async def get_all_clients(self, limit: int, after: Optional[str] = None) -> Page[ClientResponse]:
+        """"""
+        return await self.repo.get_all(limit, after, CLIENT_RESPONSE_MAPPER)
+
+    async def estimate_total_clients(self) -> Optional[int]:
+        """"""
+        return await self.repo.count_estimate()
     
     async def get_client(self, client_id: str) -> ClientResponse:
         """"""
@@ -1,7 +1,23 @@
-from typing import Any, List, Optional
-from app.schemas.payment import PaymentCreate, PaymentInDB, PaymentUpdate, PaymentResponse
+from typing import AsyncIterator, Any, List, Optional
+from app.schemas.payment import PaymentCreate, PaymentInDB, PaymentUpdate, PaymentResponse, PaymentMethod, PaymentStatus
 from app.repositories.payment import PaymentRepository
 from app.utils.exceptions import NotFoundException
+from app.utils.pagination import Page
+from app.utils.mapping import record_mapper
+from app.utils.export import DEFAULT_EXPORT_CHUNK_SIZE, ExportFormat, encode_export
+
+
+# Rows from our own projection become responses without re-validation.
+PAYMENT_RESPONSE_MAPPER = record_mapper(
+    PaymentResponse,
+    payment_id=str,
+    booking_id=str,
+    client_id=str,
+    technician_id=str,
+    amount=float,
+    payment_method=PaymentMethod,
+    payment_status=PaymentStatus
+)
 
 
 class PaymentService:
@@ -35,10 +51,21 @@ class PaymentService:
         """"""
         return await self.repo.update(payment_id, update_data)
     
-    async def get_all_payments(self) -> List[PaymentResponse]:
+    def export_payments(
+        self,
+        fmt: ExportFormat,
+        chunk_size: int = DEFAULT_EXPORT_CHUNK_SIZE
+    ) -> AsyncIterator[bytes]:
+        """"""
+        return encode_export(self.repo.stream_all(chunk_size), fmt)
+
+    async def get_all_payments(self, limit: int, after: Optional[str] = None) -> Page[PaymentResponse]:
+        """"""
+        return await self.repo.get_all_payments(limit, after, PAYMENT_RESPONSE_MAPPER)
+
+    async def estimate_total_payments(self) -> Optional[int]:
         """"""
-        payments = await self.repo.get_all_payments()
-        return [PaymentService.payment_in_db_to_response(p) for p in payments]
+        return await self.repo.count_estimate()
     
     async def get_payment_by_id(self, payment_id: str) -> Optional[PaymentResponse]:
         """"""
@@ -0,0 +1,230 @@
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.repositories.booking import BookingRepository
+from app.repositories.technician import TechnicianRepository
+from app.schemas.technician import TechnicianInDB, TechnicianNearbyResponse, TechnicianSort
+from app.services.technician import TechnicianService
+from app.utils.metrics import SEARCH_RANKING_STAGE_SECONDS
+
+# Experience stops adding to the score past this many years
+EXPERIENCE_SATURATION_YEARS: float = 10.0
+# Factor score for a candidate whose rating is unknown
+NEUTRAL_RATING_SCORE: float = 0.5
+
+
+class RankingFeatures(NamedTuple):
+    """Candidate columns for the factors to score, one array entry per candidate."""
+    distance_km: np.ndarray
+    rating_score: np.ndarray
+    experience_years: np.ndarray
+    is_verified: np.ndarray
+    is_available: np.ndarray
+    booking_load: np.ndarray
+    radius_km: float
+
+
+class RankingFactor(NamedTuple):
+    """One weighted relevance signal; score maps features to [0, 1], higher is better."""
+    name: str
+    weight: float
+    score: Callable[[RankingFeatures], np.ndarray]
+
+
+def proximity(features: RankingFeatures) -> np.ndarray:
+    """1 at the search point, falling linearly to 0 at the search radius."""
+    return np.clip(1.0 - features.distance_km / features.radius_km, 0.0, 1.0)
+
+
+def rating(features: RankingFeatures) -> np.ndarray:
+    """Bayesian rating score mapped from 1-5 stars to 0-1."""
+    return np.nan_to_num(np.clip((features.rating_score - 1.0) / 4.0, 0.0, 1.0), nan=NEUTRAL_RATING_SCORE)
+
+
+def experience(features: RankingFeatures) -> np.ndarray:
+    """Log-scaled, so the first years count most, saturating at EXPERIENCE_SATURATION_YEARS."""
+    return np.minimum(np.log1p(features.experience_years) / np.log1p(EXPERIENCE_SATURATION_YEARS), 1.0)
+
+
+def verified(features: RankingFeatures) -> np.ndarray:
+    """"""
+    return features.is_verified.astype(np.float64)
+
+
+def available(features: RankingFeatures) -> np.ndarray:
+    """"""
+    return features.is_available.astype(np.float64)
+
+
+def booking_load(features: RankingFeatures) -> np.ndarray:
+    """1 for an idle technician, halving at one booking, so work spreads across technicians."""
+    return 1.0 / (1.0 + features.booking_load)
+
+
+def default_factors(
+    distance_weight: float,
+    rating_weight: float,
+    experience_weight: float,
+    verified_weight: float,
+    available_weight: float,
+    booking_load_weight: float
+) -> List[RankingFactor]:
+    """"""
+    return [
+        RankingFactor("distance", distance_weight, proximity),
+        RankingFactor("rating", rating_weight, rating),
+        RankingFactor("experience", experience_weight, experience),
+        RankingFactor("verified", verified_weight, verified),
+        RankingFactor("available", available_weight, available),
+        RankingFactor("booking_load", booking_load_weight, booking_load),
+    ]
+
+
+class TechnicianRanker:
+    """Scores a batch of candidates as the weighted mean of its factors and keeps the top k.
+
+    Every factor scores the whole batch in one numpy expression, and the top k are picked
+    with argpartition, so only those k are sorted. Factors are plain functions of
+    RankingFeatures: add one by appending a RankingFactor, drop one by giving it weight 0.
+    """
+
+    def __init__(self, factors: Sequence[RankingFactor]) -> None:
+        if any(f.weight < 0 for f in factors):
+            raise ValueError("Ranking weights must not be negative")
+        self.factors: Tuple[RankingFactor, ...] = tuple(f for f in factors if f.weight > 0)
+        if not self.factors:
+            raise ValueError("At least one ranking factor needs a positive weight")
+        self._total_weight: float = sum(f.weight for f in self.factors)
+
+    def score(self, features: RankingFeatures) -> np.ndarray:
+        """Relevance in [0, 1] for every candidate."""
+        scores = np.zeros(len(features.distance_km), dtype=np.float64)
+        for factor in self.factors:
+            scores += factor.weight * factor.score(features)
+        return scores / self._total_weight
+
+    @staticmethod
+    def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+        """Indices of the k best scores, best first; ties keep their input order."""
+        if k < len(scores):
+            best = np.sort(np.argpartition(-scores, k - 1)[:k])
+        else:
+            best = np.arange(len(scores))
+        return best[np.argsort(-scores[best], kind="stable")]
+
+
+class StageTimer:
+    """Wall-clock seconds per named stage, also recorded in SEARCH_RANKING_STAGE_SECONDS."""
+
+    def __init__(self) -> None:
+        self.stages: Dict[str, float] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.stages[name] = elapsed
+            SEARCH_RANKING_STAGE_SECONDS.observe(elapsed, (name,))
+
+    def server_timing(self) -> str:
+        """The stages as a Server-Timing header value, in milliseconds."""
+        return ", ".join(f"{name};dur={seconds * 1000:.2f}" for name, seconds in self.stages.items())
+
+
+def build_features(
+    candidates: List[Tuple[TechnicianInDB, float]],
+    loads: Dict[str, int],
+    radius_km: float
+) -> RankingFeatures:
+    """Column arrays from (technician, distance km) pairs and booking counts by technician id."""
+    count = len(candidates)
+    return RankingFeatures(
+        distance_km=np.fromiter((d for _, d in candidates), dtype=np.float64, count=count),
+        rating_score=np.fromiter(
+            (np.nan if t.rating_score is None else t.rating_score for t, _ in candidates),
+            dtype=np.float64,
+            count=count
+        ),
+        experience_years=np.fromiter((t.experience_years for t, _ in candidates), dtype=np.float64, count=count),
+        is_verified=np.fromiter((t.is_verified for t, _ in candidates), dtype=np.bool_, count=count),
+        is_available=np.fromiter((t.is_available for t, _ in candidates), dtype=np.bool_, count=count),
+        booking_load=np.fromiter(
+            (loads.get(t.technician_id, 0) for t, _ in candidates), dtype=np.float64, count=count
+        ),
+        radius_km=radius_km
+    )
+
+
+class RankingService:
+
+    def __init__(
+        self,
+        technician_repo: TechnicianRepository,
+        booking_repo: BookingRepository,
+        ranker: TechnicianRanker,
+        candidate_multiplier: int = 5,
+        max_candidates: int = 500,
+        booking_load_days: int = 7
+    ) -> None:
+        self.technician_repo = technician_repo
+        self.booking_repo = booking_repo
+        self.ranker = ranker
+        self.candidate_multiplier = candidate_multiplier
+        self.max_candidates = max_candidates
+        self.booking_load_window = timedelta(days=booking_load_days)
+
+    async def search_nearby_technicians(
+        self,
+        lat: float,
+        lon: float,
+        radius_km: float,
+        service_type: Optional[str] = None,
+        only_available: bool = True,
+        only_verified: bool = False,
+        limit: int = 20
+    ) -> Tuple[List[TechnicianNearbyResponse], StageTimer]:
+        """The limit most relevant technicians within radius_km, and how long each stage took.
+
+        The nearest limit * candidate_multiplier technicians are the candidates; their
+        booking load comes from one query for the whole batch before they are scored.
+        """
+        timer = StageTimer()
+        with timer.stage("candidates"):
+            candidates = await self.technician_repo.search_nearby(
+                lat, lon, radius_km, service_type, only_available, only_verified,
+                min(limit * self.candidate_multiplier, self.max_candidates), TechnicianSort.DISTANCE
+            )
+        if not candidates:
+            return [], timer
+
+        with timer.stage("booking_load"):
+            now = datetime.now(timezone.utc)
+            loads = await self.booking_repo.count_active_bookings(
+                [t.technician_id for t, _ in candidates],
+                now - self.booking_load_window,
+                now + self.booking_load_window
+            )
+        with timer.stage("features"):
+            features = build_features(candidates, loads, radius_km)
+        with timer.stage("score"):
+            scores = self.ranker.score(features)
+        with timer.stage("select"):
+            best = TechnicianRanker.top_k(scores, limit)
+        with timer.stage("respond"):
+            results = [
+                TechnicianNearbyResponse(
+                    **TechnicianService.technician_in_db_to_response(candidates[i][0]).model_dump(),
+                    distance_km=round(candidates[i][1], 2),
+                    relevance=round(float(scores[i]), 4)
+                )
+                for i in best
+            ]
+        return results, timer
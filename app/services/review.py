@@ -1,7 +1,21 @@
-from typing import Any, List, Optional
+from typing import AsyncIterator, Any, List, Optional
 from app.schemas.review import ReviewCreate, ReviewInDB, ReviewUpdate, ReviewResponse
 from app.repositories.review import ReviewRepository
 from app.utils.exceptions import NotFoundException
+from app.utils.pagination import Page
+from app.utils.mapping import record_mapper
+from app.utils.export import DEFAULT_EXPORT_CHUNK_SIZE, ExportFormat, encode_export
+
+
+# Rows from our own projection become responses without re-validation.
+REVIEW_RESPONSE_MAPPER = record_mapper(
+    ReviewResponse,
+    review_id=str,
+    booking_id=str,
+    client_id=str,
+    technician_id=str,
+    rating=float
+)
 
 
 class ReviewService:
@@ -22,10 +36,21 @@ class ReviewService:
             created_at=review.created_at
         )
 
-    async def get_all_reviews(self) -> List[ReviewResponse]:
+    def export_reviews(
+        self,
+        fmt: ExportFormat,
+        chunk_size: int = DEFAULT_EXPORT_CHUNK_SIZE
+    ) -> AsyncIterator[bytes]:
         """"""
-        reviews = await self.repo.get_all_reviews()
-        return [ReviewService.review_in_db_to_response(r) for r in reviews]
+        return encode_export(self.repo.stream_all(chunk_size), fmt)
+
+    async def get_all_reviews(self, limit: int, after: Optional[str] = None) -> Page[ReviewResponse]:
+        """"""
+        return await self.repo.get_all_reviews(limit, after, REVIEW_RESPONSE_MAPPER)
+
+    async def estimate_total_reviews(self) -> Optional[int]:
+        """"""
+        return await self.repo.count_estimate()
     
     async def get_review_by_id(self, review_id: str) -> Optional[ReviewResponse]:
         """"""
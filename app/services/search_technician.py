@@ -1,26 +1,72 @@
-import googlemaps as gm
-from math import radians, cos, sin, asin, sqrt
-from urllib.request import urlopen
-import requests
-import json
-from typing import List
+import asyncio
+import httpx
+import numpy as np
+from math import radians, cos, sin, asin, sqrt, ceil
+from typing import List, Optional, Tuple
 from app.schemas.search_technician import (
     SearchParameters,
     BusinessResult,
     BusinessSearchResults,
     BusinessLocation,
 )
+from app.services.search_cache import SearchResultCache
+from app.utils.exceptions import UpstreamServiceException
+from app.utils.geo import geohash_encode, geohash_center, geohash_cell_half_diagonal_km, rank_by_distance
 from app.config import settings
 
 
+def build_upstream_client(transport: Optional[httpx.AsyncBaseTransport] = None) -> httpx.AsyncClient:
+    """The shared outbound client, with pool limits, keep-alive and timeout from settings.
+
+    Pass httpx.ASGITransport(app) as transport to send every request to an in-process
+    ASGI app instead of the network (see benchmarks/fake_upstream.py).
+    """
+    return httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=settings.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY_SECONDS,
+        ),
+        timeout=settings.SEARCH_TIMEOUT_SECONDS,
+        transport=transport,
+    )
+
+
 class SearchService:
-    def __init__(self):
-        self.gmaps_client = gm.Client(key=settings.GOOGLE_API_KEY)
+    """Google Places / Geolocation lookups over a shared, non-blocking HTTP client.
+
+    The client is owned by the application (see lifespan in app.main) so every request
+    reuses the same keep-alive connection pool. Pointing GOOGLE_PLACES_URL and
+    GOOGLE_GEOLOCATION_URL at a local server, or passing a client built on
+    httpx.ASGITransport, swaps Google for a stand-in.
+
+    Nearby searches are cached per (geohash cell, normalized keyword, radius bucket).
+    The upstream is always queried from the cell centre, with the caller's radius plus
+    the cell's half-diagonal rounded up to a bucket, so every caller in a cell shares one
+    result set that still covers their own radius; distances are then recomputed for
+    each caller's exact position.
+    """
+
+    def __init__(
+        self,
+        http_client: httpx.AsyncClient,
+        max_concurrency: int = settings.SEARCH_MAX_CONCURRENCY,
+        timeout_seconds: float = settings.SEARCH_TIMEOUT_SECONDS,
+        cache: Optional[SearchResultCache] = None
+    ) -> None:
+        self.http_client = http_client
+        self.cache = cache if cache is not None else SearchResultCache(
+            ttl_seconds=settings.SEARCH_CACHE_TTL_SECONDS,
+            max_entries=settings.SEARCH_CACHE_MAX_ENTRIES,
+        )
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._timeout = httpx.Timeout(timeout_seconds)
 
     def _kilometer_to_meter(self, km: float) -> int:
         return int(km * 1000)
 
-    def _haversine(self, lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    @staticmethod
+    def _haversine(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
         R = 6371.0
         dlat = radians(lat2 - lat1)
         dlon = radians(lon2 - lon1)
@@ -28,41 +74,95 @@ class SearchService:
         c = 2 * asin(sqrt(a))
         return R * c
 
-    def search_nearby(self, params: SearchParameters) -> BusinessSearchResults:
-        radius = self._kilometer_to_meter(params.distance_km)
-        location = {"lat": params.user_lat, "lng": params.user_lon}
+    async def _request(self, method: str, url: str, **kwargs) -> dict:
+        """Send one upstream request, bounded by the service-wide concurrency limit."""
+        async with self._semaphore:
+            try:
+                response = await self.http_client.request(
+                    method, url, timeout=self._timeout, **kwargs
+                )
+                response.raise_for_status()
+            except httpx.TimeoutException:
+                raise UpstreamServiceException("Upstream search service timed out")
+            except httpx.HTTPError as e:
+                raise UpstreamServiceException(f"Upstream search service error: {e}")
+        return response.json()
 
-        query_response = self.gmaps_client.places_nearby(
-            location=location,
-            keyword=params.search_string,
-            radius=radius,
-        )
+    @staticmethod
+    def _cache_key(params: SearchParameters) -> Tuple[str, str, float]:
+        """"""
+        cell = geohash_encode(params.user_lat, params.user_lon, settings.SEARCH_CACHE_GEOHASH_PRECISION)
+        keyword = " ".join(params.search_string.lower().split())
+        bucket = settings.SEARCH_CACHE_RADIUS_BUCKET_KM
+        # Widened by the caller's worst-case offset from the cell centre, so the shared
+        # result set covers the caller's whole radius wherever they are in the cell
+        reach_km = params.distance_km + geohash_cell_half_diagonal_km(settings.SEARCH_CACHE_GEOHASH_PRECISION)
+        radius_km = ceil(reach_km / bucket) * bucket
+        return cell, keyword, radius_km
 
-        business_list = query_response.get("results", [])
-        results: List[BusinessResult] = []
+    async def _fetch_nearby(self, lat: float, lon: float, keyword: str, radius_km: float) -> List[BusinessResult]:
+        """Query Places Nearby; distance_km on the returned results is left at 0."""
+        query_response = await self._request(
+            "GET",
+            settings.GOOGLE_PLACES_URL,
+            params={
+                "location": f"{lat},{lon}",
+                "keyword": keyword,
+                "radius": self._kilometer_to_meter(radius_km),
+                "key": settings.GOOGLE_API_KEY,
+            },
+        )
 
-        for business in business_list:
-            biz_location = business["geometry"]["location"]
-            distance = self._haversine(
-                params.user_lat,
-                params.user_lon,
-                biz_location["lat"],
-                biz_location["lng"]
+        status: Optional[str] = query_response.get("status")
+        if status not in (None, "OK", "ZERO_RESULTS"):
+            raise UpstreamServiceException(
+                f"Places search failed: {status} {query_response.get('error_message', '')}".strip()
             )
-            results.append(BusinessResult(
-                map_location=BusinessLocation(**biz_location),
+
+        return [
+            BusinessResult(
+                map_location=BusinessLocation(**business["geometry"]["location"]),
                 shop_location=business.get("vicinity", "N/A"),
                 shop_name=business.get("name", "N/A"),
                 rating=str(business.get("rating", "No rating")),
-                distance_km=round(distance, 2)
-            ))
+                distance_km=0.0
+            )
+            for business in query_response.get("results", [])
+        ]
+
+    async def search_nearby(self, params: SearchParameters) -> BusinessSearchResults:
+        key = self._cache_key(params)
+        cell, keyword, radius_km = key
+        center_lat, center_lon = geohash_center(cell)
+
+        businesses = await self.cache.get_or_load(
+            key, lambda: self._fetch_nearby(center_lat, center_lon, keyword, radius_km)
+        )
+
+        if not businesses:
+            return BusinessSearchResults(results=[])
+
+        # The cached set was fetched around the cell centre with a bucketed radius, so it
+        # is trimmed back to the caller's own radius while ranking.
+        distances, order = rank_by_distance(
+            params.user_lat,
+            params.user_lon,
+            np.fromiter((b.map_location.lat for b in businesses), dtype=np.float64, count=len(businesses)),
+            np.fromiter((b.map_location.lng for b in businesses), dtype=np.float64, count=len(businesses)),
+            max_distance_km=params.distance_km,
+        )
+        results: List[BusinessResult] = [
+            businesses[i].model_copy(update={"distance_km": round(float(distances[i]), 2)})
+            for i in order
+        ]
 
         return BusinessSearchResults(results=results)
 
-    def get_current_location(self) -> dict:
-        ip_loc_url = 'http://ipinfo.io/json'
-        urlopen(ip_loc_url)  # Just to trigger external IP usage
-        geo_loc_url = f"https://www.googleapis.com/geolocation/v1/geolocate?key={settings.GEOLOCATION_KEY}"
-        response = requests.post(geo_loc_url, json={"considerIp": True})
-        location_data = response.json()
+    async def get_current_location(self) -> dict:
+        location_data = await self._request(
+            "POST",
+            settings.GOOGLE_GEOLOCATION_URL,
+            params={"key": settings.GEOLOCATION_KEY},
+            json={"considerIp": True},
+        )
         return location_data['location']
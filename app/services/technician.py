@@ -1,11 +1,20 @@
-from typing import List
+from typing import IO, List, Optional
 from app.schemas.technician import (
     TechnicianInDB,
     TechnicianResponse,
+    TechnicianNearbyResponse,
+    TechnicianDistance,
+    TechnicianSort,
     TechnicianUpdate,
     TechnicianCreate
     )
+from app.database.geography import LOCATION_FIELDS
 from app.repositories.technician import TechnicianRepository
+from app.schemas.bulk_import import ImportResult
+from app.services.bulk_import import BulkImporter, ImportFormat
+from app.services.technician_index import TechnicianSpatialIndex
+from app.utils.pagination import Page
+from app.utils.mapping import record_mapper
 from app.utils.security import SecurityUtils
 from app.utils.exceptions import (
     NotFoundException,
@@ -13,10 +22,17 @@ from app.utils.exceptions import (
 )
 
 
+# Rows from our own projection become responses without re-validation.
+TECHNICIAN_RESPONSE_MAPPER = record_mapper(
+    TechnicianResponse, LOCATION_FIELDS, technician_id=str, experience_years=int
+)
+
+
 class TechnicianService:
 
-    def __init__(self, repo: TechnicianRepository) -> None:
+    def __init__(self, repo: TechnicianRepository, index: Optional[TechnicianSpatialIndex] = None) -> None:
         self.repo = repo
+        self.index = index
     
     @staticmethod
     def technician_in_db_to_response(technician: TechnicianInDB) -> TechnicianResponse:
@@ -34,13 +50,72 @@ class TechnicianService:
             technician_id=technician.technician_id,
             created_at=technician.created_at,
             experience_years=technician.experience_years,
-            is_available=technician.is_available
+            is_available=technician.is_available,
+            review_count=technician.review_count,
+            average_rating=technician.average_rating,
+            rating_histogram=technician.rating_histogram,
+            rating_score=technician.rating_score
+        )
+    
+    async def get_all_technicians(self, limit: int, after: Optional[str] = None) -> Page[TechnicianResponse]:
+        """"""
+        return await self.repo.get_page(limit, after, TECHNICIAN_RESPONSE_MAPPER)
+
+    async def estimate_total_technicians(self) -> Optional[int]:
+        """"""
+        return await self.repo.count_estimate()
+    
+    async def search_nearby_technicians(
+        self,
+        lat: float,
+        lon: float,
+        radius_km: float,
+        service_type: Optional[str] = None,
+        only_available: bool = True,
+        only_verified: bool = False,
+        limit: int = 20,
+        sort: TechnicianSort = TechnicianSort.DISTANCE
+    ) -> List[TechnicianNearbyResponse]:
+        """"""
+        results = await self.repo.search_nearby(
+            lat, lon, radius_km, service_type, only_available, only_verified, limit, sort
         )
+        return [
+            TechnicianNearbyResponse(
+                **TechnicianService.technician_in_db_to_response(t).model_dump(),
+                distance_km=round(distance, 2)
+            )
+            for t, distance in results
+        ]
     
-    async def get_all_technicians(self) -> List[TechnicianResponse]:
+    def nearest_technicians(
+        self,
+        lat: float,
+        lon: float,
+        k: int = 10,
+        service_type: Optional[str] = None,
+        max_distance_km: Optional[float] = None
+    ) -> List[TechnicianDistance]:
+        """"""
+        if self.index is None:
+            raise NotFoundException("Technician index is not loaded")
+        return [
+            TechnicianDistance(technician_id=tid, distance_km=round(distance, 3))
+            for tid, distance in self.index.nearest(lat, lon, k, service_type, True, max_distance_km)
+        ]
+
+    async def check_index_consistency(
+        self,
+        lat: float,
+        lon: float,
+        k: int = 10,
+        service_type: Optional[str] = None,
+        radius_km: float = 50
+    ) -> dict:
         """"""
-        technicians = await self.repo.get_all()
-        return [TechnicianService.technician_in_db_to_response(t) for t in technicians]
+        if self.index is None:
+            raise NotFoundException("Technician index is not loaded")
+        return await self.index.check_consistency(self.repo, lat, lon, k, service_type, radius_km)
     
     async def get_technician_by_id(self, technician_id: str) -> TechnicianResponse:
         """"""
@@ -59,11 +134,32 @@ class TechnicianService:
     async def create_technician(self, technician_data: TechnicianCreate) -> TechnicianResponse:
         """"""
         technician = await self.repo.create(technician_data)
+        if self.index is not None:
+            self.index.upsert(technician)
         return TechnicianService.technician_in_db_to_response(technician)
     
+    async def import_technicians(self, stream: IO[bytes], fmt: ImportFormat) -> ImportResult:
+        """"""
+        importer = BulkImporter(
+            TechnicianCreate,
+            self.repo,
+            list_fields=("service_types",),
+            on_created=self._index_created
+        )
+        return await importer.run(stream, fmt)
+
+    def _index_created(self, technicians: List[TechnicianInDB]) -> None:
+        """"""
+        if self.index is not None:
+            for technician in technicians:
+                self.index.upsert(technician)
+
     async def delete_technician(self, technician_id: str) -> bool:
         """"""
-        return await self.repo.delete(technician_id)
+        result = await self.repo.delete(technician_id)
+        if self.index is not None:
+            self.index.remove(technician_id)
+        return result
     
     async def update_technician(
         self,
@@ -72,6 +168,8 @@ class TechnicianService:
     ) -> TechnicianResponse:
         """"""
         updated_technician = await self.repo.update(technician_id, update_data)
+        if self.index is not None and updated_technician is not None:
+            self.index.upsert(updated_technician)
         return TechnicianService.technician_in_db_to_response(updated_technician)
 
     async def authenticate_technician_with_email_and_password(self, email: str, password: str) -> TechnicianResponse:
@@ -0,0 +1,299 @@
+import math
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+
+import numpy as np
+
+from app.repositories.technician import TechnicianLocationRow, TechnicianRepository
+from app.schemas.technician import TechnicianInDB
+from app.utils.geo import haversine_km
+
+IndexedTechnician = Union[TechnicianInDB, TechnicianLocationRow]
+
+KM_PER_DEGREE: float = 111.195
+
+
+def _coordinates(technician: IndexedTechnician) -> Tuple[float, float]:
+    """(lat, lon) of a model, which has latitude/longitude, or of a row, which has a location."""
+    if isinstance(technician, TechnicianLocationRow):
+        return technician.location.lat, technician.location.lon
+    return float(technician.latitude), float(technician.longitude)
+
+
+class TechnicianSpatialIndex:
+    """In-process grid index of technician locations for nearest-N lookups.
+
+    Coordinates live in flat NumPy arrays addressed by slot; a dict of grid cells maps
+    to the slots inside each cell. A lookup walks rings of cells outwards from the
+    query point and ranks the candidates it collects in one vectorized distance pass.
+    Removed technicians leave a free slot that the next insert reuses.
+
+    Each worker process holds its own copy. It is updated through TechnicianService on
+    every write made by this process and rebuilt from the database periodically to pick
+    up writes made by other workers.
+    """
+
+    def __init__(self, cell_size_deg: float = 0.05, initial_capacity: int = 1024) -> None:
+        self.cell_size_deg = cell_size_deg
+        # Columns wrap at the antimeridian, so they split 360 degrees evenly, each at most cell_size_deg wide
+        self._n_cols: int = math.ceil(360 / cell_size_deg)
+        self._col_deg: float = 360 / self._n_cols
+        self._lats = np.zeros(initial_capacity, dtype=np.float64)
+        self._lons = np.zeros(initial_capacity, dtype=np.float64)
+        self._available = np.zeros(initial_capacity, dtype=bool)
+        self._ids: List[Optional[str]] = [None] * initial_capacity
+        self._service_types: List[frozenset] = [frozenset()] * initial_capacity
+        self._cell_of: List[Optional[Tuple[int, int]]] = [None] * initial_capacity
+        self._slot_by_id: Dict[str, int] = {}
+        self._cells: Dict[Tuple[int, int], Set[int]] = {}
+        self._free_slots: List[int] = []
+        self._next_slot: int = 0
+        self._row_bounds: Optional[Tuple[int, int]] = None
+        self._col_bounds: Optional[Tuple[int, int]] = None
+        # Mutations made while refresh() is loading, replayed onto the fresh copy
+        self._journal: Optional[List[Tuple[str, tuple]]] = None
+
+    def __len__(self) -> int:
+        return len(self._slot_by_id)
+
+    def __contains__(self, technician_id: str) -> bool:
+        return technician_id in self._slot_by_id
+
+    @classmethod
+    def from_technicians(cls, technicians: Iterable[IndexedTechnician], **kwargs) -> "TechnicianSpatialIndex":
+        """"""
+        index = cls(**kwargs)
+        for technician in technicians:
+            index.upsert(technician)
+        return index
+
+    @classmethod
+    async def load(cls, repo: TechnicianRepository, **kwargs) -> "TechnicianSpatialIndex":
+        """Build an index from every technician in the database."""
+        return cls.from_technicians(await repo.get_location_rows(), **kwargs)
+
+    def _cell(self, lat: float, lon: float) -> Tuple[int, int]:
+        """(row, col) of a point; columns count eastwards from -180 and wrap, so -180 and 180 share one."""
+        return math.floor(lat / self.cell_size_deg), math.floor((lon + 180) / self._col_deg) % self._n_cols
+
+    def _grow(self) -> None:
+        """"""
+        capacity = len(self._ids) * 2
+        for name in ("_lats", "_lons", "_available"):
+            current = getattr(self, name)
+            grown = np.zeros(capacity, dtype=current.dtype)
+            grown[:len(current)] = current
+            setattr(self, name, grown)
+        extra = capacity - len(self._ids)
+        self._ids.extend([None] * extra)
+        self._service_types.extend([frozenset()] * extra)
+        self._cell_of.extend([None] * extra)
+
+    def _allocate_slot(self) -> int:
+        """"""
+        if self._free_slots:
+            return self._free_slots.pop()
+        if self._next_slot == len(self._ids):
+            self._grow()
+        slot = self._next_slot
+        self._next_slot += 1
+        return slot
+
+    def _record(self, method: str, *args) -> None:
+        """"""
+        if self._journal is not None:
+            self._journal.append((method, args))
+
+    def upsert(self, technician: IndexedTechnician) -> None:
+        """Insert a technician, or move/refresh one that is already indexed."""
+        self._record("upsert", technician)
+        slot = self._slot_by_id.get(technician.technician_id)
+        if slot is None:
+            slot = self._allocate_slot()
+            self._slot_by_id[technician.technician_id] = slot
+            self._ids[slot] = technician.technician_id
+        else:
+            self._cells[self._cell_of[slot]].discard(slot)
+
+        lat, lon = _coordinates(technician)
+        cell = self._cell(lat, lon)
+        self._lats[slot] = lat
+        self._lons[slot] = lon
+        self._available[slot] = technician.is_available
+        self._service_types[slot] = frozenset(technician.service_types)
+        self._cell_of[slot] = cell
+        self._cells.setdefault(cell, set()).add(slot)
+
+        row, col = cell
+        self._row_bounds = (row, row) if self._row_bounds is None else (
+            min(self._row_bounds[0], row), max(self._row_bounds[1], row)
+        )
+        self._col_bounds = (col, col) if self._col_bounds is None else (
+            min(self._col_bounds[0], col), max(self._col_bounds[1], col)
+        )
+
+    def set_available(self, technician_id: str, is_available: bool) -> None:
+        """"""
+        self._record("set_available", technician_id, is_available)
+        slot = self._slot_by_id.get(technician_id)
+        if slot is not None:
+            self._available[slot] = is_available
+
+    def remove(self, technician_id: str) -> None:
+        """"""
+        self._record("remove", technician_id)
+        slot = self._slot_by_id.pop(technician_id, None)
+        if slot is None:
+            return
+        cell = self._cell_of[slot]
+        self._cells[cell].discard(slot)
+        if not self._cells[cell]:
+            del self._cells[cell]
+        self._ids[slot] = None
+        self._service_types[slot] = frozenset()
+        self._cell_of[slot] = None
+        self._available[slot] = False
+        self._free_slots.append(slot)
+
+    async def refresh(self, repo: TechnicianRepository) -> None:
+        """Rebuild from the database and swap the new contents in.
+
+        Changes applied while the rows load are journaled and replayed onto the new copy
+        before the swap, since the snapshot may predate them. A refresh that starts while
+        another is loading does nothing.
+        """
+        if self._journal is not None:
+            return
+        self._journal = []
+        try:
+            fresh = await TechnicianSpatialIndex.load(repo, cell_size_deg=self.cell_size_deg)
+            for method, args in self._journal:
+                getattr(fresh, method)(*args)
+            self.__dict__.update(fresh.__dict__)
+        finally:
+            self._journal = None
+
+    def _ring(self, row: int, col: int, radius: int) -> Iterable[Tuple[int, int]]:
+        """Cells on the square ring `radius` cells away from (row, col), columns wrapped.
+
+        Once the ring is wider than the grid its columns overlap cells already walked, so
+        each column is yielded once and the sides only while they are still new.
+        """
+        if radius == 0:
+            yield row, col
+            return
+        n_cols = self._n_cols
+        if 2 * radius + 1 >= n_cols:
+            cols = range(n_cols)
+        else:
+            cols = (c % n_cols for c in range(col - radius, col + radius + 1))
+        for c in cols:
+            yield row - radius, c
+            yield row + radius, c
+        if 2 * radius > n_cols:
+            return
+        sides = {(col - radius) % n_cols, (col + radius) % n_cols}
+        for r in range(row - radius + 1, row + radius):
+            for c in sides:
+                yield r, c
+
+    def _min_cell_km(self, lat: float, radius: int) -> float:
+        """Smallest cell edge (km) within `radius` rings of lat; longitude cells narrow poleward."""
+        widest_lat = min(abs(lat) + (radius + 1) * self.cell_size_deg, 89.9)
+        return self._col_deg * KM_PER_DEGREE * math.cos(math.radians(widest_lat))
+
+    def nearest(
+        self,
+        lat: float,
+        lon: float,
+        k: int = 10,
+        service_type: Optional[str] = None,
+        only_available: bool = True,
+        max_distance_km: Optional[float] = None
+    ) -> List[Tuple[str, float]]:
+        """The k nearest matching technicians as (technician_id, distance_km), nearest first."""
+        if not self._slot_by_id or k <= 0:
+            return []
+
+        row, col = self._cell(lat, lon)
+        # No column is more than half the grid away once the walk wraps at the antimeridian
+        max_ring = max(
+            abs(row - self._row_bounds[0]), abs(row - self._row_bounds[1]),
+            min(max(abs(col - self._col_bounds[0]), abs(col - self._col_bounds[1])), self._n_cols // 2),
+        )
+        candidates: List[int] = []
+        radius = 0
+
+        while radius <= max_ring:
+            if 8 * radius > len(self._cells):
+                # The next ring has more cells than are occupied in total: scanning every
+                # occupied cell is cheaper than continuing to walk empty ones.
+                candidates = [
+                    slot for cell_slots in self._cells.values() for slot in cell_slots
+                    if self._matches(slot, service_type, only_available)
+                ]
+                break
+
+            for cell in self._ring(row, col, radius):
+                for slot in self._cells.get(cell, ()):
+                    if self._matches(slot, service_type, only_available):
+                        candidates.append(slot)
+
+            # Anything outside the rings searched so far is at least `radius` full cells away.
+            searched_km = radius * self._min_cell_km(lat, radius)
+            if max_distance_km is not None and searched_km > max_distance_km:
+                break
+            if len(candidates) >= k:
+                slots = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+                distances = haversine_km(lat, lon, self._lats[slots], self._lons[slots])
+                if np.partition(distances, k - 1)[k - 1] <= searched_km:
+                    break
+            radius += 1
+
+        if not candidates:
+            return []
+        slots = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+        distances = haversine_km(lat, lon, self._lats[slots], self._lons[slots])
+        order = np.argsort(distances, kind="stable")
+        if max_distance_km is not None:
+            order = order[distances[order] <= max_distance_km]
+        return [(self._ids[slots[i]], float(distances[i])) for i in order[:k]]
+
+    def _matches(self, slot: int, service_type: Optional[str], only_available: bool) -> bool:
+        """"""
+        if only_available and not self._available[slot]:
+            return False
+        return service_type is None or service_type in self._service_types[slot]
+
+    async def check_consistency(
+        self,
+        repo: TechnicianRepository,
+        lat: float,
+        lon: float,
+        k: int = 10,
+        service_type: Optional[str] = None,
+        radius_km: float = 50,
+        tolerance_km: float = 0.05
+    ) -> dict:
+        """Compare nearest() with the PostGIS search for the same query.
+
+        PostGIS measures on the spheroid and the index on a sphere, so technicians whose
+        distance is within tolerance_km of the k-th result may legitimately swap places
+        at the cut-off; only differences outside that band are reported.
+        """
+        indexed = self.nearest(lat, lon, k, service_type, only_available=True, max_distance_km=radius_km)
+        stored = await repo.search_nearby(
+            lat, lon, radius_km, service_type, only_available=True, only_verified=False, limit=k
+        )
+        indexed_ids = {tid: d for tid, d in indexed}
+        stored_ids = {t.technician_id: d for t, d in stored}
+        boundary = max([d for _, d in indexed] + [d for _, d in stored], default=0.0)
+
+        missing = [tid for tid, d in stored_ids.items() if tid not in indexed_ids and boundary - d > tolerance_km]
+        unexpected = [tid for tid, d in indexed_ids.items() if tid not in stored_ids and boundary - d > tolerance_km]
+        return {
+            "consistent": not missing and not unexpected,
+            "index": [tid for tid, _ in indexed],
+            "database": [t.technician_id for t, _ in stored],
+            "missing_from_index": missing,
+            "unexpected_in_index": unexpected,
+        }
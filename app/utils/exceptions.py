@@ -70,6 +70,16 @@ class RateLimitExceededException(JobConnectException):
         )
 
 
+class ServiceOverloadedException(JobConnectException):
+    """Raised when a bounded worker pool refuses more work"""
+    def __init__(self, detail: str = "Service is busy, try again shortly"):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=detail,
+            headers={"Retry-After": "1"}
+        )
+
+
 class DuplicateEntryException(JobConnectException):
     """"""
     def __init__(self, detail: str = "Email or phone number already exists"):
@@ -77,3 +87,57 @@ class DuplicateEntryException(JobConnectException):
             status_code=status.HTTP_429_TOO_MANY_REQUESTS,
             detail=detail,
         )
+
+
+class UpstreamServiceException(JobConnectException):
+    """Raised when an external API fails or times out"""
+    def __init__(self, detail: str = "Upstream service unavailable"):
+        super().__init__(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail=detail,
+        )
+
+
+class InvalidUploadException(JobConnectException):
+    """Raised when an uploaded file cannot be parsed at all"""
+    def __init__(self, detail: str = "Uploaded file could not be read"):
+        super().__init__(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=detail,
+        )
+
+
+class InvalidCursorException(JobConnectException):
+    """Raised when a pagination cursor cannot be decoded"""
+    def __init__(self, detail: str = "Invalid pagination cursor"):
+        super().__init__(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=detail,
+        )
+
+
+class BookingConflictException(JobConnectException):
+    """Raised when a booking overlaps another active booking of the same technician"""
+    def __init__(self, detail: str = "Technician is already booked for that time"):
+        super().__init__(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=detail,
+        )
+
+
+class InvalidBookingPeriodException(JobConnectException):
+    """Raised when a booking does not end after it starts"""
+    def __init__(self, detail: str = "Booking end_date must be after start_date"):
+        super().__init__(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=detail,
+        )
+
+
+class InvalidTimeWindowException(JobConnectException):
+    """Raised when a requested time window is empty or too long"""
+    def __init__(self, detail: str = "Invalid time window"):
+        super().__init__(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=detail,
+        )
@@ -0,0 +1,80 @@
+import csv
+import io
+import json
+from contextlib import aclosing
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, AsyncIterator, List
+
+from asyncpg import Record
+from fastapi.responses import StreamingResponse
+
+from app.config import settings
+
+DEFAULT_EXPORT_CHUNK_SIZE: int = settings.EXPORT_CHUNK_SIZE
+
+
+class ExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv",
+}
+
+
+def _to_text(value: Any) -> Any:
+    """"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    return str(value)
+
+
+def _ndjson_chunk(rows: List[Record]) -> bytes:
+    """"""
+    return "".join(
+        json.dumps(dict(row), default=_to_text, separators=(",", ":")) + "\n"
+        for row in rows
+    ).encode()
+
+
+def _csv_chunk(rows: List[Record], header: bool) -> bytes:
+    """"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(rows[0].keys())
+    writer.writerows(
+        ["" if v is None else (v if isinstance(v, (int, float)) else _to_text(v)) for v in row.values()]
+        for row in rows
+    )
+    return buffer.getvalue().encode()
+
+
+async def encode_export(chunks: AsyncIterator[List[Record]], fmt: ExportFormat) -> AsyncIterator[bytes]:
+    """Encode record chunks as NDJSON or CSV, one output chunk per fetched chunk.
+
+    The source iterator is closed as soon as this one is, so a client disconnecting
+    mid-export releases the cursor and its connection straight away.
+    """
+    async with aclosing(chunks):
+        first: bool = True
+        async for rows in chunks:
+            if fmt is ExportFormat.CSV:
+                yield _csv_chunk(rows, header=first)
+            else:
+                yield _ndjson_chunk(rows)
+            first = False
+
+
+def export_response(content: AsyncIterator[bytes], fmt: ExportFormat, name: str) -> StreamingResponse:
+    """"""
+    return StreamingResponse(
+        content,
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{fmt.value}"'}
+    )
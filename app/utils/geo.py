@@ -0,0 +1,103 @@
+from typing import Final, Optional, Tuple
+
+import math
+
+import numpy as np
+
+EARTH_RADIUS_KM: Final[float] = 6371.0
+KM_PER_DEGREE: Final[float] = math.pi * EARTH_RADIUS_KM / 180
+
+_GEOHASH_ALPHABET: Final[str] = "0123456789bcdefghjkmnpqrstuvwxyz"
+_GEOHASH_INDEX: Final[dict] = {c: i for i, c in enumerate(_GEOHASH_ALPHABET)}
+
+
+def geohash_encode(lat: float, lon: float, precision: int = 6) -> str:
+    """Encode a point as a geohash cell of the given length."""
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    chars: list = []
+    bits: int = 0
+    bit_count: int = 0
+    even: bool = True
+
+    while len(chars) < precision:
+        rng, value = (lon_range, lon) if even else (lat_range, lat)
+        mid = (rng[0] + rng[1]) / 2
+        if value >= mid:
+            bits = (bits << 1) | 1
+            rng[0] = mid
+        else:
+            bits <<= 1
+            rng[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(_GEOHASH_ALPHABET[bits])
+            bits = 0
+            bit_count = 0
+
+    return "".join(chars)
+
+
+def geohash_bounds(geohash: str) -> Tuple[float, float, float, float]:
+    """Return (min_lat, min_lon, max_lat, max_lon) of a geohash cell."""
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    even: bool = True
+
+    for char in geohash:
+        value = _GEOHASH_INDEX[char]
+        for shift in range(4, -1, -1):
+            rng = lon_range if even else lat_range
+            mid = (rng[0] + rng[1]) / 2
+            if (value >> shift) & 1:
+                rng[0] = mid
+            else:
+                rng[1] = mid
+            even = not even
+
+    return lat_range[0], lon_range[0], lat_range[1], lon_range[1]
+
+
+def geohash_cell_half_diagonal_km(precision: int) -> float:
+    """Upper bound on the distance from any point in a cell of this length to its centre.
+
+    Cells are widest in km at the equator, so that width is used everywhere.
+    """
+    lon_bits = (5 * precision + 1) // 2
+    lat_bits = 5 * precision // 2
+    width_km = 360.0 / 2 ** lon_bits * KM_PER_DEGREE
+    height_km = 180.0 / 2 ** lat_bits * KM_PER_DEGREE
+    return math.hypot(width_km, height_km) / 2
+
+
+def geohash_center(geohash: str) -> Tuple[float, float]:
+    """Return the (lat, lon) centre of a geohash cell."""
+    min_lat, min_lon, max_lat, max_lon = geohash_bounds(geohash)
+    return (min_lat + max_lat) / 2, (min_lon + max_lon) / 2
+
+
+def haversine_km(lat: float, lon: float, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+    """Great-circle distance in km from (lat, lon) to every point in (lats, lons)."""
+    lat1 = np.radians(lat)
+    lats2 = np.radians(np.asarray(lats, dtype=np.float64))
+    dlat = lats2 - lat1
+    dlon = np.radians(np.asarray(lons, dtype=np.float64) - lon)
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat1) * np.cos(lats2) * np.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def rank_by_distance(
+    lat: float,
+    lon: float,
+    lats: np.ndarray,
+    lons: np.ndarray,
+    max_distance_km: Optional[float] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Return (distances, order): distances for every candidate and the indices of the
+    candidates within max_distance_km, nearest first. Ties keep their input order."""
+    distances = haversine_km(lat, lon, lats, lons)
+    order = np.argsort(distances, kind="stable")
+    if max_distance_km is not None:
+        order = order[distances[order] <= max_distance_km]
+    return distances, order
@@ -0,0 +1,96 @@
+"""Measure password hash cost on this host and recommend parameters for a target latency.
+
+Run from the project root: python -m app.utils.hash_calibration --target-ms 100
+"""
+import argparse
+import os
+import time
+from typing import Callable, List, Optional, Tuple
+
+from passlib.exc import MissingBackendError
+from passlib.hash import argon2, bcrypt
+
+from app.config import settings
+
+SAMPLE_PASSWORD: str = "calibration-password-123"
+BCRYPT_ROUNDS_RANGE: range = range(4, 17)
+ARGON2_TIME_COST_RANGE: range = range(1, 11)
+
+
+def time_verify(hasher, samples: int) -> float:
+    """Median milliseconds for one verification with the given handler configuration."""
+    digest: str = hasher.hash(SAMPLE_PASSWORD)
+    timings: List[float] = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        hasher.verify(SAMPLE_PASSWORD, digest)
+        timings.append((time.perf_counter() - start) * 1e3)
+    timings.sort()
+    return timings[len(timings) // 2]
+
+
+def calibrate(
+    candidates: range,
+    configure: Callable[[int], object],
+    target_ms: float,
+    samples: int
+) -> Tuple[Optional[int], List[Tuple[int, float]]]:
+    """Largest cost whose verification stays within target_ms; stops once a cost overshoots."""
+    measured: List[Tuple[int, float]] = []
+    best: Optional[int] = None
+    for cost in candidates:
+        ms = time_verify(configure(cost), samples)
+        measured.append((cost, ms))
+        if ms > target_ms:
+            break
+        best = cost
+    return best, measured
+
+
+def report(name: str, setting: str, best: Optional[int], measured: List[Tuple[int, float]], current: int) -> None:
+    """"""
+    print(f"\n{name}")
+    print(f"{'cost':>6} {'verify (ms)':>12} {'per worker/s':>13}")
+    for cost, ms in measured:
+        marker = "  <- current" if cost == current else ""
+        print(f"{cost:>6} {ms:>12.1f} {1000 / ms:>13.1f}{marker}")
+    if best is None:
+        print(f"  even the cheapest cost exceeds the target; use {setting}={measured[0][0]} or add hardware")
+    else:
+        print(f"  recommended: {setting}={best}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--target-ms", type=float, default=100.0, help="target latency per verification")
+    parser.add_argument("--samples", type=int, default=5, help="verifications timed per cost")
+    args = parser.parse_args()
+
+    workers: int = min(settings.PASSWORD_HASH_WORKERS, os.cpu_count() or 1)
+    print(f"target {args.target_ms:.0f} ms per verification, {workers} effective hashing workers")
+
+    best, measured = calibrate(
+        BCRYPT_ROUNDS_RANGE, lambda rounds: bcrypt.using(rounds=rounds), args.target_ms, args.samples
+    )
+    report("bcrypt", "BCRYPT_ROUNDS", best, measured, settings.BCRYPT_ROUNDS)
+    if best is not None:
+        ms = dict(measured)[best]
+        print(f"  node capacity at that cost: ~{workers * 1000 / ms:.0f} logins/s")
+
+    try:
+        best, measured = calibrate(
+            ARGON2_TIME_COST_RANGE,
+            lambda t: argon2.using(time_cost=t, memory_cost=settings.ARGON2_MEMORY_COST_KIB, parallelism=4),
+            args.target_ms,
+            args.samples
+        )
+        report(
+            f"argon2 (memory {settings.ARGON2_MEMORY_COST_KIB} KiB)",
+            "ARGON2_TIME_COST", best, measured, settings.ARGON2_TIME_COST
+        )
+    except MissingBackendError:
+        print("\nargon2: no backend installed, skipped")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+import re
+from collections import namedtuple
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type, TypeVar
+
+from asyncpg import Record
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+
+M = TypeVar("M", bound=BaseModel)
+
+
+def _nullable(convert: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    """"""
+    return lambda value: None if value is None else convert(value)
+
+
+def record_mapper(
+    model: Type[M],
+    derived: Optional[Dict[str, Callable[[Record], Any]]] = None,
+    **converters: Callable[[Any], Any]
+) -> Callable[[Record], M]:
+    """Compile a Record -> model function that skips validation, for rows from our own schema.
+
+    Every model field is read from the record column of the same name, except the derived
+    fields, which are computed from the whole record (e.g. latitude off a location column).
+    converters adapt the few values asyncpg returns as a different type than the model
+    declares (uuid -> str, Decimal -> float, text -> enum); NULLs pass through unconverted.
+    The instance is then assembled the way model_construct does it, minus the per-call
+    field and default lookups.
+    """
+    derived = derived or {}
+    names = tuple(model.model_fields)
+    unknown = (set(converters) | set(derived)) - set(names)
+    if unknown:
+        raise ValueError(f"{model.__name__} has no fields {sorted(unknown)}")
+    read = tuple(name for name in names if name not in derived)
+    computed = tuple(derived.items())
+    conversions = tuple((name, _nullable(convert)) for name, convert in converters.items())
+
+    if model.__pydantic_post_init__ is not None or model.__private_attributes__:
+        def build(record: Record) -> M:
+            values = {name: record[name] for name in read}
+            for name, compute in computed:
+                values[name] = compute(record)
+            for name, convert in conversions:
+                values[name] = convert(values[name])
+            return model.model_construct(**values)
+        return build
+
+    new = model.__new__
+    set_attribute = object.__setattr__
+
+    def build(record: Record) -> M:
+        values: Dict[str, Any] = {name: record[name] for name in read}
+        for name, compute in computed:
+            values[name] = compute(record)
+        for name, convert in conversions:
+            values[name] = convert(values[name])
+        instance = new(model)
+        set_attribute(instance, "__dict__", values)
+        set_attribute(instance, "__pydantic_fields_set__", set(names))
+        set_attribute(instance, "__pydantic_extra__", None)
+        set_attribute(instance, "__pydantic_private__", None)
+        return instance
+
+    return build
+
+
+_OUTPUT_NAME = re.compile(r"(?:\bAS\s+)?\"?(\w+)\"?\s*$", re.IGNORECASE)
+
+
+def projection_columns(projection: str) -> Tuple[str, ...]:
+    """Output column names of a SELECT list such as the repositories' *_COLUMNS strings."""
+    items: List[str] = []
+    depth, start = 0, 0
+    for i, char in enumerate(projection):
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "," and depth == 0:
+            items.append(projection[start:i])
+            start = i + 1
+    items.append(projection[start:])
+
+    columns: List[str] = []
+    for item in items:
+        match = _OUTPUT_NAME.search(item.strip())
+        if match is None:
+            raise ValueError(f"Cannot name projection item '{item.strip()}'; give it an alias")
+        columns.append(match.group(1))
+    return tuple(columns)
+
+
+def row_type(name: str, projection: str, **converters: Callable[[Any], Any]) -> Type[tuple]:
+    """A named tuple class whose fields are the output columns of projection, in order.
+
+    For bulk internal work (exports, analytics, index builds) where a validated model per
+    row is wasted memory: a row costs one tuple, with no instance dict or pydantic state.
+    RowType.from_record(record) relies on the record's columns coming back in projection
+    order, which holds for every statement that selects exactly that projection.
+    """
+    fields = projection_columns(projection)
+    unknown = set(converters) - set(fields)
+    if unknown:
+        raise ValueError(f"{name} has no columns {sorted(unknown)}")
+    base = namedtuple(name, fields)
+    row_class = type(name, (base,), {"__slots__": ()})
+    make = row_class._make
+    conversions = tuple((fields.index(column), _nullable(convert)) for column, convert in converters.items())
+
+    def from_record(record: Record) -> tuple:
+        if not conversions:
+            return make(record)
+        values = list(record)
+        for position, convert in conversions:
+            values[position] = convert(values[position])
+        return make(values)
+
+    row_class.from_record = staticmethod(from_record)
+    return row_class
+
+
+@lru_cache(maxsize=None)
+def list_adapter(model: Type[BaseModel]) -> TypeAdapter:
+    """One compiled List[model] serializer per response model."""
+    return TypeAdapter(List[model])
+
+
+def model_list_response(
+    model: Type[M],
+    items: List[M],
+    headers: Optional[Dict[str, str]] = None
+) -> Response:
+    """Serialize trusted response models straight to JSON.
+
+    Returning a Response bypasses FastAPI's response_model pass, which would dump every
+    item to a dict and validate it again; the route keeps response_model for the schema.
+    """
+    return Response(
+        content=list_adapter(model).dump_json(items),
+        media_type="application/json",
+        headers=headers
+    )
@@ -0,0 +1,88 @@
+import base64
+import json
+import uuid
+from datetime import datetime
+from typing import Callable, Dict, Generic, List, NamedTuple, Optional, Sequence, TypeVar
+
+from asyncpg import Record
+
+from app.utils.exceptions import InvalidCursorException
+
+T = TypeVar("T")
+
+DEFAULT_PAGE_SIZE: int = 50
+MAX_PAGE_SIZE: int = 500
+
+
+class Page(NamedTuple, Generic[T]):
+    items: List[T]
+    next_cursor: Optional[str]
+
+
+def encode_cursor(created_at: datetime, row_id: uuid.UUID) -> str:
+    """Opaque token for the keyset position just after (created_at, row_id)."""
+    raw = json.dumps([created_at.isoformat(), str(row_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> tuple:
+    """"""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        created_at, row_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), uuid.UUID(row_id)
+    except (ValueError, TypeError):
+        raise InvalidCursorException()
+
+
+def keyset_statements(prefix: str, table: str, columns: str, id_column: str) -> Dict[str, str]:
+    """First-page and next-page statements, newest first, keyed on (created_at, id_column).
+
+    The row-value comparison lets PostgreSQL walk an index on (created_at, id_column)
+    straight to the cursor position instead of counting past an offset.
+    """
+    order: str = f"ORDER BY created_at DESC, {id_column} DESC"
+    return {
+        f"{prefix}_page_first": f"SELECT {columns} FROM {table} {order} LIMIT $1",
+        f"{prefix}_page_after": f"""
+            SELECT {columns} FROM {table}
+            WHERE (created_at, {id_column}) < ($1, $2)
+            {order} LIMIT $3
+        """,
+    }
+
+
+async def fetch_page(db, prefix: str, limit: int, after: Optional[str]) -> Sequence[Record]:
+    """Fetch up to limit + 1 rows; the extra row only signals that another page exists."""
+    if after is None:
+        return await db.fetch_named(f"{prefix}_page_first", limit + 1)
+    created_at, row_id = decode_cursor(after)
+    return await db.fetch_named(f"{prefix}_page_after", created_at, row_id, limit + 1)
+
+
+def build_page(
+    records: Sequence[Record],
+    limit: int,
+    mapper: Callable[[Record], T],
+    id_column: str
+) -> Page[T]:
+    """"""
+    next_cursor: Optional[str] = None
+    if len(records) > limit:
+        last = records[limit - 1]
+        next_cursor = encode_cursor(last["created_at"], last[id_column])
+    return Page(items=[mapper(r) for r in records[:limit]], next_cursor=next_cursor)
+
+
+NEXT_CURSOR_HEADER: str = "X-Next-Cursor"
+TOTAL_COUNT_ESTIMATE_HEADER: str = "X-Total-Count-Estimate"
+
+
+def page_headers(next_cursor: Optional[str], total_estimate: Optional[int] = None) -> Dict[str, str]:
+    """Response headers carrying the next-page cursor and, optionally, a row-count estimate."""
+    headers: Dict[str, str] = {}
+    if next_cursor is not None:
+        headers[NEXT_CURSOR_HEADER] = next_cursor
+    if total_estimate is not None:
+        headers[TOTAL_COUNT_ESTIMATE_HEADER] = str(total_estimate)
+    return headers
@@ -0,0 +1,37 @@
+"""Recompute technician_stats from the review table.
+
+The review trigger keeps technician_stats current on its own; run this after bulk
+loads with triggers disabled, after changing the rating prior, or to repair drift.
+Review writes wait while it runs.
+
+Run from the project root: python -m app.utils.rebuild_technician_stats
+"""
+import asyncio
+import time
+
+from app.config import settings
+from app.database.database import AsyncDatabase
+from app.repositories.technician import TechnicianRepository
+
+
+async def main() -> None:
+    db = AsyncDatabase(
+        host=settings.DB_HOST,
+        dbname=settings.DB_NAME,
+        username=settings.DB_USER,
+        password=settings.DB_PASSWORD,
+        port=settings.DB_PORT
+    )
+    db.register_statements(TechnicianRepository.STATEMENTS)
+    await db.connect()
+    try:
+        start = time.perf_counter()
+        technicians, reviews = await TechnicianRepository(db).rebuild_stats()
+        elapsed = time.perf_counter() - start
+    finally:
+        await db.disconnect()
+    print(f"rebuilt technician_stats: {technicians} technicians, {reviews} reviews in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
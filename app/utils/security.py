@@ -1,17 +1,105 @@
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
 from passlib.context import CryptContext
 from app.config import settings
+from app.utils.exceptions import ServiceOverloadedException
 
+# New hashes are bcrypt at BCRYPT_ROUNDS. min_rounds marks only cheaper bcrypt hashes for
+# an upgrade on login; default_rounds alone, unlike rounds, leaves costlier ones alone.
 security_context = CryptContext(
     schemes=["bcrypt", "argon2"],
-    deprecated="auto",
-    bcrypt__rounds=settings.BCRYPT_ROUNDS,
-    argon2__time_cost=3,
-    argon2__memory_cost=65536,
+    default="bcrypt",
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    argon2__time_cost=settings.ARGON2_TIME_COST,
+    argon2__memory_cost=settings.ARGON2_MEMORY_COST_KIB,
     argon2__parallelism=4,
     argon2__hash_len=32
 )
 
 
+class PasswordHasher:
+    """Runs password hashing and verification on a dedicated, size-bounded thread pool.
+
+    bcrypt and argon2 both release the GIL while hashing, so threads give real parallelism
+    without the pickling cost of a process pool. At most max_pending operations may be
+    queued or running at once; interactive calls beyond that are refused with a 503 rather
+    than queueing behind a burst, while bulk callers wait for a slot instead.
+    """
+
+    def __init__(self, max_workers: int, max_pending: int) -> None:
+        self.max_workers: int = max_workers
+        self.max_pending: int = max(max_pending, max_workers)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="password-hash")
+        self._bulk_slots = None
+        self._pending: int = 0
+        self._completed: int = 0
+        self._rejected: int = 0
+
+    async def _run(self, fn: Callable[..., Any], *args) -> Any:
+        """"""
+        self._pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+        finally:
+            self._pending -= 1
+            self._completed += 1
+
+    async def submit(self, fn: Callable[..., Any], *args) -> Any:
+        """Run fn on the pool, or raise ServiceOverloadedException if the pool is saturated."""
+        if self._pending >= self.max_pending:
+            self._rejected += 1
+            raise ServiceOverloadedException()
+        return await self._run(fn, *args)
+
+    async def map(self, fn: Callable[..., Any], items: List[Any]) -> List[Any]:
+        """Run fn over items without rejection, keeping at most max_workers of them in the pool.
+
+        Capping bulk work at one item per worker leaves the rest of max_pending free for
+        interactive calls, which then wait behind at most one bulk hash per worker.
+        """
+        if self._bulk_slots is None:
+            self._bulk_slots = asyncio.Semaphore(self.max_workers)
+
+        async def run_one(item: Any) -> Any:
+            async with self._bulk_slots:
+                return await self._run(fn, item)
+
+        return list(await asyncio.gather(*(run_one(item) for item in items)))
+
+    def stats(self) -> Dict[str, int]:
+        """"""
+        return {
+            "workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "in_flight": self._pending,
+            "queued": max(0, self._pending - self.max_workers),
+            "completed": self._completed,
+            "rejected": self._rejected,
+        }
+
+    def shutdown(self) -> None:
+        """"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+password_hasher = PasswordHasher(settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_MAX_PENDING)
+
+LOGGER = logging.getLogger(__name__)
+
+_rehash_writes: Set[asyncio.Task] = set()
+
+
+def _rehash_written(task: asyncio.Task) -> None:
+    """"""
+    _rehash_writes.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        LOGGER.warning(f"COULD NOT STORE UPGRADED PASSWORD HASH: {repr(task.exception())}")
+
+
 class SecurityUtils:
     
     @staticmethod
@@ -23,3 +111,42 @@ class SecurityUtils:
     def verify_password(password: str, hashed_password: str) -> bool:
         """"""
         return security_context.verify(password, hashed_password)
+
+    @staticmethod
+    async def hash_password_async(password: str) -> str:
+        """hash_password on the password hashing pool; keeps the event loop free."""
+        return await password_hasher.submit(SecurityUtils.hash_password, password)
+
+    @staticmethod
+    async def verify_password_async(password: str, hashed_password: str) -> bool:
+        """verify_password on the password hashing pool; keeps the event loop free."""
+        return await password_hasher.submit(SecurityUtils.verify_password, password, hashed_password)
+
+    @staticmethod
+    def verify_and_update(password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """Verify, and return a replacement hash when the stored one is bcrypt below BCRYPT_ROUNDS.
+
+        argon2 hashes are never replaced: passlib would flag any whose parameters differ
+        from the configured ones and rehash them as bcrypt, a weaker scheme.
+        """
+        valid, new_hash = security_context.verify_and_update(password, hashed_password)
+        if new_hash is not None and security_context.identify(hashed_password) != security_context.default_scheme():
+            new_hash = None
+        return valid, new_hash
+
+    @staticmethod
+    async def verify_and_update_async(password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """"""
+        return await password_hasher.submit(SecurityUtils.verify_and_update, password, hashed_password)
+
+    @staticmethod
+    def write_back_rehash(write: Awaitable[Any]) -> None:
+        """Store an upgraded hash in the background so the login response is not delayed."""
+        task = asyncio.ensure_future(write)
+        _rehash_writes.add(task)
+        task.add_done_callback(_rehash_written)
+
+    @staticmethod
+    async def hash_passwords(passwords: List[str]) -> List[str]:
+        """Hash many passwords for bulk work; waits for pool capacity instead of failing."""
+        return await password_hasher.map(SecurityUtils.hash_password, passwords)
@@ -0,0 +1,106 @@
+"""Concurrent double-booking race against the booking_no_overlap exclusion constraint.
+
+For each slot, CONCURRENCY clients try to book the same technician for overlapping
+times at once; exactly one may win. Needs the migrated database from .env. A throwaway
+client and technician are created and deleted again, with their bookings.
+
+Run from the project root: python -m benchmarks.booking_race
+"""
+import asyncio
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from app.config import settings
+from app.database.database import AsyncDatabase, PoolConfig, INTERACTIVE
+from app.database.geography import GeoPoint
+from app.repositories.booking import BookingRepository
+from app.schemas.booking import BookingCreate, BookingStatus
+from app.utils.exceptions import BookingConflictException
+
+SLOTS: int = 50
+CONCURRENCY: int = 20
+
+CREATE_CLIENT: str = """
+INSERT INTO client (name, surname, email, phone_number, password_hash, location_name, location)
+VALUES ('Race', 'Client', $1, $2, 'x', 'Pretoria', $3)
+RETURNING client_id
+"""
+CREATE_TECHNICIAN: str = """
+INSERT INTO technician (
+    name, surname, email, phone_number, password_hash, location_name, location, service_types
+)
+VALUES ('Race', 'Technician', $1, $2, 'x', 'Pretoria', $3, ARRAY['plumbing'])
+RETURNING technician_id
+"""
+
+
+def booking(client_id: str, technician_id: str, start: datetime, attempt: int) -> BookingCreate:
+    """Every attempt for a slot overlaps the others by at least 30 minutes."""
+    offset = timedelta(minutes=attempt % 30)
+    return BookingCreate(
+        client_id=client_id,
+        technician_id=technician_id,
+        service_type="plumbing",
+        description="race",
+        price=100.0,
+        status=BookingStatus.PENDING,
+        start_date=start + offset,
+        end_date=start + offset + timedelta(hours=1)
+    )
+
+
+async def attempt(repo: BookingRepository, data: BookingCreate) -> bool:
+    """"""
+    try:
+        await repo.create(data)
+        return True
+    except BookingConflictException:
+        return False
+
+
+async def main() -> None:
+    db = AsyncDatabase(
+        host=settings.DB_HOST,
+        dbname=settings.DB_NAME,
+        username=settings.DB_USER,
+        password=settings.DB_PASSWORD,
+        port=settings.DB_PORT,
+        pools={INTERACTIVE: PoolConfig(CONCURRENCY, CONCURRENCY)}
+    )
+    db.register_statements(BookingRepository.STATEMENTS)
+    await db.connect()
+    repo = BookingRepository(db)
+    tag = uuid.uuid4().hex[:8]
+    phone = str(uuid.uuid4().int)[:10]
+    client_id = str(await db.fetchval(CREATE_CLIENT, f"race-{tag}@example.com", phone, GeoPoint(28.2, -25.7)))
+    technician_id = str(await db.fetchval(
+        CREATE_TECHNICIAN, f"race-{tag}@example.com", phone, GeoPoint(28.2, -25.7)
+    ))
+    try:
+        wins = conflicts = double_booked = 0
+        base = datetime(2030, 1, 1, 8)
+        start = time.perf_counter()
+        for slot in range(SLOTS):
+            slot_start = base + timedelta(hours=2 * slot)
+            results = await asyncio.gather(*(
+                attempt(repo, booking(client_id, technician_id, slot_start, i)) for i in range(CONCURRENCY)
+            ))
+            wins += sum(results)
+            conflicts += len(results) - sum(results)
+            double_booked += sum(results) > 1
+        elapsed = time.perf_counter() - start
+
+        print(f"{SLOTS} slots x {CONCURRENCY} concurrent attempts in {elapsed:.2f}s "
+              f"({SLOTS * CONCURRENCY / elapsed:,.0f} attempts/s)")
+        print(f"booked {wins}, rejected {conflicts}, double-booked slots {double_booked}")
+        free = await repo.technician_is_free(technician_id, base, base + timedelta(minutes=5))
+        print(f"technician_is_free on a booked slot: {free}")
+    finally:
+        await db.execute("DELETE FROM technician WHERE technician_id = $1", uuid.UUID(technician_id))
+        await db.execute("DELETE FROM client WHERE client_id = $1", uuid.UUID(client_id))
+        await db.disconnect()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
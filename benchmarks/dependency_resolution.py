@@ -0,0 +1,80 @@
+"""Per-request cost of the old get_db -> repository -> service chain vs the app container.
+
+Run from the project root: python -m benchmarks.dependency_resolution
+"""
+import asyncio
+import time
+
+import httpx
+from fastapi import Depends, FastAPI, Request
+
+from app.repositories.booking import BookingRepository
+from app.services.booking import BookingService
+
+REQUESTS: int = 5_000
+
+
+class FakeContainer:
+    def __init__(self, db: object) -> None:
+        self.booking_service = BookingService(BookingRepository(db))
+
+
+async def get_db(request: Request) -> object:
+    return request.app.state.db
+
+
+async def get_booking_repository(db: object = Depends(get_db)) -> BookingRepository:
+    return BookingRepository(db)
+
+
+async def get_chained_service(repo: BookingRepository = Depends(get_booking_repository)) -> BookingService:
+    return BookingService(repo)
+
+
+async def get_container_service(request: Request) -> BookingService:
+    return request.app.state.container.booking_service
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+    app.state.db = object()
+    app.state.container = FakeContainer(app.state.db)
+
+    @app.get("/none")
+    async def no_dependency() -> dict:
+        return {}
+
+    @app.get("/chain")
+    async def chained(service: BookingService = Depends(get_chained_service)) -> dict:
+        return {}
+
+    @app.get("/container")
+    async def container(service: BookingService = Depends(get_container_service)) -> dict:
+        return {}
+
+    return app
+
+
+async def microseconds_per_request(client: httpx.AsyncClient, path: str) -> float:
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(REQUESTS):
+            await client.get(path)
+        best = min(best, time.perf_counter() - start)
+    return best / REQUESTS * 1e6
+
+
+async def main() -> None:
+    transport = httpx.ASGITransport(app=build_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        baseline = await microseconds_per_request(client, "/none")
+        print(f"{'dependency':>10} {'us/request':>11} {'over baseline':>14}")
+        print(f"{'none':>10} {baseline:>11.1f} {'-':>14}")
+        for path in ("chain", "container"):
+            us = await microseconds_per_request(client, f"/{path}")
+            print(f"{path:>10} {us:>11.1f} {us - baseline:>14.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
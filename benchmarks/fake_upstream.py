@@ -0,0 +1,83 @@
+"""A stand-in for the Google Places Nearby and Geolocation APIs, as a bare ASGI app.
+
+Mount it in-process with httpx.ASGITransport(FakeUpstream()), or serve it on a local
+socket with uvicorn to exercise the real connection pool. It records what a tuning
+session needs: requests served, the peak number handled at once, and the client
+(host, port) pairs seen, one per TCP connection the caller opened.
+
+Used by python -m benchmarks.search_upstream.
+"""
+import asyncio
+import json
+import math
+from typing import Any, Dict, List, Set, Tuple
+from urllib.parse import parse_qs
+
+PLACES_PATH: str = "/maps/api/place/nearbysearch/json"
+GEOLOCATION_PATH: str = "/geolocation/v1/geolocate"
+
+
+class FakeUpstream:
+    """ASGI app answering Places Nearby with `results` shops spread around the query point."""
+
+    def __init__(self, results: int = 20, delay_seconds: float = 0.0) -> None:
+        self.results = results
+        self.delay_seconds = delay_seconds
+        self.requests: int = 0
+        self.in_flight: int = 0
+        self.peak_in_flight: int = 0
+        self.clients: Set[Tuple[str, int]] = set()
+
+    def reset(self) -> None:
+        """"""
+        self.requests = self.in_flight = self.peak_in_flight = 0
+        self.clients.clear()
+
+    def _places(self, query: Dict[str, List[str]]) -> Dict[str, Any]:
+        """"""
+        lat, lon = (float(v) for v in query["location"][0].split(","))
+        radius_km = float(query.get("radius", ["1000"])[0]) / 1000
+        keyword = query.get("keyword", [""])[0]
+        results = []
+        for i in range(self.results):
+            # A spiral out to the search radius, so distances and trimming are exercised
+            angle = i * 2.39996
+            reach_km = radius_km * math.sqrt((i + 0.5) / self.results)
+            results.append({
+                "name": f"{keyword.title()} {i}",
+                "vicinity": f"{i} Fake Street",
+                "rating": round(3 + (i % 20) / 10, 1),
+                "geometry": {"location": {
+                    "lat": lat + reach_km * math.cos(angle) / 111.195,
+                    "lng": lon + reach_km * math.sin(angle) / (111.195 * math.cos(math.radians(lat))),
+                }},
+            })
+        return {"status": "OK" if results else "ZERO_RESULTS", "results": results}
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            return
+        self.requests += 1
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        if scope.get("client"):
+            self.clients.add(tuple(scope["client"]))
+        try:
+            if self.delay_seconds:
+                await asyncio.sleep(self.delay_seconds)
+            query = parse_qs(scope["query_string"].decode())
+            if scope["path"] == PLACES_PATH:
+                status, body = 200, self._places(query)
+            elif scope["path"] == GEOLOCATION_PATH:
+                status, body = 200, {"location": {"lat": -25.7479, "lng": 28.2293}, "accuracy": 50}
+            else:
+                status, body = 404, {"error": "not found"}
+            payload = json.dumps(body).encode()
+            await send({
+                "type": "http.response.start",
+                "status": status,
+                "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(payload)).encode())],
+            })
+            await send({"type": "http.response.body", "body": payload})
+        finally:
+            self.in_flight -= 1
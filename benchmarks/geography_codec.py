@@ -0,0 +1,105 @@
+"""Rows/sec of TechnicianRepository.get_all with ST_X/ST_Y projections vs the binary geography codec.
+
+Needs the PostGIS database from .env; the rows live in a temp table, so nothing is written.
+
+Run from the project root: python -m benchmarks.geography_codec
+"""
+import asyncio
+import time
+
+import asyncpg
+
+from app.config import settings
+from app.database.geography import register_geography_codec
+from app.repositories.technician import TECHNICIAN_COLUMNS, TechnicianRepository
+from app.schemas.technician import TechnicianInDB
+
+ROWS: int = 50_000
+ROUNDS: int = 5
+
+# What TECHNICIAN_COLUMNS projected before the codec
+LEGACY_COLUMNS: str = TECHNICIAN_COLUMNS.replace(
+    "location,", "ST_X(location::geometry) AS longitude, ST_Y(location::geometry) AS latitude,"
+)
+
+CREATE_TABLE: str = f"""
+CREATE TEMP TABLE bench_technician AS
+SELECT
+    gen_random_uuid() AS technician_id,
+    'Thabo'::varchar(50) AS name,
+    'Mokoena'::varchar(50) AS surname,
+    'tech' || i || '@example.com' AS email,
+    lpad(i::text, 10, '0') AS phone_number,
+    '$2b$05$' || repeat('x', 53) AS password_hash,
+    'Soshanguve' AS location_name,
+    ST_SetSRID(ST_MakePoint(28 + random(), -25 - random()), 4326)::geography AS location,
+    ARRAY['plumbing', 'electrical'] AS service_types,
+    i % 2 = 0 AS is_verified,
+    (i % 30)::numeric AS experience_years,
+    TRUE AS is_available,
+    NOW() AS created_at
+FROM generate_series(1, {ROWS}) AS i
+"""
+
+
+def legacy_record_to_technician(record: asyncpg.Record) -> TechnicianInDB:
+    """TechnicianRepository.record_to_technician as it was with float columns."""
+    return TechnicianInDB(
+        name=record["name"],
+        surname=record["surname"],
+        email=record["email"],
+        phone_number=record["phone_number"],
+        location_name=record["location_name"],
+        latitude=record["latitude"],
+        longitude=record["longitude"],
+        service_types=record["service_types"],
+        is_verified=record["is_verified"],
+        technician_id=str(record["technician_id"]),
+        password_hash=record["password_hash"],
+        created_at=record["created_at"],
+        is_available=record["is_available"],
+        experience_years=record["experience_years"]
+    )
+
+
+async def rows_per_second(conn: asyncpg.Connection, query: str, mapper) -> tuple:
+    """Best of ROUNDS for fetch alone and for fetch + mapping, as rows/sec."""
+    best_fetch = best_total = float("inf")
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        records = await conn.fetch(query)
+        fetched = time.perf_counter()
+        [mapper(r) for r in records]
+        best_fetch = min(best_fetch, fetched - start)
+        best_total = min(best_total, time.perf_counter() - start)
+    return ROWS / best_fetch, ROWS / best_total
+
+
+async def main() -> None:
+    conn = await asyncpg.connect(
+        host=settings.DB_HOST,
+        database=settings.DB_NAME,
+        user=settings.DB_USER,
+        password=settings.DB_PASSWORD,
+        port=settings.DB_PORT
+    )
+    try:
+        await conn.execute(CREATE_TABLE)
+        before = await rows_per_second(
+            conn, f"SELECT {LEGACY_COLUMNS} FROM bench_technician", legacy_record_to_technician
+        )
+        await register_geography_codec(conn)
+        after = await rows_per_second(
+            conn, f"SELECT {TECHNICIAN_COLUMNS} FROM bench_technician", TechnicianRepository.record_to_technician
+        )
+    finally:
+        await conn.close()
+
+    print(f"{ROWS:,} technicians, best of {ROUNDS}")
+    print(f"{'projection':>12} {'fetch rows/s':>13} {'get_all rows/s':>15}")
+    for name, (fetch, total) in (("ST_X/ST_Y", before), ("codec", after)):
+        print(f"{name:>12} {fetch:>13,.0f} {total:>15,.0f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
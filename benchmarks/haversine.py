@@ -0,0 +1,39 @@
+"""Scalar vs vectorized distance ranking.
+
+Run from the project root: python -m benchmarks.haversine
+"""
+import timeit
+
+import numpy as np
+
+from app.services.search_technician import SearchService
+from app.utils.geo import haversine_km, rank_by_distance
+
+ORIGIN = (-25.5214, 28.0983)
+SIZES = (10, 1_000, 100_000)
+
+
+def scalar_rank(lat: float, lon: float, lats: list, lons: list) -> list:
+    distances = [SearchService._haversine(lat, lon, la, lo) for la, lo in zip(lats, lons)]
+    return sorted(range(len(distances)), key=distances.__getitem__)
+
+
+def main() -> None:
+    rng = np.random.default_rng(42)
+    print(f"{'points':>8} {'scalar (ms)':>12} {'numpy (ms)':>12} {'speed-up':>9}")
+    for size in SIZES:
+        lats = ORIGIN[0] + rng.uniform(-0.5, 0.5, size)
+        lons = ORIGIN[1] + rng.uniform(-0.5, 0.5, size)
+        lat_list, lon_list = lats.tolist(), lons.tolist()
+
+        reference = np.array([SearchService._haversine(*ORIGIN, la, lo) for la, lo in zip(lat_list, lon_list)])
+        assert np.allclose(reference, haversine_km(*ORIGIN, lats, lons), atol=1e-9)
+
+        number = max(1, 100_000 // size)
+        scalar = min(timeit.repeat(lambda: scalar_rank(*ORIGIN, lat_list, lon_list), number=number, repeat=5)) / number
+        vector = min(timeit.repeat(lambda: rank_by_distance(*ORIGIN, lats, lons), number=number, repeat=5)) / number
+        print(f"{size:>8} {scalar * 1e3:>12.3f} {vector * 1e3:>12.3f} {scalar / vector:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
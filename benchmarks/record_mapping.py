@@ -0,0 +1,88 @@
+"""Validated vs trusted row mapping for a technician list response.
+
+Run from the project root: python -m benchmarks.record_mapping
+"""
+import asyncio
+import json
+import time
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import List
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.database.geography import GeoPoint
+from app.repositories.technician import TechnicianRepository
+from app.schemas.technician import TechnicianResponse
+from app.services.technician import TECHNICIAN_RESPONSE_MAPPER, TechnicianService
+from app.utils.mapping import list_adapter
+
+SIZES = (50, 500, 5_000)
+
+
+def make_rows(count: int) -> List[dict]:
+    """Dicts standing in for asyncpg Records: same column names and Python types."""
+    return [
+        {
+            "technician_id": uuid.uuid4(),
+            "name": "Thabo",
+            "surname": "Mokoena",
+            "email": f"tech{i}@example.com",
+            "phone_number": f"07{i:08d}",
+            "password_hash": "$2b$05$" + "x" * 53,
+            "location_name": "Soshanguve",
+            "location": GeoPoint(28.0983 + i * 1e-5, -25.5214 + i * 1e-5),
+            "service_types": ["plumbing", "electrical"],
+            "is_verified": bool(i % 2),
+            "is_available": True,
+            "experience_years": Decimal(i % 30),
+            "created_at": datetime(2025, 1, 1, tzinfo=timezone.utc),
+            "review_count": i % 40,
+            "average_rating": 4.25 if i % 40 else None,
+            "rating_histogram": [0, 1, 2, 3, i % 40 - 6] if i % 40 > 6 else [0] * 5,
+            "rating_score": 4.1,
+        }
+        for i in range(count)
+    ]
+
+
+async def validated(rows: List[dict], field) -> bytes:
+    """Record -> InDB -> Response, then FastAPI's response_model validation and JSON render."""
+    items = [
+        TechnicianService.technician_in_db_to_response(TechnicianRepository.record_to_technician(r))
+        for r in rows
+    ]
+    content = await serialize_response(field=field, response_content=items)
+    return JSONResponse(content).body
+
+
+async def trusted(rows: List[dict], field) -> bytes:
+    """Record -> Response without validation, serialized by the cached TypeAdapter."""
+    return list_adapter(TechnicianResponse).dump_json([TECHNICIAN_RESPONSE_MAPPER(r) for r in rows])
+
+
+async def rows_per_second(fn, rows: List[dict], field) -> float:
+    best = float("inf")
+    for _ in range(5):
+        start = time.perf_counter()
+        await fn(rows, field)
+        best = min(best, time.perf_counter() - start)
+    return len(rows) / best
+
+
+async def main() -> None:
+    field = create_model_field(name="Response", type_=List[TechnicianResponse], mode="serialization")
+    print(f"{'rows':>6} {'validated rows/s':>17} {'trusted rows/s':>15} {'speed-up':>9}")
+    for size in SIZES:
+        rows = make_rows(size)
+        assert json.loads(await validated(rows, field)) == json.loads(await trusted(rows, field))
+        before = await rows_per_second(validated, rows, field)
+        after = await rows_per_second(trusted, rows, field)
+        print(f"{size:>6} {before:>17,.0f} {after:>15,.0f} {after / before:>8.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
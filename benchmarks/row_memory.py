@@ -0,0 +1,98 @@
+"""Memory and build time of pydantic *InDB models vs compact row tuples.
+
+Run from the project root: python -m benchmarks.row_memory
+"""
+import gc
+import time
+import tracemalloc
+import uuid
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Callable, Iterator, Tuple
+
+from app.repositories.booking import BOOKING_COLUMNS, BookingRepository, BookingRow
+from app.repositories.payment import PAYMENT_COLUMNS, PaymentRepository, PaymentRow
+from app.utils.mapping import projection_columns
+
+COUNT: int = 100_000
+
+
+class FakeRecord(tuple):
+    """Tuple with asyncpg.Record's by-name lookup, so both mappers can read it."""
+    __slots__ = ()
+    positions: dict = {}
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            key = self.positions[key]
+        return tuple.__getitem__(self, key)
+
+
+def record_class(projection: str) -> type:
+    names = projection_columns(projection)
+    return type("Record", (FakeRecord,), {"__slots__": (), "positions": {n: i for i, n in enumerate(names)}})
+
+
+def booking_records(count: int) -> Iterator[FakeRecord]:
+    Record = record_class(BOOKING_COLUMNS)
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    return (
+        Record((
+            uuid.uuid4(), uuid.uuid4(), uuid.uuid4(), "plumbing", "Leaking geyser in the roof",
+            Decimal("450.00"), "completed", start + timedelta(hours=i), start + timedelta(hours=i + 2),
+            start + timedelta(minutes=i)
+        ))
+        for i in range(count)
+    )
+
+
+def payment_records(count: int) -> Iterator[FakeRecord]:
+    Record = record_class(PAYMENT_COLUMNS)
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    return (
+        Record((
+            uuid.uuid4(), uuid.uuid4(), uuid.uuid4(), uuid.uuid4(), Decimal("450.00"), "card",
+            "completed", start + timedelta(minutes=i), start + timedelta(minutes=i)
+        ))
+        for i in range(count)
+    )
+
+
+def retained_mib(mapper: Callable, records: Callable[[int], Iterator[FakeRecord]]) -> float:
+    """MiB kept alive by the mapped list.
+
+    Records are generated one at a time and dropped once mapped, as with a fetched page
+    that goes out of scope, so only what the mapped objects keep alive is counted.
+    """
+    gc.collect()
+    tracemalloc.start()
+    rows = [mapper(r) for r in records(COUNT)]
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del rows
+    return retained / 2**20
+
+
+def build_seconds(mapper: Callable, records: Callable[[int], Iterator[FakeRecord]]) -> float:
+    """Seconds to map COUNT already-fetched records."""
+    fetched = list(records(COUNT))
+    start = time.perf_counter()
+    [mapper(r) for r in fetched]
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    cases = (
+        ("booking", booking_records, BookingRepository.record_to_booking, BookingRow.from_record),
+        ("payment", payment_records, PaymentRepository.record_to_payment, PaymentRow.from_record),
+    )
+    print(f"{COUNT:,} rows; memory is everything the mapped list keeps alive")
+    print(f"{'table':>8} {'path':>9} {'MiB':>8} {'bytes/row':>10} {'seconds':>8}")
+    for table, records, model_mapper, row_mapper in cases:
+        for path, mapper in (("pydantic", model_mapper), ("row", row_mapper)):
+            mib, seconds = retained_mib(mapper, records), build_seconds(mapper, records)
+            print(f"{table:>8} {path:>9} {mib:>8.1f} {mib * 2**20 / COUNT:>10.0f} {seconds:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
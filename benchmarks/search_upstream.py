@@ -0,0 +1,96 @@
+"""SearchService against a local fake upstream: pooling, keep-alive, concurrency cap and timeout.
+
+1. In-process through httpx.ASGITransport: the full search path (cache, parsing,
+   distance trimming) with no network at all.
+2. Over a local socket served by uvicorn, with the client build_upstream_client makes
+   for the app: how many TCP connections a burst opens (keep-alive reuse), the peak
+   concurrency the upstream sees (SEARCH_MAX_CONCURRENCY / HTTP_MAX_CONNECTIONS), and
+   that a slow upstream surfaces as UpstreamServiceException after the timeout.
+
+Needs no database or API key.
+
+Run from the project root: python -m benchmarks.search_upstream
+"""
+import asyncio
+import time
+
+import httpx
+import uvicorn
+
+from app.config import settings
+from app.schemas.search_technician import SearchParameters
+from app.services.search_cache import SearchResultCache
+from app.services.search_technician import SearchService, build_upstream_client
+from app.utils.exceptions import UpstreamServiceException
+from benchmarks.fake_upstream import PLACES_PATH, FakeUpstream
+
+BURST: int = 200
+UPSTREAM_DELAY_SECONDS: float = 0.02
+ORIGIN = (-25.7479, 28.2293)
+
+
+def params(i: int) -> SearchParameters:
+    """A distinct keyword per call, so every call misses the cache and reaches the upstream."""
+    return SearchParameters(search_string=f"plumber {i}", distance_km=5, user_lat=ORIGIN[0], user_lon=ORIGIN[1])
+
+
+async def in_process() -> None:
+    """"""
+    upstream = FakeUpstream()
+    settings.GOOGLE_PLACES_URL = f"http://upstream{PLACES_PATH}"
+    async with build_upstream_client(httpx.ASGITransport(upstream)) as client:
+        service = SearchService(client)
+        first = await service.search_nearby(params(0))
+        again = await service.search_nearby(params(0))
+    print("in-process (ASGITransport)")
+    print(f"  {len(first.results)} results within 5 km, nearest {first.results[0].distance_km} km; "
+          f"repeat served from cache: {upstream.requests == 1 and again == first}")
+
+
+async def over_socket() -> None:
+    """"""
+    upstream = FakeUpstream(delay_seconds=UPSTREAM_DELAY_SECONDS)
+    server = uvicorn.Server(uvicorn.Config(upstream, host="127.0.0.1", port=0, log_level="warning"))
+    serving = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+    port = server.servers[0].sockets[0].getsockname()[1]
+    settings.GOOGLE_PLACES_URL = f"http://127.0.0.1:{port}{PLACES_PATH}"
+
+    try:
+        async with build_upstream_client() as client:
+            service = SearchService(client)
+            print(f"over a socket (max_connections={settings.HTTP_MAX_CONNECTIONS}, "
+                  f"max_keepalive={settings.HTTP_MAX_KEEPALIVE_CONNECTIONS}, "
+                  f"search concurrency={settings.SEARCH_MAX_CONCURRENCY}, upstream delay "
+                  f"{UPSTREAM_DELAY_SECONDS * 1000:.0f} ms)")
+            # The second burst repeats the first on an emptied cache, over the kept-alive connections
+            for round_ in ("cold", "warm"):
+                upstream.reset()
+                service.cache = SearchResultCache(service.cache.ttl_seconds, service.cache.max_entries)
+                start = time.perf_counter()
+                await asyncio.gather(*(service.search_nearby(params(i)) for i in range(BURST)))
+                elapsed = time.perf_counter() - start
+                print(f"  {round_} burst of {BURST}: {elapsed * 1000:.0f} ms, {upstream.requests} upstream requests "
+                      f"on {len(upstream.clients)} connections, peak {upstream.peak_in_flight} in flight")
+
+            upstream.delay_seconds = 1.0
+            slow = SearchService(client, timeout_seconds=0.2)
+            start = time.perf_counter()
+            try:
+                await slow.search_nearby(params(BURST))
+                print("  timeout: upstream answered, no timeout raised")
+            except UpstreamServiceException as e:
+                print(f"  timeout: {e.status_code} '{e.detail}' after {(time.perf_counter() - start) * 1000:.0f} ms")
+    finally:
+        server.should_exit = True
+        await serving
+
+
+async def main() -> None:
+    await in_process()
+    await over_socket()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())